@@ -69,7 +69,8 @@ def search_landsat_images(geometry, start_date, end_date):
     return sentinel_image
 
 def process_lst_image(image, geometry):
-    lst_kelvin = image.select("ST_B10").clip(geometry)
+    # ST_B10 holds Collection 2 digital numbers: kelvin = DN * 0.00341802 + 149.0
+    lst_kelvin = image.select("ST_B10").multiply(0.00341802).add(149.0).clip(geometry)
     lst_celsius = lst_kelvin.subtract(273.15)
     lst_scaled = lst_celsius.multiply(10).uint16()
     return lst_scaled
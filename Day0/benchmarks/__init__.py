@@ -0,0 +1 @@
+"""Benchmarks for the geoai compute paths (run from the Day0 folder with python -m benchmarks.<name>)."""
@@ -0,0 +1,138 @@
+"""
+Normalized-difference kernel benchmark: the analysis scripts' code vs geoai.indices.normalized_difference.
+
+NOTE:
+1.The scripts compute denom = a + b, patch zeros through a boolean mask, then (a - b) and the quotient;
+  avg_ndvi.py (benchmarks.legacy.compute_avg_ndvi) then keeps [-1, 1] through an np.where copy and
+  takes np.nanmean.
+2.In memory, on the same random float32 bands: the scripts' formula against the kernel, with a fresh
+  output array, with a reused one (the stats windows) and with valid_range=(-1, 1) (the np.where step).
+3.End to end, the real legacy compute_avg_ndvi runs on a 2-band GeoTIFF of the same bands, against the
+  kernel with valid_range streamed window by window (geoai.stats.iter_windows) into one reused output
+  buffer, summing the valid pixels as it goes. Reading both full bands and calling np.nanmean on the
+  result peaked at about 4.5 rasters; streamed, the peak is a few windows (about 25 MB, 0.4 rasters at
+  4000x4000) whatever the size of the scene.
+4.We report the best wall time of `repeat` runs and the peak of extra memory (tracemalloc, so GDAL's own
+  block cache is not counted, for either path) in units of one full raster.
+
+Example (from the Day0 folder):
+    python -m benchmarks.bench_kernel --size 4000 --repeat 5
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+from benchmarks import legacy
+from geoai.indices import normalized_difference
+from geoai.stats import DEFAULT_MAX_PIXELS, iter_windows
+
+VALID_RANGE = (-1, 1)
+
+
+def script_formula(a, b):
+    """What compute_ndvi / compute_ndbi / ... in the analysis scripts do"""
+    denom = a + b
+    denom[denom == 0] = 0.0001
+    return (a - b) / denom
+
+
+def kernel_avg_ndvi(path, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    compute_avg_ndvi through the fused kernel, one window at a time: valid_range instead of the np.where
+    copy, and a running sum of the valid pixels instead of np.nanmean over a full-size array.
+    """
+    total, count = 0.0, 0
+    buffer = None
+    with rasterio.open(path) as src:
+        for window in iter_windows(src, max_pixels):
+            red, nir = src.read([1, 2], window=window, out_dtype="float32")
+            pixels = window.height * window.width
+            if buffer is None or buffer.size < pixels:
+                buffer = np.empty(pixels, dtype="float32")
+            ndvi = normalized_difference(nir, red, out=buffer[:pixels].reshape(red.shape), valid_range=VALID_RANGE)
+            valid = ndvi[~np.isnan(ndvi)]
+            total += float(valid.sum(dtype="float64"))
+            count += valid.size
+    return total / count if count else float("nan")
+
+
+def write_red_nir(path, red, nir):
+    """2-band float32 GeoTIFF laid out like the ndvi/ exports (band 1 red, band 2 NIR)"""
+    height, width = red.shape
+    with rasterio.open(path, "w", driver="GTiff", width=width, height=height, count=2, dtype="float32",
+                       crs="EPSG:32643", transform=from_origin(700000, 3160000, 10, 10)) as dst:
+        dst.write(np.stack([red, nir]))
+    return path
+
+
+def measure(fn, repeat):
+    """(best seconds, peak traced bytes) over `repeat` runs"""
+    fn()  # warm up (page faults, scratch buffer)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(size, repeat, work_dir=None):
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 255, (size, size)).astype("float32")
+    b = rng.integers(0, 255, (size, size)).astype("float32")
+    raster_bytes = a.nbytes
+    out = np.empty_like(a)
+
+    work_dir = work_dir or tempfile.mkdtemp(prefix="geoai_bench_")
+    path = write_red_nir(os.path.join(work_dir, f"red_nir_{size}.tif"), b, a)
+
+    cases = {
+        "script_formula": lambda: script_formula(a, b),
+        "kernel": lambda: normalized_difference(a, b),
+        "kernel_reused_out": lambda: normalized_difference(a, b, out=out),
+        "kernel_valid_range": lambda: normalized_difference(a, b, out=out, valid_range=VALID_RANGE),
+        "legacy_compute_avg_ndvi": lambda: legacy.compute_avg_ndvi(path),
+        "kernel_avg_ndvi": lambda: kernel_avg_ndvi(path),
+    }
+    results = []
+    for name, fn in cases.items():
+        seconds, peak = measure(fn, repeat)
+        results.append({"case": name, "size": size, "seconds": seconds, "peak_bytes": peak,
+                        "peak_rasters": peak / raster_bytes})
+
+    assert np.allclose(script_formula(a, b), normalized_difference(a, b), equal_nan=True)
+    assert np.isclose(legacy.compute_avg_ndvi(path), kernel_avg_ndvi(path))
+    os.remove(path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the normalized-difference kernel")
+    parser.add_argument("--size", type=int, default=4000, help="raster side in pixels")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.size, args.repeat)
+    for r in results:
+        print(f"{r['case']:<24} {r['seconds'] * 1000:8.1f} ms   peak {r['peak_bytes'] / 1e6:8.1f} MB "
+              f"({r['peak_rasters']:.2f} rasters)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
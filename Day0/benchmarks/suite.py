@@ -0,0 +1,194 @@
+"""
+Raster analytics benchmark suite.
+
+NOTE:
+1.Generates synthetic scenes (benchmarks.synthetic) for every size x dtype x compression asked for and runs
+  every compute path on them, the original scripts' versions (benchmarks.legacy) next to the geoai ones:
+    sentinel2:   legacy_avg_ndvi, legacy_compute_ndbi, compute_ndvi, compute_indices, stream_index_stats,
+                 legacy_chart, render_chart
+    landsat_lst: legacy_load_lst, load_lst
+2.Each case runs in a fresh process, so imports, caches and the memory high-water mark of one case do not
+  leak into the next. Per case we record:
+    - seconds:        best wall time of `repeat` runs (after one warm-up run)
+    - traced_peak:    peak bytes allocated through Python / numpy during one run (tracemalloc)
+    - rss_peak_delta: growth of the process's peak RSS over the baseline before the first run (Unix only),
+                      includes GDAL's block cache
+3.Results go to a JSON file with the environment (Python, numpy, rasterio, GDAL versions), so runs can be
+  compared over time.
+
+Example (from the Day0 folder):
+    python -m benchmarks.suite --sizes 512 2048 --dtypes uint8 int16 --compress none deflate --out bench.json
+    python -m benchmarks.suite --sizes 20000 --dtypes int16 --compress deflate --cases compute_indices load_lst
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from benchmarks.synthetic import COMPRESSIONS, DTYPES, write_scene
+
+logger = logging.getLogger(__name__)
+
+SENTINEL2_CASES = ["legacy_avg_ndvi", "legacy_compute_ndbi", "compute_ndvi", "compute_indices",
+                   "stream_index_stats", "legacy_chart", "render_chart"]
+LST_CASES = ["legacy_load_lst", "load_lst"]
+
+
+def _case_function(name, path, work_dir):
+    """The call to time for one case, bound to its scene"""
+    from benchmarks import legacy
+
+    png = os.path.join(work_dir, f"{name}.png")
+    if name == "legacy_avg_ndvi":
+        return lambda: legacy.compute_avg_ndvi(path)
+    if name == "legacy_compute_ndbi":
+        return lambda: legacy.compute_ndbi(path)
+    if name == "compute_ndvi":
+        from geoai.indices import compute_ndvi
+        return lambda: compute_ndvi(path)
+    if name == "compute_indices":
+        from geoai.indices import compute_indices
+        return lambda: compute_indices(path)
+    if name == "stream_index_stats":
+        from geoai.stats import stream_index_stats
+        return lambda: stream_index_stats(path)
+    if name == "legacy_chart":
+        return lambda: legacy.ndbi_chart(path, path, png)
+    if name == "render_chart":
+        from geoai.charts import render_chart
+        chart = {"title": "NDBI", "layer": "ndbi", "panels": [("a", path), ("b", path)], "out_path": png}
+        return lambda: render_chart(chart)
+    if name == "legacy_load_lst":
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return legacy.load_and_debug_lst_image(path)
+        return run
+    if name == "load_lst":
+        from geoai.lst import load_lst
+        return lambda: load_lst(path)
+    raise ValueError(f"Unknown case: {name}")
+
+
+def _peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_case(name, path, work_dir, repeat=3):
+    """Run one case (inside a fresh worker process) and return its measurements"""
+    import numpy as np
+
+    fn = _case_function(name, path, work_dir)
+    baseline_rss = _peak_rss_bytes()
+    with np.errstate(all="ignore"):
+        fn()  # warm up: lazy imports, GDAL block cache, scratch buffers
+
+        tracemalloc.start()
+        fn()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+
+    peak_rss = _peak_rss_bytes()
+    return {
+        "seconds": best,
+        "traced_peak": traced_peak,
+        "rss_peak_delta": None if peak_rss is None else peak_rss - baseline_rss,
+    }
+
+
+def environment():
+    import numpy as np
+    import rasterio
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "rasterio": rasterio.__version__,
+        "gdal": rasterio.__gdal_version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def plan_scenes(sizes, dtypes, compressions):
+    scenes = []
+    for size in sizes:
+        for compress in compressions:
+            for dtype in dtypes:
+                scenes.append({"kind": "sentinel2", "size": size, "dtype": dtype, "compress": compress})
+            scenes.append({"kind": "landsat_lst", "size": size, "dtype": "uint16", "compress": compress})
+    return scenes
+
+
+def run_suite(sizes, dtypes, compressions, cases=None, repeat=3, work_dir=None):
+    """Generate the scenes, run every case on them; returns the result rows"""
+    work_dir = work_dir or tempfile.mkdtemp(prefix="geoai_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    context = get_context("spawn")
+    results = []
+
+    for scene in plan_scenes(sizes, dtypes, compressions):
+        file_name = f"{scene['kind']}_{scene['size']}_{scene['dtype']}_{scene['compress']}.tif"
+        path = os.path.join(work_dir, file_name)
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            write_scene(path, scene["size"], kind=scene["kind"], dtype=scene["dtype"],
+                        compress=scene["compress"])
+            logger.info(f"Generated {path} in {time.perf_counter() - start:.1f}s")
+
+        for name in SENTINEL2_CASES if scene["kind"] == "sentinel2" else LST_CASES:
+            if cases and name not in cases:
+                continue
+            row = dict(scene, case=name, file_bytes=os.path.getsize(path), error=None)
+            try:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    row.update(pool.submit(measure_case, name, path, work_dir, repeat).result())
+            except Exception as e:
+                logger.error(f"{name} on {path} failed: {str(e)}")
+                row["error"] = str(e)
+            else:
+                logger.info(f"{name:<20} {scene['size']:>6} {scene['dtype']:<8} {scene['compress']:<8} "
+                            f"{row['seconds'] * 1000:9.1f} ms  traced {row['traced_peak'] / 1e6:8.1f} MB")
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every compute path on synthetic scenes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 2048], help="scene sides in pixels")
+    parser.add_argument("--dtypes", nargs="+", default=["uint8", "int16"], choices=DTYPES)
+    parser.add_argument("--compress", nargs="+", default=["deflate"], choices=COMPRESSIONS)
+    parser.add_argument("--cases", nargs="+", default=None, help="only these cases (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--work-dir", default=None, help="where scenes are generated (reused if present)")
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    results = run_suite(args.sizes, args.dtypes, args.compress, args.cases, args.repeat, args.work_dir)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    logger.info(f"Wrote {len(results)} results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
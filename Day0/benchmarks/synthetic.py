@@ -0,0 +1,136 @@
+"""
+Synthetic Sentinel-2 / Landsat-like scenes for benchmarks.
+
+NOTE:
+1.The committed sector14_*.tif files are 199x211 pixels, far too small to show how a compute path scales.
+2.write_scene writes a scene of any size (city scale is 20000 x 20000) block by block, so generating it
+  never holds more than one block per band in memory:
+    - sentinel2: B2, B3, B4, B8, B11 + SCL, with the band descriptions of our stacked exports
+      uint8   gamma-scaled like the "visual" export profile
+      int16   raw reflectance x10000 with scale tags like the "analysis" profile
+      float32 reflectance 0-1
+    - landsat_lst: ST_B10 as uint16 degrees Celsius x10 with 0 = no data around the AOI
+3.Values are a smooth pattern plus noise (seeded per block, so a scene is reproducible), which compresses
+  like real imagery rather than like pure noise. SCL marks a few cloud (9) and shadow (3) patches.
+
+Example (from the Day0 folder):
+    python -m benchmarks.synthetic /tmp/scene_4096.tif --size 4096 --dtype int16 --compress deflate
+"""
+import argparse
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+SENTINEL2_BANDS = ["B2", "B3", "B4", "B8", "B11", "SCL"]
+# Mean surface reflectance of each band over a mixed urban scene
+BAND_MEANS = {"B2": 0.08, "B3": 0.10, "B4": 0.12, "B8": 0.25, "B11": 0.22}
+KINDS = ("sentinel2", "landsat_lst")
+DTYPES = ("uint8", "int16", "float32")
+COMPRESSIONS = ("none", "lzw", "deflate")
+BLOCK_SIZE = 256
+
+
+def _pattern(rows, cols, seed):
+    """Smooth field in [-1, 1] plus noise for one block"""
+    rng = np.random.default_rng(seed)
+    y = rows[:, None].astype("float32")
+    x = cols[None, :].astype("float32")
+    smooth = np.sin(x / 53.0) * np.cos(y / 71.0)
+    return smooth + rng.normal(0, 0.25, (rows.size, cols.size)).astype("float32")
+
+
+def _sentinel_block(rows, cols, dtype, seed):
+    data = []
+    for i, band in enumerate(SENTINEL2_BANDS[:-1]):
+        reflectance = np.clip(BAND_MEANS[band] * (1 + 0.4 * _pattern(rows, cols, seed + i)), 0, 1)
+        if dtype == "uint8":
+            data.append(np.sqrt(reflectance) * 255)
+        elif dtype == "int16":
+            data.append(reflectance * 10000)
+        else:
+            data.append(reflectance)
+
+    # Clear land (4) with cloud (9) and shadow (3) blobs where the pattern peaks
+    field = _pattern(rows, cols, seed + 99)
+    scl = np.full(field.shape, 4, dtype="float32")
+    scl[field > 1.1] = 9
+    scl[field < -1.2] = 3
+    data.append(scl)
+    return np.stack(data).astype(dtype)
+
+
+def _lst_block(rows, cols, seed, width, height):
+    celsius = 30 + 8 * _pattern(rows, cols, seed)
+    codes = (celsius * 10).astype("uint16")
+    # No data outside an inner ellipse, like an AOI clipped out of its bounding box
+    y = (rows[:, None] - height / 2) / (height / 2)
+    x = (cols[None, :] - width / 2) / (width / 2)
+    codes[x * x + y * y > 0.9] = 0
+    return codes[None]
+
+
+def write_scene(path, size=None, width=None, height=None, kind="sentinel2", dtype="int16", compress="deflate",
+                seed=0):
+    """Write a synthetic scene; returns its path"""
+    width = width or size
+    height = height or size
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind: {kind}. Known kinds: {list(KINDS)}")
+    if kind == "landsat_lst":
+        dtype = "uint16"
+    elif dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype: {dtype}. Known dtypes: {list(DTYPES)}")
+
+    bands = SENTINEL2_BANDS if kind == "sentinel2" else ["ST_B10"]
+    resolution = 10 if kind == "sentinel2" else 30
+    profile = {
+        "driver": "GTiff",
+        "width": width,
+        "height": height,
+        "count": len(bands),
+        "dtype": dtype,
+        "crs": "EPSG:32643",
+        "transform": from_origin(700000, 3160000, resolution, resolution),
+        "tiled": True,
+        "blockxsize": BLOCK_SIZE,
+        "blockysize": BLOCK_SIZE,
+        "BIGTIFF": "IF_SAFER",
+    }
+    if compress != "none":
+        profile["compress"] = compress
+        profile["predictor"] = 3 if dtype == "float32" else 2
+
+    with rasterio.open(path, "w", **profile) as dst:
+        for _, window in dst.block_windows(1):
+            rows = np.arange(window.row_off, window.row_off + window.height)
+            cols = np.arange(window.col_off, window.col_off + window.width)
+            block_seed = seed * 1_000_003 + window.row_off * 7919 + window.col_off
+            if kind == "sentinel2":
+                data = _sentinel_block(rows, cols, dtype, block_seed)
+            else:
+                data = _lst_block(rows, cols, block_seed, width, height)
+            dst.write(data, window=window)
+
+        dst.descriptions = tuple(bands)
+        if kind == "sentinel2" and dtype == "int16":
+            dst.scales = [0.0001] * (len(bands) - 1) + [1.0]
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic benchmark scene")
+    parser.add_argument("path")
+    parser.add_argument("--size", type=int, default=2048, help="side in pixels")
+    parser.add_argument("--kind", default="sentinel2", choices=KINDS)
+    parser.add_argument("--dtype", default="int16", choices=DTYPES)
+    parser.add_argument("--compress", default="deflate", choices=COMPRESSIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_scene(args.path, args.size, kind=args.kind, dtype=args.dtype, compress=args.compress, seed=args.seed)
+    print(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+GEO-AI shared toolkit.
+
+NOTE:
+1.The scripts in ndvi/, ndbi/, ndmi/, MNDWI/ and LST/ are the step-by-step learning versions.
+2.This package holds the shared code they all need (index engine, extraction, stats) so it lives in one place.
+3.Run it from the Day0 folder, e.g. `python -m geoai.indices ndbi/polygon_swir_nir/sector14_2025-01-28.tif`
+4.`python -m geoai <command>` (extract / analyze / chart / report / change / trace) is the single entry point,
+  see geoai.cli.
+"""
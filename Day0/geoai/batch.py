@@ -0,0 +1,294 @@
+"""
+Non-interactive batch extraction from a job file.
+
+NOTE:
+1.get_user_dates in every extract script blocks on input(), so each scene needs someone at a terminal
+  and each run covers exactly one date window.
+2.A job file lists the AOIs, date windows, sensors and indices once; every AOI x window x sensor
+  combination becomes one extraction, and all of them run in one invocation:
+
+    {
+        "aois": [
+            {"name": "sector14", "geojson": "sector14.geojson", "feature": 0},
+            {"geojson": "gurugram_sectors.geojson", "feature": "*", "tolerance_m": 5},
+            "sector15.geojson"
+        ],
+        "windows": [{"start": "2020-01-01", "end": "2020-02-01"}],
+        "monthly": {"start": "2024-01", "end": "2024-12"},
+        "sensors": ["sentinel2", "landsat_lst"],
+        "indices": ["ndvi", "ndbi", "ndmi", "mndwi"],
+        "cloud_max": 30,
+        "profile": "analysis",
+        "composite": "median"
+    }
+
+  "windows" and "monthly" can be used together; "monthly" adds one window per calendar month
+  (both ends inclusive). An AOI given as a plain path is named after the file (sector15.geojson -> sector15).
+  "feature": "*" expands to every polygon in the file, each named after its "name" property (sector_14 ...).
+  "tolerance_m" simplifies the polygons before they are sent to Earth Engine (see geoai.geometry).
+3.Sentinel-2 jobs export one stacked GeoTIFF with just the bands the requested indices need (plus SCL),
+  encoded with the export profile ("visual" by default, "analysis" for int16 reflectance).
+  Landsat LST jobs export ST_B10 as <aoi>_lst_<date>.tif.
+  With "composite" ("median" or "quality") each window is exported as one cloud-masked composite
+  (<aoi>_<method>_<window start>.tif) instead of the least cloudy single scene (see geoai.extract).
+4.Searches go through the scene catalog (scene_catalog.sqlite), so windows searched by an earlier batch
+  are answered locally and an image already exported for an AOI is not exported again.
+5.A job that fails (no image, API error) is logged and recorded, and the rest of the batch carries on.
+6.--trace traces.jsonl records how long every stage of every job took (see geoai.tracing).
+  --metrics-port / --metrics-file publish live counters and gauges while the batch runs (see geoai.metrics).
+
+Example (from the Day0 folder):
+    python -m geoai.batch jobs/sector14_monthly.json --dry-run
+    python -m geoai.batch jobs/sector14_monthly.json
+    python -m geoai.batch jobs/sector14_monthly.json --trace traces.jsonl
+    python -m geoai.batch jobs/sector14_monthly.json --metrics-port 9464
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+
+from geoai import extract, metrics
+from geoai.catalog import SceneCatalog
+from geoai.geometry import aoi_name_from_path, load_ee_geometry, load_features
+from geoai.indices import INDEX_BANDS, required_bands
+from geoai.tracing import TRACE_ENV, configure_tracing
+
+logger = logging.getLogger(__name__)
+
+SENSORS = ("sentinel2", "landsat_lst")
+
+
+def month_windows(start_month, end_month):
+    """'2024-01', '2024-03' -> [('2024-01-01', '2024-02-01'), ..., ('2024-03-01', '2024-04-01')]"""
+    current = datetime.datetime.strptime(start_month, '%Y-%m').date()
+    last = datetime.datetime.strptime(end_month, '%Y-%m').date()
+    windows = []
+    while current <= last:
+        following = (current.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        windows.append((current.isoformat(), following.isoformat()))
+        current = following
+    return windows
+
+
+def _parse_date(value, field):
+    try:
+        datetime.datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field} {value!r}. Please use YYYY-MM-DD format.")
+    return value
+
+
+def load_job_spec(path):
+    """Read and validate a job file; relative GeoJSON paths are resolved against the job file"""
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    aois = []
+    for entry in spec.get("aois", []):
+        if isinstance(entry, str):
+            entry = {"geojson": entry}
+        geojson = os.path.join(base_dir, entry["geojson"])
+        tolerance_m = entry.get("tolerance_m")
+        if entry.get("feature") == "*":
+            for feature in load_features(geojson):
+                aois.append({"name": feature["key"], "geojson": geojson, "feature": feature["key"],
+                             "tolerance_m": tolerance_m})
+            continue
+        aois.append({
+            "name": entry.get("name") or aoi_name_from_path(geojson),
+            "geojson": geojson,
+            "feature": entry.get("feature", 0),
+            "tolerance_m": tolerance_m,
+        })
+    if not aois:
+        raise ValueError(f"{path}: job file needs at least one entry in 'aois'")
+
+    windows = [
+        (_parse_date(w["start"], "start"), _parse_date(w["end"], "end"))
+        for w in spec.get("windows", [])
+    ]
+    if "monthly" in spec:
+        windows += month_windows(spec["monthly"]["start"], spec["monthly"]["end"])
+    if not windows:
+        raise ValueError(f"{path}: job file needs 'windows' or 'monthly'")
+
+    sensors = spec.get("sensors", ["sentinel2"])
+    unknown = [sensor for sensor in sensors if sensor not in SENSORS]
+    if unknown:
+        raise ValueError(f"{path}: unknown sensors {unknown}. Known sensors: {list(SENSORS)}")
+
+    indices = spec.get("indices", list(INDEX_BANDS))
+    required_bands(indices)  # raises on unknown index names
+
+    profile = spec.get("profile", "visual")
+    if profile not in extract.EXPORT_PROFILES:
+        raise ValueError(f"{path}: unknown profile {profile!r}. Known profiles: {list(extract.EXPORT_PROFILES)}")
+
+    composite = spec.get("composite")
+    if composite is not None and composite not in extract.COMPOSITE_METHODS:
+        raise ValueError(f"{path}: unknown composite {composite!r}. "
+                         f"Known methods: {list(extract.COMPOSITE_METHODS)}")
+
+    return {
+        "aois": aois,
+        "windows": windows,
+        "sensors": sensors,
+        "indices": indices,
+        "cloud_max": spec.get("cloud_max", 30),
+        "profile": profile,
+        "composite": composite,
+    }
+
+
+def plan_jobs(spec):
+    """Expand a job spec into one job dict per AOI x window x sensor"""
+    jobs = []
+    for aoi in spec["aois"]:
+        for start_date, end_date in spec["windows"]:
+            for sensor in spec["sensors"]:
+                jobs.append({
+                    "aoi": aoi["name"],
+                    "geojson": aoi["geojson"],
+                    "feature": aoi["feature"],
+                    "tolerance_m": aoi["tolerance_m"],
+                    "sensor": sensor,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "indices": spec["indices"],
+                    "cloud_max": spec["cloud_max"],
+                    "profile": spec["profile"],
+                    "composite": spec["composite"],
+                })
+    logger.info(f"Planned {len(jobs)} extraction jobs")
+    return jobs
+
+
+def run_job(job, geometry, client=None, catalog=None, download_dir=None):
+    """Start the export for one job; returns (task, date_used) or (None, None) when no image matches"""
+    logger.info(f"Job {job['aoi']} {job['sensor']} {job['start_date']} to {job['end_date']}")
+    bands = [band for band in extract.STACK_BANDS if band in required_bands(job["indices"])]
+
+    if job.get("composite"):
+        return extract.extract_composite_scene(
+            geometry, job["start_date"], job["end_date"], aoi_name=job["aoi"], sensor=job["sensor"],
+            method=job["composite"], bands=bands, cloud_max=job["cloud_max"], client=client,
+            catalog=catalog, download_dir=download_dir, profile=job["profile"]
+        )
+
+    if job["sensor"] == "landsat_lst":
+        return extract.extract_lst_scene(
+            geometry, job["start_date"], job["end_date"], aoi_name=job["aoi"],
+            cloud_max=job["cloud_max"], client=client, catalog=catalog,
+            download_dir=download_dir
+        )
+
+    return extract.extract_stacked_scene(
+        geometry, job["start_date"], job["end_date"], aoi_name=job["aoi"], bands=bands,
+        cloud_max=job["cloud_max"], client=client, catalog=catalog,
+        download_dir=download_dir, profile=job["profile"]
+    )
+
+
+def run_batch(jobs, client=None, monitor=True, catalog=None, download_dir=None):
+    """
+    Run every planned job, then watch all started exports from one event loop.
+    Returns one result dict per job with its state
+    ("NO_IMAGE", "ALREADY_EXPORTED", "ERROR" or the final task state).
+    With a SceneCatalog, repeated windows are answered locally and already exported images are skipped;
+    exports are only marked done in the catalog once monitored to COMPLETED (failed ones run again next time).
+    With download_dir, AOIs under the download limit are fetched straight into that folder.
+    """
+    geometries = {}
+    results = []
+    started = []
+
+    for job in jobs:
+        result = dict(job, date_used=None, task_id=None, state=None, error=None)
+        try:
+            key = (job["geojson"], job["feature"], job["tolerance_m"])
+            if key not in geometries:
+                geometries[key] = load_ee_geometry(job["geojson"], job["feature"], job["tolerance_m"],
+                                                   client=client)
+
+            task, date_used = run_job(job, geometries[key], client=client, catalog=catalog,
+                                      download_dir=download_dir)
+            if task is None:
+                result.update(date_used=date_used, state="NO_IMAGE" if date_used is None else "ALREADY_EXPORTED")
+            else:
+                result.update(date_used=date_used, task_id=getattr(task, "id", None), state="SUBMITTED")
+                started.append((result, task))
+        except Exception as e:
+            logger.error(f"Job {job['aoi']} {job['sensor']} {job['start_date']} failed: {str(e)}")
+            result.update(state="ERROR", error=str(e))
+        results.append(result)
+
+    if monitor and started:
+        from geoai.monitor import monitor_tasks
+
+        options = {}
+        if catalog is not None:
+            def finish(task, status):
+                catalog.finish_export(getattr(task, "id", None), status.get("state"))
+            options = {"on_complete": finish, "on_failure": finish}
+
+        statuses = monitor_tasks([task for _, task in started], **options)
+        for (result, _), status in zip(started, statuses):
+            result["state"] = status.get("state")
+            result["error"] = status.get("error_message")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every extraction listed in a job file")
+    parser.add_argument("job_file")
+    parser.add_argument("--dry-run", action="store_true", help="only print the planned jobs")
+    parser.add_argument("--no-monitor", action="store_true",
+                        help="start the exports and exit (they are not marked done in the catalog)")
+    parser.add_argument("--report", default=None, help="write per-job results as JSON")
+    parser.add_argument("--catalog", default="scene_catalog.sqlite", help="scene catalog path")
+    parser.add_argument("--no-catalog", action="store_true", help="always query Earth Engine")
+    parser.add_argument("--download-dir", default=None,
+                        help="download small AOIs directly into this folder instead of exporting to Drive")
+    parser.add_argument("--trace", default=None,
+                        help=f"append per-stage timing spans to this JSON-lines file (or set {TRACE_ENV})")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-file", default=None,
+                        help="keep Prometheus metrics in this file (node_exporter textfile collector)")
+    args = parser.parse_args()
+
+    extract.setup_logging()
+    if args.trace:
+        configure_tracing(args.trace)
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port)
+    if args.metrics_file:
+        metrics.start_textfile_writer(args.metrics_file)
+    jobs = plan_jobs(load_job_spec(args.job_file))
+
+    if args.dry_run:
+        for job in jobs:
+            print(f"{job['aoi']}\t{job['sensor']}\t{job['start_date']} to {job['end_date']}")
+        return
+
+    extract.initialize_earth_engine()
+    catalog = None if args.no_catalog else SceneCatalog(args.catalog)
+    results = run_batch(jobs, monitor=not args.no_monitor, catalog=catalog, download_dir=args.download_dir)
+
+    states = {}
+    for result in results:
+        states[result["state"]] = states.get(result["state"], 0) + 1
+    print(f"Batch finished: {states}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.metrics_file:
+        metrics.write_textfile(args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Content-hash result cache for index statistics and derived rasters.
+
+NOTE:
+1.Rerunning avg_ndvi.py or any analysis.py recomputes every scene, even when only one new date arrived.
+2.Results are stored under a key made from:
+    - the SHA-256 of the input file's content (renaming or touching a file does not invalidate it,
+      changing a single pixel does)
+    - the index definition (bands of each index + INDEX_DEFINITION_VERSION)
+    - the parameters of the computation
+  so a rerun over a 5-year archive plus one new scene only computes the new scene.
+3.Statistics are stored as JSON inside the SQLite index; derived rasters as .npy files next to it.
+4.Entries are evicted least-recently-used first once the cache is over max_bytes (or max_entries).
+5.File digests are remembered per (path, size, mtime), so unchanged files are not re-hashed on every run.
+
+Example (from the Day0 folder):
+    python -m geoai.timeseries ndbi/polygon_swir_nir --cache result_cache
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from geoai.indices import INDEX_BANDS, INDEX_DEFINITION_VERSION
+from geoai.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+
+def file_digest(path):
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def index_definition(indices=None, mask=True):
+    """What an index result depends on besides the input file"""
+    names = sorted(INDEX_BANDS) if indices is None else list(indices)
+    return {
+        "version": INDEX_DEFINITION_VERSION,
+        "indices": None if indices is None else names,
+        "bands": {name: INDEX_BANDS[name] for name in names if name in INDEX_BANDS},
+        "mask": mask,
+    }
+
+
+class ResultCache:
+    """SQLite index + .npy files, evicted LRU by total size"""
+
+    def __init__(self, cache_dir="result_cache", max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"))
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def digest(self, path):
+        """Content hash of a file, reusing the stored one while size and mtime are unchanged"""
+        stat = os.stat(path)
+        path = os.path.abspath(path)
+        row = self.connection.execute(
+            "SELECT digest FROM digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = file_digest(path)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)", (path, stat.st_size, stat.st_mtime_ns, digest)
+            )
+        return digest
+
+    def key(self, path, kind, params=None):
+        """Cache key for computing `kind` with `params` over the file at `path`"""
+        payload = json.dumps({"file": self.digest(path), "kind": kind, "params": params},
+                             sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _touch(self, key):
+        with self.connection:
+            self.connection.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+
+    def _array_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def get_json(self, key):
+        row = self.connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            record_cache_lookup("result", hit=False)
+            return None
+        self.hits += 1
+        record_cache_lookup("result", hit=True)
+        self._touch(key)
+        return json.loads(row[0])
+
+    def put_json(self, key, kind, value):
+        payload = json.dumps(value)
+        self._put(key, kind, payload, len(payload))
+
+    def get_array(self, key, mmap=True):
+        """Stored raster (memory-mapped by default) or None"""
+        path = self._array_path(key)
+        row = self.connection.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or not os.path.exists(path):
+            self.misses += 1
+            record_cache_lookup("result", hit=False)
+            return None
+        self.hits += 1
+        record_cache_lookup("result", hit=True)
+        self._touch(key)
+        return np.load(path, mmap_mode="r" if mmap else None)
+
+    def put_array(self, key, kind, array):
+        path = self._array_path(key)
+        np.save(path + ".tmp.npy", array)
+        os.replace(path + ".tmp.npy", path)
+        self._put(key, kind, None, os.path.getsize(path))
+
+    def _put(self, key, kind, value, size):
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", (key, kind, value, size, now, now)
+            )
+        self.evict()
+
+    def total_bytes(self):
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes / max_entries"""
+        total = self.total_bytes()
+        count = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+            return
+
+        evicted = []
+        for key, size in self.connection.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+                break
+            evicted.append(key)
+            total -= size
+            count -= 1
+
+        with self.connection:
+            self.connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+        for key in evicted:
+            if os.path.exists(self._array_path(key)):
+                os.remove(self._array_path(key))
+        logger.info(f"Evicted {len(evicted)} cache entries")
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def cached_indices(path, indices=None, cache=None, mask=True):
+    """compute_indices with the index rasters cached per input file content"""
+    from geoai.indices import compute_indices
+
+    if cache is None:
+        return compute_indices(path, indices, mask)
+
+    key = cache.key(path, "indices", index_definition(indices, mask))
+    names = cache.get_json(key)
+    if names is not None:
+        arrays = {name: cache.get_array(f"{key}-{name}") for name in names}
+        if all(array is not None for array in arrays.values()):
+            return arrays
+
+    results = compute_indices(path, indices, mask)
+    for name, values in results.items():
+        cache.put_array(f"{key}-{name}", "index_raster", values)
+    cache.put_json(key, "indices", list(results))
+    return results
@@ -0,0 +1,199 @@
+"""
+Persistent scene catalog for search results (SQLite).
+
+NOTE:
+1.Every run of the extract scripts re-queries COPERNICUS/S2_SR_HARMONIZED or LANDSAT/LC08/C02/T1_L2,
+  even for windows we searched yesterday.
+2.The catalog remembers, per collection and AOI geometry (hashed), which date windows were searched
+  with which cloud threshold, and the candidate images found (id, acquisition date, cloud cover).
+3.A new search is answered locally when earlier, still-fresh searches with an equal or looser cloud
+  threshold cover its whole window, even if it takes several overlapping windows to cover it.
+4.It also records which image ids were exported for which AOI, so the same system:index is never exported
+  twice across jobs. An export is recorded as SUBMITTED when its task starts and only counts as exported
+  once the monitor reports it COMPLETED (finish_export); a FAILED / CANCELLED export is forgotten, so the
+  next run tries it again.
+5.Entries older than ttl_seconds are ignored and evicted; beyond max_searches the least recently used
+  searches are dropped.
+
+Example:
+    catalog = SceneCatalog("scene_catalog.sqlite")
+    image, image_info = search_sentinel_images(geometry, "2024-01-01", "2024-02-01", catalog=catalog)
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+
+from geoai.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_SEARCHES = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    collection TEXT NOT NULL,
+    geometry_hash TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    cloud_max REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (collection, geometry_hash, start_date, end_date, cloud_max)
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    collection TEXT NOT NULL,
+    geometry_hash TEXT NOT NULL,
+    image_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    cloud REAL,
+    PRIMARY KEY (collection, geometry_hash, image_id)
+);
+CREATE TABLE IF NOT EXISTS exports (
+    image_id TEXT NOT NULL,
+    aoi TEXT NOT NULL,
+    task_id TEXT,
+    created_at REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'SUBMITTED',
+    PRIMARY KEY (image_id, aoi)
+);
+CREATE INDEX IF NOT EXISTS candidates_by_date ON candidates (collection, geometry_hash, date);
+"""
+
+
+def geometry_hash(geometry):
+    """
+    Stable hash of an AOI geometry.
+    Accepts GeoJSON (dict / coordinate lists) or a client-side ee.Geometry (via toGeoJSON(), no round trip).
+    """
+    if hasattr(geometry, "toGeoJSON"):
+        geometry = geometry.toGeoJSON()
+    payload = json.dumps(geometry, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _covers(windows, start_date, end_date):
+    """True if the union of (start, end) windows covers [start_date, end_date)"""
+    reached = start_date
+    for window_start, window_end in sorted(windows):
+        if window_start > reached:
+            break
+        reached = max(reached, window_end)
+        if reached >= end_date:
+            return True
+    return reached >= end_date
+
+
+class SceneCatalog:
+    """SQLite-backed cache of scene searches and exports"""
+
+    def __init__(self, path="scene_catalog.sqlite", ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_searches=DEFAULT_MAX_SEARCHES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_searches = max_searches
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(exports)")]
+        if "state" not in columns:
+            # Catalogs written before export states were tracked: their exports' outcome is unknown
+            with self.connection:
+                self.connection.execute("ALTER TABLE exports ADD COLUMN state TEXT NOT NULL DEFAULT 'SUBMITTED'")
+        self.evict()
+
+    def close(self):
+        self.connection.close()
+
+    def lookup(self, collection, geometry, start_date, end_date, cloud_max):
+        """
+        Candidates for a search, answered from the catalog.
+        Returns a list of {"id", "date", "cloud"} sorted by cloud cover (best first),
+        or None when the cached searches do not cover the window.
+        """
+        key = geometry_hash(geometry)
+        fresh_after = time.time() - self.ttl_seconds
+        rows = self.connection.execute(
+            "SELECT start_date, end_date FROM searches "
+            "WHERE collection = ? AND geometry_hash = ? AND cloud_max >= ? AND created_at >= ? "
+            "AND start_date < ? AND end_date > ?",
+            (collection, key, cloud_max, fresh_after, end_date, start_date),
+        ).fetchall()
+
+        if not _covers(rows, start_date, end_date):
+            record_cache_lookup("catalog", hit=False)
+            return None
+        record_cache_lookup("catalog", hit=True)
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE searches SET last_used = ? "
+                "WHERE collection = ? AND geometry_hash = ? AND start_date < ? AND end_date > ?",
+                (time.time(), collection, key, end_date, start_date),
+            )
+
+        candidates = self.connection.execute(
+            "SELECT image_id, date, cloud FROM candidates "
+            "WHERE collection = ? AND geometry_hash = ? AND date >= ? AND date < ? AND cloud < ? "
+            "ORDER BY cloud, date",
+            (collection, key, start_date, end_date, cloud_max),
+        ).fetchall()
+        logger.info(f"Catalog hit for {collection} {start_date} to {end_date}: {len(candidates)} candidates")
+        return [{"id": image_id, "date": date, "cloud": cloud} for image_id, date, cloud in candidates]
+
+    def store(self, collection, geometry, start_date, end_date, cloud_max, candidates):
+        """Record a search window and the candidate images it returned"""
+        key = geometry_hash(geometry)
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (collection, key, start_date, end_date, cloud_max, now, now),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?, ?, ?)",
+                [(collection, key, c["id"], c["date"], c["cloud"]) for c in candidates],
+            )
+        self.evict()
+
+    def is_exported(self, image_id, aoi):
+        """True once an export of the image for this AOI has COMPLETED"""
+        row = self.connection.execute(
+            "SELECT 1 FROM exports WHERE image_id = ? AND aoi = ? AND state = 'COMPLETED'", (image_id, aoi)
+        ).fetchone()
+        return row is not None
+
+    def record_export(self, image_id, aoi, task_id=None, state="SUBMITTED"):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO exports (image_id, aoi, task_id, created_at, state) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (image_id, aoi, task_id, time.time(), state),
+            )
+
+    def finish_export(self, task_id, state):
+        """Final state of an export task: COMPLETED marks it exported, anything else forgets it"""
+        with self.connection:
+            if state == "COMPLETED":
+                self.connection.execute("UPDATE exports SET state = ? WHERE task_id = ?", (state, task_id))
+            else:
+                self.connection.execute("DELETE FROM exports WHERE task_id = ?", (task_id,))
+
+    def evict(self):
+        """Drop expired searches, then the least recently used ones beyond max_searches"""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM searches WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.connection.execute(
+                "DELETE FROM searches WHERE rowid IN ("
+                "SELECT rowid FROM searches ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_searches,),
+            )
+            # Candidates are shared by every search of the same collection + geometry
+            self.connection.execute(
+                "DELETE FROM candidates WHERE NOT EXISTS ("
+                "SELECT 1 FROM searches s WHERE s.collection = candidates.collection "
+                "AND s.geometry_hash = candidates.geometry_hash)"
+            )
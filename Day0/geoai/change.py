@@ -0,0 +1,244 @@
+"""
+Pixel-level change detection between acquisitions.
+
+NOTE:
+1.MNDWI/analysis.py compares two dates as mndwi_jan_2025.mean() - mndwi_jan_2020.mean(): a pond that
+  appeared and a field that dried up cancel out in the average.
+2.Here the index is computed for each date (geoai.indices, optionally through geoai.cache) and compared
+  pixel by pixel:
+    - delta = later - earlier
+    - pixels with delta >= threshold are "increase", delta <= -threshold are "decrease"
+    - neighbouring pixels with the same direction form one change region (rasterio's polygonize,
+      4- or 8-connected); regions smaller than min_pixels are sieved out as speckle before anything is
+      polygonized, so noisy deltas do not turn into hundreds of thousands of one-pixel polygons
+    - every region gets its pixel count, area, mean / min / max delta (np.bincount over the label grid,
+      and one sort, no Python loop over pixels) and its outline as a GeoJSON polygon in lon/lat, all
+      outlines reprojected in one call
+3.With N dates each consecutive pair is compared, plus the first date against the last.
+4.The scenes must be on the same grid (same size, transform and CRS), as our per-AOI exports are.
+
+Example (from the Day0 folder):
+    python -m geoai.change MNDWI/polygon/sector14_2020-01-30.tif MNDWI/polygon/sector14_2025-01-28.tif \
+        --index mndwi --threshold 0.1 --out mndwi_change.geojson
+"""
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+import rasterio
+from rasterio.features import rasterize, shapes, sieve
+from rasterio.warp import transform
+
+from geoai.cache import cached_indices
+from geoai.timeseries import SCENE_PATTERN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.1
+DIRECTIONS = {1: "increase", -1: "decrease"}
+
+
+def scene_date(path):
+    """sector14_2025-01-28.tif -> 2025-01-28 (or the file name when it does not follow the pattern)"""
+    match = SCENE_PATTERN.match(os.path.basename(path))
+    return match.group("date") if match else os.path.basename(path)
+
+
+def _grid(path):
+    with rasterio.open(path) as src:
+        return {"width": src.width, "height": src.height, "transform": src.transform, "crs": src.crs}
+
+
+def _check_same_grid(reference, grid, path):
+    if (grid["width"], grid["height"]) != (reference["width"], reference["height"]):
+        raise ValueError(f"{path} is {grid['width']}x{grid['height']}, "
+                         f"expected {reference['width']}x{reference['height']}")
+    if grid["transform"] != reference["transform"] or grid["crs"] != reference["crs"]:
+        raise ValueError(f"{path} is not on the same grid as the first scene")
+
+
+def polygons_to_lonlat(polygons, crs):
+    """Reproject GeoJSON polygons to EPSG:4326 with one coordinate transform for every vertex of every ring"""
+    rings = [np.asarray(ring, dtype="float64") for polygon in polygons for ring in polygon["coordinates"]]
+    if not rings:
+        return [dict(polygon) for polygon in polygons]
+    xy = np.concatenate(rings)
+    lon, lat = transform(crs, "EPSG:4326", xy[:, 0], xy[:, 1])
+    lonlat = np.column_stack([lon, lat]).tolist()
+
+    result = []
+    position = 0
+    ring_sizes = iter(len(ring) for ring in rings)
+    for polygon in polygons:
+        coordinates = []
+        for _ in polygon["coordinates"]:
+            size = next(ring_sizes)
+            coordinates.append(lonlat[position:position + size])
+            position += size
+        result.append({"type": "Polygon", "coordinates": coordinates})
+    return result
+
+
+def change_regions(delta, transform, crs, threshold=DEFAULT_THRESHOLD, min_pixels=1, connectivity=8):
+    """
+    Threshold a delta raster and group changed pixels into connected regions.
+    Returns (labels as int32 array, 0 = no change, regions) where regions[i - 1] describes label i.
+    """
+    direction = np.zeros(delta.shape, dtype="int16")
+    direction[delta >= threshold] = 1
+    direction[delta <= -threshold] = -1
+    changed = direction != 0
+
+    if min_pixels > 1:
+        # Speckle goes before polygonizing: sieve merges every patch under min_pixels (changed or not)
+        # into its largest neighbour, so small specks vanish and small holes inside a region are filled
+        sieved = sieve(direction, min_pixels, connectivity=connectivity)
+        regions_mask = sieved != 0
+        # Statistics only count pixels that changed in the direction of their region
+        changed &= sieved == direction
+    else:
+        sieved, regions_mask = direction, changed
+
+    outlines = [
+        (geometry, int(value))
+        for geometry, value in shapes(sieved, mask=regions_mask, transform=transform, connectivity=connectivity)
+    ]
+    if not outlines:
+        return np.zeros(delta.shape, dtype="int32"), []
+
+    labels = rasterize(
+        [(geometry, label) for label, (geometry, _) in enumerate(outlines, start=1)],
+        out_shape=delta.shape,
+        transform=transform,
+        fill=0,
+        dtype="int32",
+    )
+    # Polygon edges follow pixel edges, but keep only pixels that actually changed
+    labels[~changed] = 0
+
+    region_count = len(outlines)
+    ids = labels[changed]
+    values = delta[changed].astype("float64")
+    counts = np.bincount(ids, minlength=region_count + 1)[1:]
+    sums = np.bincount(ids, weights=values, minlength=region_count + 1)[1:]
+    # Group the deltas by region (a stable integer sort) and reduce each run to its min / max
+    sorted_values = values[np.argsort(ids, kind="stable")]
+    starts = np.cumsum(counts) - counts
+    minima = np.minimum.reduceat(sorted_values, starts)
+    maxima = np.maximum.reduceat(sorted_values, starts)
+    pixel_area = abs(transform.a * transform.e)
+
+    outlines_4326 = polygons_to_lonlat([geometry for geometry, _ in outlines], crs)
+    regions = [
+        {
+            "region": i + 1,
+            "direction": DIRECTIONS[value],
+            "pixels": int(counts[i]),
+            "area_m2": float(counts[i] * pixel_area),
+            "mean_delta": float(sums[i] / counts[i]),
+            "min_delta": float(minima[i]),
+            "max_delta": float(maxima[i]),
+            "geometry": geometry,
+        }
+        for i, ((_, value), geometry) in enumerate(zip(outlines, outlines_4326))
+    ]
+    return labels, regions
+
+
+def compare_arrays(earlier, later, grid, threshold=DEFAULT_THRESHOLD, min_pixels=1, connectivity=8):
+    """
+    Per-pixel change between two index rasters on the same grid ({"transform", "crs"}).
+    Returns {"delta", "labels", "regions", "summary"}.
+    """
+    delta = later - earlier
+    labels, regions = change_regions(delta, grid["transform"], grid["crs"], threshold, min_pixels, connectivity)
+    summary = {
+        "mean_delta": float(np.nanmean(delta)),
+        "regions": len(regions),
+        "changed_pixels": int(np.count_nonzero(labels)),
+    }
+    for name in DIRECTIONS.values():
+        summary[f"{name}_area_m2"] = sum(r["area_m2"] for r in regions if r["direction"] == name)
+    return {"delta": delta, "labels": labels, "regions": regions, "summary": summary}
+
+
+def _compare(before, after, index, earlier, later, grid, options):
+    change = compare_arrays(earlier, later, grid, **options)
+    change.update(before=scene_date(before), after=scene_date(after), index=index)
+    logger.info(f"{index.upper()} {change['before']} -> {change['after']}: {len(change['regions'])} regions, "
+                f"{change['summary']['changed_pixels']} changed pixels")
+    return change
+
+
+def compare_scenes(before, after, index, threshold=DEFAULT_THRESHOLD, min_pixels=1, connectivity=8, cache=None):
+    """
+    Per-pixel change of one index between two scenes.
+    Returns {"before", "after", "index", "delta", "labels", "regions", "summary"}.
+    """
+    return change_sequence([before, after], index, threshold, min_pixels, connectivity, cache)[0]
+
+
+def change_sequence(paths, index, threshold=DEFAULT_THRESHOLD, min_pixels=1, connectivity=8, cache=None):
+    """
+    compare_scenes for each consecutive pair of dates, plus first vs last when there are more than two.
+    Each scene's index raster is computed once.
+    """
+    if len(paths) < 2:
+        raise ValueError("Change detection needs at least two scenes")
+
+    grid = _grid(paths[0])
+    options = {"threshold": threshold, "min_pixels": min_pixels, "connectivity": connectivity}
+    first = previous = cached_indices(paths[0], [index], cache)[index]
+    changes = []
+    for before, after in zip(paths[:-1], paths[1:]):
+        _check_same_grid(grid, _grid(after), after)
+        current = cached_indices(after, [index], cache)[index]
+        changes.append(_compare(before, after, index, previous, current, grid, options))
+        previous = current
+
+    if len(paths) > 2:
+        changes.append(_compare(paths[0], paths[-1], index, first, previous, grid, options))
+    return changes
+
+
+def to_geojson(changes):
+    """Change regions of one or more comparisons as a GeoJSON FeatureCollection"""
+    if isinstance(changes, dict):
+        changes = [changes]
+    features = []
+    for change in changes:
+        for region in change["regions"]:
+            properties = {key: value for key, value in region.items() if key != "geometry"}
+            properties.update(index=change["index"], before=change["before"], after=change["after"])
+            features.append({"type": "Feature", "properties": properties, "geometry": region["geometry"]})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-pixel index change between two or more dated scenes")
+    parser.add_argument("scenes", nargs="+", help="scenes in date order")
+    parser.add_argument("--index", required=True, help="e.g. mndwi")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="minimum |delta| per pixel")
+    parser.add_argument("--min-pixels", type=int, default=1, help="drop regions smaller than this")
+    parser.add_argument("--connectivity", type=int, default=8, choices=[4, 8])
+    parser.add_argument("--out", default=None, help="GeoJSON output path for the change regions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    changes = change_sequence(args.scenes, args.index, args.threshold, args.min_pixels, args.connectivity)
+    for change in changes:
+        summary = change["summary"]
+        print(f"{args.index.upper()} {change['before']} -> {change['after']}: mean change "
+              f"{summary['mean_delta']:+.4f}, {summary['regions']} regions, "
+              f"+{summary['increase_area_m2']:.0f} m2 / -{summary['decrease_area_m2']:.0f} m2")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(to_geojson(changes), f)
+        logger.info(f"Wrote change regions to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
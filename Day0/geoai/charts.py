@@ -0,0 +1,244 @@
+"""
+Headless chart rendering for batch reports.
+
+NOTE:
+1.Every charts.py (ndbi, ndmi, MNDWI, LST) and ndvi/kpi_analysis.py builds one figure for two hard-coded
+  dates and calls plt.show(), which needs a display.
+2.Here charts are rendered with the non-interactive Agg backend straight to PNG:
+    - one chart per AOI x layer, with one panel per date (two dates give the familiar side-by-side,
+      more dates a small-multiple grid of up to `max_panels` panels per PNG)
+    - named <directory>_<aoi>_<layer>.png, after the source folder (polygon_swir_nir_sector14_ndbi.png); with
+      several folders, after their path below the common parent (ndbi/polygon_swir_nir and MNDWI/polygon
+      -> ndbi_polygon_swir_nir_sector14_ndbi.png, mndwi_polygon_sector14_mndwi.png), so the same AOI and
+      layer from two source folders never overwrite each other
+    - same color maps and value ranges as the scripts (NDVI RdYlGn, NDBI / NDMI / MNDWI gray in [-1, 1],
+      LST inferno over the common temperature range of the chart)
+3.Charts are spread over worker processes. Each worker keeps one figure template per grid shape
+  (rows x cols): later charts only swap the image data, titles and color map and save again, instead of
+  building a new figure, axes and colorbar every time. Layout is the expensive part of a matplotlib figure.
+4.Scenes are read through geoai.cog.read_at_resolution, so COG scenes with overviews decode only the
+  overview that matches the panel size (max_size); index layers are masked with the scene's SCL band,
+  decoded once per scene and shared by all of its layers (geoai.mask.quality_mask).
+
+Example (from the Day0 folder):
+    python -m geoai.charts ndbi/polygon_swir_nir MNDWI/polygon LST --out charts --workers 4
+"""
+import argparse
+import logging
+import os
+
+import numpy as np
+import rasterio
+
+from geoai.cog import read_at_resolution
+from geoai.geometry import slugify
+from geoai.indices import INDEX_BANDS, available_indices, band_indexes, normalized_difference
+from geoai.lst import LST_BAND, decode_lst, table_for
+from geoai.mask import quality_mask
+from geoai.timeseries import discover_scenes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PANELS = 12
+DEFAULT_MAX_COLUMNS = 4
+DEFAULT_MAX_SIZE = 1024
+PANEL_INCHES = 5
+
+LAYER_STYLES = {
+    "ndvi": {"cmap": "RdYlGn", "vmin": -1, "vmax": 1, "label": "NDVI"},
+    "ndbi": {"cmap": "gray", "vmin": -1, "vmax": 1, "label": "NDBI Value"},
+    "ndmi": {"cmap": "gray", "vmin": -1, "vmax": 1, "label": "NDMI Value"},
+    "mndwi": {"cmap": "gray", "vmin": -1, "vmax": 1, "label": "MNDWI Value"},
+    "lst": {"cmap": "inferno", "vmin": None, "vmax": None, "label": "Temperature (°C)"},
+}
+
+# (rows, cols) -> (figure, axes, images, colorbar); one set per worker process
+_templates = {}
+
+
+def scene_layers(path):
+    """Layers a chart can show for a scene"""
+    with rasterio.open(path) as src:
+        descriptions = src.descriptions
+    layers = available_indices(descriptions)
+    if LST_BAND in descriptions:
+        layers.append("lst")
+    return layers
+
+
+def load_layer(path, layer, max_size=None):
+    """One layer of a scene as float32 with NaN for masked pixels, read at reduced resolution"""
+    with rasterio.open(path) as src:
+        if layer == "lst":
+            bands = [LST_BAND]
+        else:
+            bands = list(INDEX_BANDS[layer])
+        indexes = band_indexes(src, bands)
+        scales = [src.scales[i - 1] for i in indexes]
+        offsets = [src.offsets[i - 1] for i in indexes]
+
+    data, _ = read_at_resolution(path, max_size=max_size, indexes=indexes)
+
+    if layer == "lst":
+        return decode_lst(data[0], table=table_for(scales[0], offsets[0]))
+
+    a, b = (data[i].astype("float32") * scales[i] + offsets[i] for i in range(2))
+    values = normalized_difference(a, b)
+    clear = quality_mask(path, max_size)
+    if clear is not None:
+        values[~clear] = np.nan
+    return values
+
+
+def directory_prefixes(directories):
+    """
+    Chart name prefix per directory (by absolute path): the folder name, or with several folders their path
+    relative to the common parent, slugified.
+    """
+    paths = list(dict.fromkeys(os.path.abspath(directory) for directory in directories))
+    root = os.path.commonpath(paths) if len(paths) > 1 else None
+    prefixes = {}
+    for path in paths:
+        relative = os.path.relpath(path, root) if root else os.curdir
+        prefix = slugify(os.path.basename(path) if relative == os.curdir else relative)
+        for other, other_prefix in prefixes.items():
+            if other_prefix == prefix:
+                raise ValueError(f"Directories {other} and {path} would write the same chart names")
+        prefixes[path] = prefix
+    return prefixes
+
+
+def plan_charts(directories, layers=None, out_dir="charts", max_panels=DEFAULT_MAX_PANELS, aoi=None):
+    """
+    One chart per AOI x layer (split every max_panels dates), named after the source directory, AOI and layer.
+    Returns chart dicts {"title", "layer", "panels": [(label, path)], "out_path"}.
+    """
+    charts = []
+    prefixes = directory_prefixes(directories)
+    for directory in dict.fromkeys(directories):
+        prefix = prefixes[os.path.abspath(directory)]
+        scenes = discover_scenes(directory, aoi)
+        by_aoi = {}
+        for scene in scenes:
+            by_aoi.setdefault(scene["aoi"], []).append(scene)
+
+        for aoi_name, aoi_scenes in by_aoi.items():
+            available = scene_layers(aoi_scenes[0]["path"])
+            for layer in layers or available:
+                if layer not in available:
+                    continue
+                for part, start in enumerate(range(0, len(aoi_scenes), max_panels)):
+                    chunk = aoi_scenes[start:start + max_panels]
+                    suffix = f"_{part + 1}" if len(aoi_scenes) > max_panels else ""
+                    charts.append({
+                        "title": f"{layer.upper()} - {aoi_name}",
+                        "layer": layer,
+                        "panels": [(scene["date"], scene["path"]) for scene in chunk],
+                        "out_path": os.path.join(out_dir, f"{prefix}_{aoi_name}_{layer}{suffix}.png"),
+                    })
+    logger.info(f"Planned {len(charts)} charts")
+    return charts
+
+
+def _grid_shape(panel_count, max_columns=DEFAULT_MAX_COLUMNS):
+    cols = min(panel_count, max_columns)
+    return -(-panel_count // cols), cols
+
+
+def _template(rows, cols):
+    """Figure, axes, images and colorbar for a rows x cols grid, built once per worker"""
+    if (rows, cols) in _templates:
+        return _templates[(rows, cols)]
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(rows, cols, figsize=(PANEL_INCHES * cols + 1, PANEL_INCHES * rows + 0.5),
+                             squeeze=False)
+    axes = list(axes.flat)
+    images = [ax.imshow(np.zeros((2, 2), dtype="float32"), vmin=-1, vmax=1) for ax in axes]
+    for ax in axes:
+        ax.axis("off")
+    cbar = fig.colorbar(images[0], ax=axes, shrink=0.8, aspect=20, pad=0.02)
+    _templates[(rows, cols)] = (fig, axes, images, cbar)
+    return _templates[(rows, cols)]
+
+
+def render_chart(chart, max_size=DEFAULT_MAX_SIZE, max_columns=DEFAULT_MAX_COLUMNS):
+    """Render one chart to its PNG through the reusable template; returns the PNG path"""
+    style = LAYER_STYLES[chart["layer"]]
+    layers = [load_layer(path, chart["layer"], max_size) for _, path in chart["panels"]]
+
+    vmin, vmax = style["vmin"], style["vmax"]
+    if vmin is None:
+        finite = [values[np.isfinite(values)] for values in layers]
+        finite = [values for values in finite if values.size]
+        vmin = min(float(values.min()) for values in finite) if finite else 0.0
+        vmax = max(float(values.max()) for values in finite) if finite else 1.0
+
+    fig, axes, images, cbar = _template(*_grid_shape(len(layers), max_columns))
+    for i, (ax, image) in enumerate(zip(axes, images)):
+        if i >= len(layers):
+            ax.set_visible(False)
+            continue
+        values = layers[i]
+        ax.set_visible(True)
+        image.set_data(values)
+        image.set_extent((-0.5, values.shape[1] - 0.5, values.shape[0] - 0.5, -0.5))
+        image.set_cmap(style["cmap"])
+        image.set_clim(vmin, vmax)
+        ax.set_title(f"{chart['layer'].upper()} - {chart['panels'][i][0]}")
+
+    fig.suptitle(chart["title"])
+    cbar.update_normal(images[0])
+    cbar.set_label(style["label"], rotation=270, labelpad=15)
+
+    os.makedirs(os.path.dirname(chart["out_path"]) or ".", exist_ok=True)
+    fig.savefig(chart["out_path"], dpi=100)
+    return chart["out_path"]
+
+
+def _render_job(args):
+    return render_chart(*args)
+
+
+def render_charts(charts, workers=None, max_size=DEFAULT_MAX_SIZE, max_columns=DEFAULT_MAX_COLUMNS):
+    """Render every chart across a process pool (workers=1 renders in this process)"""
+    if not charts:
+        return []
+
+    jobs = [(chart, max_size, max_columns) for chart in charts]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    logger.info(f"Rendering {len(jobs)} charts with {workers} workers")
+
+    if workers == 1:
+        return [_render_job(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Bigger chunks keep consecutive charts (same grid shape) on the same worker template
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render PNG charts for every <aoi>_<date>.tif in directories")
+    parser.add_argument("directories", nargs="+")
+    parser.add_argument("--layers", nargs="+", help="e.g. ndvi lst (default: every layer the bands allow)")
+    parser.add_argument("--aoi", default=None, help="only scenes for this AOI prefix, e.g. sector14")
+    parser.add_argument("--out", default="charts", help="output folder for the PNG files")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--max-panels", type=int, default=DEFAULT_MAX_PANELS, help="dates per chart")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE, help="longest panel side in pixels")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    charts = plan_charts(args.directories, args.layers, args.out, args.max_panels, args.aoi)
+    for path in render_charts(charts, args.workers, args.max_size):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
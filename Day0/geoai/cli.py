@@ -0,0 +1,59 @@
+"""
+One command line for the whole package: python -m geoai <command> ...
+
+NOTE:
+1.Every script imports ee, dotenv, rasterio and matplotlib at the top, so even a stats-only run pays for
+  matplotlib.pyplot (~0.65 s) and the extract scripts each repeat the Earth Engine setup.
+2.Here a command is only a module name until it is picked: the chosen module is imported and its own main()
+  parses the rest of the arguments, so `python -m geoai analyze --help` shows the timeseries options.
+    extract   geoai.batch        run every extraction of a job file (Earth Engine)
+    analyze   geoai.timeseries   index stats for every dated scene in a directory
+    chart     geoai.charts       headless PNG charts
+    report    geoai.zonal        per-sector KPI table of a scene
+    change    geoai.change       change regions between two dates
+    trace     geoai.tracing      per-stage latency summary of trace files
+3.The package keeps heavy imports next to their use: ee and dotenv are only imported by
+  geoai.extract.get_client / initialize_earth_engine, matplotlib only when a chart is drawn, the process
+  pool only when more than one worker runs. analyze, report and change therefore import numpy + rasterio
+  and nothing heavier; check with
+    python -X importtime -m geoai analyze ndbi/polygon_swir_nir 2> importtime.log
+
+Example (from the Day0 folder):
+    python -m geoai analyze ndbi/polygon_swir_nir --workers 4 --out ndbi_timeseries.csv
+    python -m geoai chart ndbi/polygon_swir_nir --out charts
+    python -m geoai extract jobs/sector14_monthly.json --dry-run
+"""
+import argparse
+import importlib
+import sys
+
+COMMANDS = {
+    "extract": ("geoai.batch", "run every extraction of a job file (Earth Engine)"),
+    "analyze": ("geoai.timeseries", "index stats for every dated scene in a directory"),
+    "chart": ("geoai.charts", "headless PNG charts"),
+    "report": ("geoai.zonal", "per-sector KPI table of a scene"),
+    "change": ("geoai.change", "change regions between two dates"),
+    "trace": ("geoai.tracing", "per-stage latency summary of trace files"),
+}
+
+
+def main(argv=None):
+    commands = "\n".join(f"  {name:<9} {description}" for name, (_, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="geoai",
+        description="GEO-AI toolkit",
+        epilog=f"commands:\n{commands}\n\n`python -m geoai <command> --help` shows the options of a command",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command", help="one of the commands below")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments of the command")
+    args = parser.parse_args(argv)
+
+    # Import the command's module only now, and let its own parser read the remaining arguments
+    module = importlib.import_module(COMMANDS[args.command][0])
+    sys.argv = [f"geoai {args.command}"] + args.args
+    return module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Cloud-Optimized GeoTIFF ingest with overview pyramids.
+
+NOTE:
+1.The .tif files the charts and analysis read (ndbi/polygon_swir_nir/*.tif, LST/lst_*.tif ...) are plain
+  GeoTIFFs without overviews, so every imshow decodes the full resolution.
+2.convert_to_cog rewrites a scene as a Cloud-Optimized GeoTIFF:
+    - internal 256x256 tiles, DEFLATE + predictor (same options as geoai.rasters)
+    - decimated overviews (2x, 4x, 8x ...) down to a single tile
+    - overviews stored ahead of the full-resolution tiles (smallest first), so a preview reads only the
+      start of the file and a reader only touches the bytes it needs
+3.read_at_resolution opens just the overview level that matches the requested size or ground resolution,
+  so a preview of a large scene decodes a small overview instead of the full raster.
+4.Overviews default to nearest-neighbour resampling: SCL class codes and LST no-data values (0 / 65535)
+  must not be averaged with their neighbours. Pass resampling="average" for pure reflectance scenes.
+5.Scenes downloaded directly by geoai.download are converted as soon as they land; Drive exports are
+  ingested with this command once they are downloaded.
+
+Example (from the Day0 folder):
+    python -m geoai.cog ndbi/polygon_swir_nir LST
+"""
+import argparse
+import logging
+import os
+
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.shutil import copy as raster_copy
+
+from geoai.rasters import BLOCK_SIZE, creation_options
+
+logger = logging.getLogger(__name__)
+
+
+def overview_factors(width, height, blocksize=BLOCK_SIZE):
+    """2, 4, 8 ... until the smallest overview fits in one tile"""
+    factors = []
+    factor = 2
+    while max(width, height) / (factor // 2) > blocksize:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def is_cog(path):
+    """Tiled with overviews (or small enough not to need any)"""
+    with rasterio.open(path) as src:
+        tiled = src.profile.get("tiled", False)
+        needs_overviews = bool(overview_factors(src.width, src.height))
+        return tiled and (src.overviews(1) or not needs_overviews)
+
+
+def convert_to_cog(path, out_path=None, resampling="nearest"):
+    """Rewrite a GeoTIFF as a COG (in place by default); returns the written path"""
+    out_path = out_path or path
+    tmp_path = out_path + ".ovr.tif"
+
+    with rasterio.open(path) as src:
+        options = creation_options(src.dtypes[0])
+        factors = overview_factors(src.width, src.height)
+
+    # 1) tiled working copy, 2) build overviews on it, 3) copy again so overviews land in COG order
+    raster_copy(path, tmp_path, **options)
+    with rasterio.open(tmp_path, "r+") as dst:
+        if factors:
+            dst.build_overviews(factors, Resampling[resampling])
+            dst.update_tags(ns="rio_overview", resampling=resampling)
+
+    raster_copy(tmp_path, out_path + ".tmp.tif", copy_src_overviews=True, **options)
+    os.remove(tmp_path)
+    os.replace(out_path + ".tmp.tif", out_path)
+    logger.info(f"Wrote COG {out_path} with overviews {factors}")
+    return out_path
+
+
+def ingest_directory(directory, resampling="nearest", force=False):
+    """Convert every .tif under a directory to COG in place; returns the converted paths"""
+    converted = []
+    for root, _, files in os.walk(directory):
+        for file_name in sorted(files):
+            if not file_name.lower().endswith((".tif", ".tiff")):
+                continue
+            path = os.path.join(root, file_name)
+            if not force and is_cog(path):
+                continue
+            converted.append(convert_to_cog(path, resampling=resampling))
+    logger.info(f"Converted {len(converted)} scenes under {directory}")
+    return converted
+
+
+def read_at_resolution(path, max_size=None, resolution=None, indexes=None):
+    """
+    Read a scene at reduced resolution, decoding only the matching overview.
+
+    max_size: longest side of the result in pixels, or
+    resolution: ground resolution of the result in CRS units (meters for our UTM exports).
+    Returns (array with shape (bands, rows, cols), transform of the result).
+    """
+    with rasterio.open(path) as src:
+        if max_size is not None:
+            factor = max(src.width, src.height) / max_size
+        elif resolution is not None:
+            factor = resolution / src.res[0]
+        else:
+            factor = 1
+        factor = max(factor, 1)
+        overviews = src.overviews(1)
+        width, height = src.width, src.height
+        transform = src.transform
+
+    # Deepest overview that is still at least as detailed as requested
+    level = None
+    for i, overview in enumerate(overviews):
+        if overview <= factor:
+            level = i
+
+    out_width = max(1, int(round(width / factor)))
+    out_height = max(1, int(round(height / factor)))
+    open_options = {} if level is None else {"overview_level": level}
+
+    with rasterio.open(path, **open_options) as src:
+        indexes = indexes or list(range(1, src.count + 1))
+        data = src.read(indexes, out_shape=(len(indexes), out_height, out_width), resampling=Resampling.nearest)
+
+    out_transform = transform * transform.scale(width / out_width, height / out_height)
+    return data, out_transform
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite scenes as Cloud-Optimized GeoTIFFs with overviews")
+    parser.add_argument("paths", nargs="+", help="files or directories")
+    parser.add_argument("--resampling", default="nearest", choices=["nearest", "average", "mode"])
+    parser.add_argument("--force", action="store_true", help="convert even files that are already COGs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    for path in args.paths:
+        if os.path.isdir(path):
+            ingest_directory(path, args.resampling, args.force)
+        else:
+            convert_to_cog(path, resampling=args.resampling)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Band names and cloud-mask definitions shared by the server-side (geoai.extract) and local (geoai.mask)
+code paths.
+
+NOTE:
+1.Kept free of imports, so geoai.mask can use them without importing the Earth Engine extraction code
+  and geoai.extract without importing numpy / rasterio.
+"""
+
+# Sentinel-2 scene classification band, exported next to the reflectance bands
+CLASSIFICATION_BAND = "SCL"
+
+# SCL classes masked out: 0 no data, 1 saturated / defective, 3 cloud shadow,
+# 8 cloud (medium probability), 9 cloud (high probability), 10 thin cirrus, 11 snow / ice
+SCL_MASK_CLASSES = [0, 1, 3, 8, 9, 10, 11]
+
+# Landsat Collection 2 QA_PIXEL bits masked out: 0 fill, 1 dilated cloud, 2 cirrus, 3 cloud, 4 cloud shadow, 5 snow
+QA_PIXEL_BAND = "QA_PIXEL"
+QA_PIXEL_MASK_BITS = [0, 1, 2, 3, 4, 5]
@@ -0,0 +1,204 @@
+"""
+Memory-mapped spatio-temporal datacube store.
+
+NOTE:
+1.Time-series work today means reopening and recasting every sector14_<date>.tif file.
+2.build_datacube stacks aligned scenes (same size, transform and CRS, same bands) into an on-disk
+  (time, band, y, x) array. The array is split into chunks of `time_chunk` dates x all bands x
+  `space_chunk` x `space_chunk` pixels; each chunk is a plain .npy file next to a meta.json with the dates,
+  band names, grid and scale/offset of every band.
+3.open_datacube memory-maps the chunks, so nothing is read until it is touched and the OS page cache does
+  the rest. Inside one chunk:
+    - a per-date slice cube.date_slice(t) is a contiguous view (zero-copy)
+    - a per-pixel time series cube.pixel_series(y, x) is a strided view (zero-copy)
+  Only requests that cross chunk borders are assembled into a new array. With the defaults an AOI-sized
+  scene is a single spatial chunk and up to 32 dates share a time chunk, so both access patterns stay
+  zero-copy for our sector rasters.
+4.Values are stored in the scenes' own dtype (uint8 / int16), so the cube is no bigger than the GeoTIFFs
+  decompressed; apply `scales` / `offsets` from the metadata to get reflectance.
+
+Example (from the Day0 folder):
+    python -m geoai.datacube ndbi/polygon_swir_nir cubes/sector14_swir_nir
+"""
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+DEFAULT_TIME_CHUNK = 32
+DEFAULT_SPACE_CHUNK = 1024
+
+
+def _chunk_name(ti, yi, xi):
+    return f"t{ti}_y{yi}_x{xi}.npy"
+
+
+def _crs_wkt(crs):
+    """WKT of a CRS, None for scenes without one (stored as null in meta.json)"""
+    return crs.to_wkt() if crs else None
+
+
+def _check_aligned(reference, src, path):
+    if (src.width, src.height) != (reference["width"], reference["height"]):
+        raise ValueError(f"{path} is {src.width}x{src.height}, expected {reference['width']}x{reference['height']}")
+    if list(src.transform)[:6] != reference["transform"] or _crs_wkt(src.crs) != reference["crs"]:
+        raise ValueError(f"{path} is not on the same grid as the first scene")
+    if list(src.descriptions) != reference["bands"]:
+        raise ValueError(f"{path} has bands {src.descriptions}, expected {reference['bands']}")
+
+
+def build_datacube(scenes, out_dir, time_chunk=DEFAULT_TIME_CHUNK, space_chunk=DEFAULT_SPACE_CHUNK):
+    """
+    Stack aligned scenes into a chunked on-disk cube.
+    scenes: list of {"date", "path"} dicts (e.g. from geoai.timeseries.discover_scenes), in time order.
+    Scenes of more than one AOI (their "aoi" key) are rejected: each AOI has its own grid.
+    Returns the opened DataCube.
+    """
+    if not scenes:
+        raise ValueError("No scenes to stack")
+    aois = sorted({scene["aoi"] for scene in scenes if scene.get("aoi")})
+    if len(aois) > 1:
+        raise ValueError(f"Scenes of several AOIs ({', '.join(aois)}); stack one AOI per cube (--aoi)")
+    os.makedirs(out_dir, exist_ok=True)
+
+    with rasterio.open(scenes[0]["path"]) as src:
+        meta = {
+            "dates": [scene["date"] for scene in scenes],
+            "bands": list(src.descriptions),
+            "dtype": src.dtypes[0],
+            "width": src.width,
+            "height": src.height,
+            "crs": _crs_wkt(src.crs),
+            "transform": list(src.transform)[:6],
+            "scales": list(src.scales),
+            "offsets": list(src.offsets),
+            "time_chunk": time_chunk,
+            "space_chunk": space_chunk,
+        }
+
+    band_count = len(meta["bands"])
+    for t0 in range(0, len(scenes), time_chunk):
+        chunk_scenes = scenes[t0:t0 + time_chunk]
+        ti = t0 // time_chunk
+        sources = [rasterio.open(scene["path"]) for scene in chunk_scenes]
+        try:
+            for src, scene in zip(sources, chunk_scenes):
+                _check_aligned(meta, src, scene["path"])
+
+            for y0 in range(0, meta["height"], space_chunk):
+                for x0 in range(0, meta["width"], space_chunk):
+                    window = Window(x0, y0, min(space_chunk, meta["width"] - x0),
+                                    min(space_chunk, meta["height"] - y0))
+                    chunk = np.lib.format.open_memmap(
+                        os.path.join(out_dir, _chunk_name(ti, y0 // space_chunk, x0 // space_chunk)),
+                        mode="w+",
+                        dtype=meta["dtype"],
+                        shape=(len(chunk_scenes), band_count, window.height, window.width),
+                    )
+                    for t, src in enumerate(sources):
+                        src.read(window=window, out=chunk[t])
+                    chunk.flush()
+                    del chunk
+        finally:
+            for src in sources:
+                src.close()
+
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    logger.info(f"Built datacube {out_dir}: {len(scenes)} dates x {band_count} bands x "
+                f"{meta['height']}x{meta['width']}")
+    return open_datacube(out_dir)
+
+
+def open_datacube(cube_dir):
+    with open(os.path.join(cube_dir, META_FILE), encoding="utf-8") as f:
+        return DataCube(cube_dir, json.load(f))
+
+
+class DataCube:
+    """Read access to a chunked (time, band, y, x) store; chunks are memory-mapped on first use"""
+
+    def __init__(self, cube_dir, meta):
+        self.cube_dir = cube_dir
+        self.meta = meta
+        self.dates = meta["dates"]
+        self.bands = meta["bands"]
+        self.time_chunk = meta["time_chunk"]
+        self.space_chunk = meta["space_chunk"]
+        self.shape = (len(self.dates), len(self.bands), meta["height"], meta["width"])
+        self._chunks = {}
+
+    def chunk(self, ti, yi, xi):
+        """The memory-mapped chunk array, shape (dates in chunk, bands, rows, cols)"""
+        key = (ti, yi, xi)
+        if key not in self._chunks:
+            self._chunks[key] = np.load(os.path.join(self.cube_dir, _chunk_name(*key)), mmap_mode="r")
+        return self._chunks[key]
+
+    def date_index(self, date):
+        return self.dates.index(date)
+
+    def band_index(self, band):
+        return band if isinstance(band, int) else self.bands.index(band)
+
+    def date_slice(self, date, band=None):
+        """
+        (bands, y, x), or (y, x) for one band, at one date (index or 'YYYY-MM-DD').
+        Zero-copy when the scene is a single spatial chunk.
+        """
+        t = date if isinstance(date, int) else self.date_index(date)
+        ti, tt = divmod(t, self.time_chunk)
+        b = slice(None) if band is None else self.band_index(band)
+        height, width = self.shape[2:]
+        y_chunks = -(-height // self.space_chunk)
+        x_chunks = -(-width // self.space_chunk)
+
+        if y_chunks == 1 and x_chunks == 1:
+            return self.chunk(ti, 0, 0)[tt, b]
+
+        rows = [
+            np.concatenate([self.chunk(ti, yi, xi)[tt, b] for xi in range(x_chunks)], axis=-1)
+            for yi in range(y_chunks)
+        ]
+        return np.concatenate(rows, axis=-2)
+
+    def pixel_series(self, row, col, band=None):
+        """
+        (time, bands), or (time,) for one band, at one pixel.
+        Zero-copy when every date is in a single time chunk.
+        """
+        yi, yy = divmod(row, self.space_chunk)
+        xi, xx = divmod(col, self.space_chunk)
+        b = slice(None) if band is None else self.band_index(band)
+        time_chunks = -(-len(self.dates) // self.time_chunk)
+
+        parts = [self.chunk(ti, yi, xi)[:, b, yy, xx] for ti in range(time_chunks)]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stack every <aoi>_<date>.tif in a directory into a datacube")
+    parser.add_argument("directory")
+    parser.add_argument("out_dir")
+    parser.add_argument("--aoi", default=None)
+    parser.add_argument("--time-chunk", type=int, default=DEFAULT_TIME_CHUNK)
+    parser.add_argument("--space-chunk", type=int, default=DEFAULT_SPACE_CHUNK)
+    args = parser.parse_args()
+
+    from geoai.timeseries import discover_scenes
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    cube = build_datacube(discover_scenes(args.directory, args.aoi), args.out_dir, args.time_chunk, args.space_chunk)
+    print(f"{cube.shape[0]} dates x {cube.shape[1]} bands x {cube.shape[2]}x{cube.shape[3]} in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Direct pixel download for small AOIs (no Drive export).
+
+NOTE:
+1.export_image_to_drive sends even sector-sized rasters through Export.image.toDrive, which waits in the
+  batch queue and then needs a manual Drive download before the analysis scripts can read the .tif.
+2.For requests under Earth Engine's interactive size limit, image.getDownloadURL() returns a URL
+  that serves the clipped GeoTIFF directly. We stream it to a local file, which takes seconds instead of
+  minutes of queue time.
+3.The request size is estimated locally from the AOI bounding box, the scale and the band count.
+  Bigger requests fall back to the normal batch export, and so do requests Earth Engine rejects as too
+  large (the estimate is only the bounding box) and downloads that fail in transit (connection, timeout,
+  HTTP error). Any other error is a real problem with the image or the file and is raised.
+4.A direct download is wrapped in DownloadedScene, which looks like a finished export task
+  (id / active() / status()), so the batch runner and the task monitor treat both paths the same way.
+5.A downloaded scene is ingested right away: finalized for its export profile (geoai.rasters), then
+  rewritten as a Cloud-Optimized GeoTIFF with overviews (geoai.cog), so it is ready for the charts.
+  Download and ingest work on a staging file that only takes the scene's name once ingest succeeded, so a
+  failed run never leaves a half-processed <aoi>_<date>.tif behind.
+
+Example:
+    task = deliver_image(image, "2025-01-28", geometry, aoi_name="sector14", download_dir="downloads")
+"""
+import http.client
+import logging
+import math
+import os
+import shutil
+import urllib.request
+
+from geoai.extract import export_image_to_drive
+from geoai.geometry import geometry_points
+from geoai.metrics import DOWNLOAD_BYTES, EE_REQUESTS, TASKS_SUBMITTED
+from geoai.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# getDownloadURL rejects requests above 32 MB; stay a little under it
+DOWNLOAD_LIMIT_BYTES = 30 * 1024 * 1024
+METERS_PER_DEGREE = 111320.0
+CHUNK_BYTES = 1024 * 1024
+# Network failures of a download (urllib.error.URLError / HTTPError and socket timeouts are OSErrors)
+TRANSPORT_ERRORS = (OSError, http.client.HTTPException)
+
+
+class RequestTooLarge(ValueError):
+    """Earth Engine refused a direct download because of its size"""
+
+
+class DownloadedScene:
+    """A finished direct download, shaped like an ee.batch.Task"""
+
+    def __init__(self, path, size_bytes):
+        self.id = f"download:{os.path.basename(path)}"
+        self.path = path
+        self.size_bytes = size_bytes
+
+    def active(self):
+        return False
+
+    def status(self):
+        return {"state": "COMPLETED", "id": self.id, "destination_uris": [self.path]}
+
+
+def estimate_request_bytes(geometry, scale, band_count, bytes_per_pixel):
+    """Uncompressed size of the AOI bounding box at `scale` meters per pixel"""
+    if hasattr(geometry, "toGeoJSON"):
+        geometry = geometry.toGeoJSON()
+    points = geometry_points(geometry)
+    lons = [point[0] for point in points]
+    lats = [point[1] for point in points]
+
+    mid_lat = math.radians((min(lats) + max(lats)) / 2)
+    width_m = (max(lons) - min(lons)) * METERS_PER_DEGREE * math.cos(mid_lat)
+    height_m = (max(lats) - min(lats)) * METERS_PER_DEGREE
+
+    pixels = math.ceil(width_m / scale + 1) * math.ceil(height_m / scale + 1)
+    return pixels * band_count * bytes_per_pixel
+
+
+def get_download_url(image, geometry, scale):
+    """Ask Earth Engine for a direct GeoTIFF download URL of the clipped image"""
+    try:
+        url = image.getDownloadURL({
+            "region": geometry,
+            "scale": scale,
+            "format": "GEO_TIFF",
+            "filePerBand": False,
+        })
+    except Exception as e:
+        # ee.EEException: "Total request size (... bytes) must be less than or equal to ... bytes."
+        if "request size" in str(e).lower():
+            raise RequestTooLarge(str(e)) from e
+        raise
+    EE_REQUESTS.inc(call="download_url")
+    return url
+
+
+def download_url(url, out_path, timeout=300):
+    """Stream a URL to out_path (written as .part, then renamed); returns bytes written"""
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    part_path = out_path + ".part"
+    with span("download", path=out_path) as downloaded:
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response, open(part_path, "wb") as f:
+                shutil.copyfileobj(response, f, CHUNK_BYTES)
+                # A connection dropped mid-body just ends the stream, so compare with the announced length
+                expected = response.headers.get("Content-Length")
+                if expected is not None and f.tell() != int(expected):
+                    raise http.client.IncompleteRead(b"", int(expected) - f.tell())
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        os.replace(part_path, out_path)
+        size_bytes = os.path.getsize(out_path)
+        downloaded.set(bytes=size_bytes)
+    DOWNLOAD_BYTES.inc(size_bytes)
+    logger.info(f"Downloaded {size_bytes} bytes to {out_path}")
+    return size_bytes
+
+
+def download_image(image, geometry, out_path, scale=10):
+    """Download the clipped image straight to a local GeoTIFF; returns a DownloadedScene"""
+    url = get_download_url(image, geometry, scale)
+    scene = DownloadedScene(out_path, download_url(url, out_path))
+    TASKS_SUBMITTED.inc(method="download")
+    return scene
+
+
+def ingest_download(path, profile=None):
+    """Finalize a downloaded scene for its export profile and rewrite it as a COG"""
+    from geoai.cog import convert_to_cog
+    from geoai.rasters import finalize_geotiff
+
+    with span("ingest", path=path):
+        if profile is not None:
+            finalize_geotiff(path, profile)
+        convert_to_cog(path)
+    return path
+
+
+def deliver_image(image, date_used, geometry, aoi_name='sector14', scale=10, download_dir=None,
+                  band_count=1, bytes_per_pixel=1, profile=None, client=None):
+    """
+    Fetch the image directly when it is small enough, otherwise start a Drive export.
+    A download Earth Engine rejects as too large or that fails in transit also falls back to Drive.
+    A direct download is ingested right away: finalized for its export profile (tiled, compressed,
+    scale/offset tags) and converted to a COG with overviews.
+    Drive exports need `python -m geoai.rasters` and `python -m geoai.cog` once downloaded.
+    Returns a DownloadedScene or the started ee.batch.Task.
+    """
+    if download_dir is not None:
+        out_path = os.path.join(download_dir, f"{aoi_name}_{date_used}.tif")
+        size_bytes = estimate_request_bytes(geometry, scale, band_count, bytes_per_pixel)
+        if size_bytes > DOWNLOAD_LIMIT_BYTES:
+            logger.info(f"Request of ~{size_bytes} bytes is over the download limit, using Drive export")
+        else:
+            logger.info(f"Downloading {aoi_name}_{date_used} directly (~{size_bytes} bytes)...")
+            staging_path = out_path + ".ingest.tif"
+            try:
+                scene = download_image(image, geometry, staging_path, scale)
+            except (RequestTooLarge,) + TRANSPORT_ERRORS as e:
+                logger.warning(f"Direct download failed ({str(e)}), falling back to Drive export")
+            else:
+                try:
+                    ingest_download(staging_path, profile)
+                except BaseException:
+                    os.remove(staging_path)
+                    raise
+                os.replace(staging_path, out_path)
+                return DownloadedScene(out_path, scene.size_bytes)
+
+    return export_image_to_drive(image, date_used, geometry, aoi_name=aoi_name, scale=scale, client=client)
@@ -0,0 +1,576 @@
+"""
+Consolidated Sentinel-2 extraction: one stacked GeoTIFF per scene.
+
+NOTE:
+1.extract_main.py, ndbi/extract.py, ndmi/extract.py and MNDWI/extract.py all repeat the same search
+  and each start their own Export.image.toDrive for a 2-band subset of the same scene
+  (B8/B4, B11/B8, B3/B11).
+2.Here we select the union of the bands every index needs, plus the scene classification layer:
+    B2  Blue   10m
+    B3  Green  10m
+    B4  Red    10m
+    B8  NIR    10m
+    B11 SWIR   20m (resampled to 10m on export)
+    SCL Scene classification (cloud / shadow / water ...) 20m
+  and export them as one GeoTIFF, so a scene costs one export task instead of four.
+3.Earth Engine writes the band names into the GeoTIFF band descriptions, which is what
+  geoai.indices uses to find B8, B11 ... in the stacked file.
+4.Composite mode (extract_composite_scene) masks clouds per pixel (SCL for Sentinel-2, QA_PIXEL bits for
+  Landsat) and reduces every clear observation in the window to one image, either the per-pixel median or
+  a quality mosaic (each pixel from the least cloudy scene that is clear there). The tile-wide cloud
+  percentage says little about our small polygon; a composite gives one clean raster per window in one
+  export instead of trial and error over single scenes.
+5.Every function takes an optional `client`. By default it is the real `ee` module, but any object
+  with the same surface (ImageCollection, Filter, batch.Export ...) can be passed in, so the flow
+  can be exercised against a local stand-in without an Earth Engine account.
+
+Example (from the Day0 folder):
+    python -m geoai.extract
+"""
+import datetime
+import logging
+import os
+import time
+
+from geoai.constants import CLASSIFICATION_BAND, QA_PIXEL_BAND, QA_PIXEL_MASK_BITS, SCL_MASK_CLASSES
+from geoai.metrics import EE_REQUESTS, SEARCHES, TASKS_FINISHED, TASKS_SUBMITTED
+from geoai.tracing import span
+
+logger = logging.getLogger(__name__)
+
+SENTINEL2_COLLECTION = "COPERNICUS/S2_SR_HARMONIZED"
+LANDSAT8_COLLECTION = "LANDSAT/LC08/C02/T1_L2"
+
+# Union of the bands needed for RGB, NDVI, NDBI, NDMI and MNDWI, plus SCL (CLASSIFICATION_BAND) for cloud masking
+STACK_BANDS = ["B2", "B3", "B4", "B8", "B11"]
+
+# How reflectance bands are encoded on export.
+#   visual:   x0.0001, square root, x255, uint8 (what the extract scripts export; good for pictures,
+#             but normalized differences on gamma-compressed 8-bit values lose precision)
+#   analysis: raw Sentinel-2 SR values as int16; reflectance = value * scale + offset.
+#             geoai.rasters.finalize_geotiff writes the scale/offset into the file and rewrites it
+#             tiled with DEFLATE + predictor, so one file serves both pictures and analysis.
+EXPORT_PROFILES = {
+    "visual": {"bytes_per_pixel": 1, "scale": None, "offset": None},
+    "analysis": {"bytes_per_pixel": 2, "scale": 0.0001, "offset": 0.0},
+}
+
+COMPOSITE_METHODS = ("median", "quality")
+
+# Landsat Collection 2 Level-2 surface temperature scale factors (ST_B10 DN -> kelvin)
+ST_B10_SCALE = 0.00341802
+ST_B10_OFFSET = 149.0
+
+SECTOR14_GEOJSON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sector14.geojson")
+
+
+def get_client(client=None):
+    """Return the Earth Engine client to use (the real `ee` module unless a stand-in is given)"""
+    if client is not None:
+        return client
+    import ee
+    return ee
+
+
+def setup_logging(log_file='earth_engine_export.log'):
+    """Same logging setup as the extract scripts (UTF-8 file + console)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def initialize_earth_engine(client=None):
+    """Initialize Earth Engine with project ID from environment variables"""
+    ee = get_client(client)
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logger.info("Loading environment variables...")
+
+    project_id = os.getenv('PROJECT_ID')
+    if not project_id:
+        logger.error("PROJECT_ID not found in environment variables")
+        raise ValueError("PROJECT_ID not found in environment variables")
+
+    logger.info(f"Initializing Earth Engine with project ID: {project_id}")
+    with span("initialize_earth_engine", project=project_id):
+        ee.Initialize(project=project_id)
+    logger.info("Earth Engine initialized successfully")
+
+
+def get_sector14_geometry(client=None):
+    """Sector 14, Gurugram: the first polygon of sector14.geojson (the ring hard-coded in extract_main.py)"""
+    from geoai.geometry import load_ee_geometry
+
+    return load_ee_geometry(SECTOR14_GEOJSON, 0, client=client)
+
+
+def get_user_dates():
+    """Get start and end dates from user input"""
+    logger.info("Getting date range from user...")
+
+    while True:
+        try:
+            start_date = input("Enter start date (YYYY-MM-DD): ").strip()
+            datetime.datetime.strptime(start_date, '%Y-%m-%d')
+            break
+        except ValueError:
+            print("Invalid date format. Please use YYYY-MM-DD format.")
+
+    while True:
+        try:
+            end_date = input("Enter end date (YYYY-MM-DD): ").strip()
+            datetime.datetime.strptime(end_date, '%Y-%m-%d')
+            break
+        except ValueError:
+            print("Invalid date format. Please use YYYY-MM-DD format.")
+
+    logger.info(f"Date range selected: {start_date} to {end_date}")
+    return start_date, end_date
+
+
+def summarize_collection(collection, cloud_property, client=None):
+    """
+    Count, best image and candidate list of a filtered collection in ONE getInfo() round trip.
+
+    NOTE:
+    1.The extract scripts call collection.size().getInfo() and then first().getInfo(), which pulls
+      the full image info (every band and property) just to read a date and a cloud percentage.
+    2.Here the server builds a small dictionary and we evaluate it once. ee.Algorithms.If only
+      evaluates the branch it picks, so an empty collection does not fail on first().date().
+    3.The candidate ids, acquisition times and cloud covers ride along in the same call so the
+      scene catalog can answer later searches without asking again.
+    Returns {"count", "id", "date", "cloud", "candidates"}; id/date/cloud are None when the collection is empty.
+    """
+    ee = get_client(client)
+    count = collection.size()
+    best = collection.sort(cloud_property).first()
+
+    with span("getInfo", cloud_property=cloud_property):
+        summary = ee.Dictionary({
+            "count": count,
+            "best": ee.Algorithms.If(
+                count.gt(0),
+                ee.Dictionary({
+                    "id": best.get("system:id"),
+                    "date": best.date().format("YYYY-MM-dd"),
+                    "cloud": best.get(cloud_property),
+                }),
+                None,
+            ),
+            "ids": collection.aggregate_array("system:id"),
+            "times": collection.aggregate_array("system:time_start"),
+            "clouds": collection.aggregate_array(cloud_property),
+        }).getInfo()
+        EE_REQUESTS.inc(call="getInfo")
+
+    candidates = [
+        {
+            "id": image_id,
+            "date": datetime.datetime.fromtimestamp(time_ms / 1000, tz=datetime.timezone.utc).strftime('%Y-%m-%d'),
+            "cloud": cloud,
+        }
+        for image_id, time_ms, cloud in zip(summary["ids"], summary["times"], summary["clouds"])
+    ]
+
+    best_info = summary.get("best") or {}
+    return {
+        "count": summary["count"],
+        "id": best_info.get("id"),
+        "date": best_info.get("date"),
+        "cloud": best_info.get("cloud"),
+        "candidates": candidates,
+    }
+
+
+def find_best_image(collection_name, cloud_property, geometry, start_date, end_date, cloud_max=30,
+                    client=None, catalog=None):
+    """
+    Least cloudy image of a collection in a window.
+    With a SceneCatalog, covered windows are answered locally and new searches are recorded.
+    """
+    with span("search", collection=collection_name, start_date=start_date, end_date=end_date,
+              cloud_max=cloud_max) as search:
+        ee = get_client(client)
+
+        if catalog is not None:
+            candidates = catalog.lookup(collection_name, geometry, start_date, end_date, cloud_max)
+            if candidates is not None:
+                best_info = candidates[0] if candidates else {}
+                search.set(catalog_hit=True, count=len(candidates), image_id=best_info.get("id"))
+                SEARCHES.inc(source="catalog")
+                return {
+                    "count": len(candidates),
+                    "id": best_info.get("id"),
+                    "date": best_info.get("date"),
+                    "cloud": best_info.get("cloud"),
+                    "candidates": candidates,
+                }
+
+        collection = (
+            ee.ImageCollection(collection_name)
+            .filterBounds(geometry)
+            .filterDate(start_date, end_date)
+            .filter(ee.Filter.lt(cloud_property, cloud_max))
+        )
+        image_info = summarize_collection(collection, cloud_property, client=client)
+        search.set(catalog_hit=False, count=image_info["count"], image_id=image_info["id"])
+        SEARCHES.inc(source="earth_engine")
+
+        if catalog is not None:
+            catalog.store(collection_name, geometry, start_date, end_date, cloud_max, image_info["candidates"])
+        return image_info
+
+
+def search_sentinel_images(geometry, start_date, end_date, cloud_max=30, client=None, catalog=None):
+    """
+    Pick the Sentinel-2 image with the least cloud cover in the window.
+    Returns (image, image_info) where image_info is {"count", "id", "date", "cloud", "candidates"},
+    or (None, None) when nothing matches the filters.
+    """
+    ee = get_client(client)
+    logger.info(f"Searching for Sentinel-2 images from {start_date} to {end_date}...")
+
+    image_info = find_best_image(SENTINEL2_COLLECTION, "CLOUDY_PIXEL_PERCENTAGE", geometry, start_date, end_date,
+                                 cloud_max, client=client, catalog=catalog)
+    logger.info(f"Images found: {image_info['count']}")
+
+    if image_info["id"] is None:
+        logger.warning("No image found. Try relaxing filters or changing dates.")
+        return None, None
+
+    # Building the image from its id is a local operation, no extra round trip
+    return ee.Image(image_info["id"]), image_info
+
+
+def get_image_metadata(image_info):
+    """Extract and log image metadata"""
+    date_used = image_info['date']
+    cloud_pct = image_info['cloud']
+
+    logger.info(f"Using image {image_info['id']} from: {date_used}")
+    logger.info(f"Cloud coverage: {cloud_pct}%")
+
+    return date_used, cloud_pct
+
+
+def process_stack_image(sentinel_image, geometry, bands=None, profile="visual"):
+    """
+    Select the stacked bands and clip to the AOI.
+
+    With the "visual" profile, reflectance bands get the same brightness scaling as the other extract
+    scripts (x0.0001, square root, x255, uint8). With "analysis" they are kept as raw int16 values.
+    SCL holds class codes (0-11), so it is never rescaled.
+    """
+    if profile not in EXPORT_PROFILES:
+        raise ValueError(f"Unknown export profile: {profile}. Known profiles: {list(EXPORT_PROFILES)}")
+
+    bands = bands or STACK_BANDS
+    logger.info(f"Processing stacked bands {bands} + {CLASSIFICATION_BAND} ({profile} profile)...")
+
+    selected = sentinel_image.select(bands).clip(geometry)
+    classification = sentinel_image.select([CLASSIFICATION_BAND]).clip(geometry)
+
+    if profile == "analysis":
+        stacked = selected.int16().addBands(classification.int16())
+    else:
+        reflectance = selected.multiply(0.0001).pow(0.5).multiply(255).uint8()
+        stacked = reflectance.addBands(classification.uint8())
+
+    logger.info("Stacked image processed successfully")
+    return stacked
+
+
+def search_landsat_images(geometry, start_date, end_date, cloud_max=30, client=None, catalog=None):
+    """
+    Pick the Landsat 8 Level-2 image with the least cloud cover in the window (for LST).
+    Returns (image, image_info), or (None, None) when nothing matches the filters.
+    """
+    ee = get_client(client)
+    logger.info(f"Searching for Landsat 8 images from {start_date} to {end_date}...")
+
+    image_info = find_best_image(LANDSAT8_COLLECTION, "CLOUD_COVER", geometry, start_date, end_date,
+                                 cloud_max, client=client, catalog=catalog)
+    if image_info["id"] is None:
+        logger.warning("No Landsat image found. Try relaxing filters or changing dates.")
+        return None, None
+
+    logger.info(f"Using Landsat image {image_info['id']} from: {image_info['date']} "
+                f"(cloud cover {image_info['cloud']}%)")
+    return ee.Image(image_info["id"]), image_info
+
+
+def mask_sentinel_clouds(image):
+    """Mask no-data, cloud, shadow, cirrus and snow pixels using the SCL band"""
+    clear = image.select(CLASSIFICATION_BAND).remap(SCL_MASK_CLASSES, [0] * len(SCL_MASK_CLASSES), 1)
+    return image.updateMask(clear)
+
+
+def mask_landsat_clouds(image):
+    """Mask fill, cloud, cirrus, shadow and snow pixels using the QA_PIXEL bits"""
+    bits = sum(1 << bit for bit in QA_PIXEL_MASK_BITS)
+    return image.updateMask(image.select(QA_PIXEL_BAND).bitwiseAnd(bits).eq(0))
+
+
+def reduce_composite(collection, bands, method, cloud_property, client=None):
+    """
+    Reduce a cloud-masked collection to one image with `bands`.
+    median:  per-pixel median of the clear observations
+    quality: per pixel, the clear observation from the scene with the lowest cloud percentage
+             (the quality band carries the scene's cloud mask, so masked pixels never win)
+    """
+    if method not in COMPOSITE_METHODS:
+        raise ValueError(f"Unknown composite method: {method}. Known methods: {list(COMPOSITE_METHODS)}")
+
+    ee = get_client(client)
+    if method == "median":
+        return collection.select(bands).median()
+
+    def add_quality(image):
+        clearness = ee.Number(100).subtract(image.get(cloud_property))
+        # A constant image is unmasked everywhere; without the clear mask qualityMosaic would pick
+        # the least cloudy scene even where that scene's pixel is cloud
+        quality = ee.Image.constant(clearness).toFloat().rename("quality")
+        return image.addBands(quality.updateMask(image.select(bands[0]).mask()))
+
+    return collection.map(add_quality).qualityMosaic("quality").select(bands)
+
+
+def search_composite(sensor, geometry, start_date, end_date, cloud_max=30, method="median", bands=None,
+                     client=None, catalog=None):
+    """
+    Cloud-masked composite of every image in the window.
+    Returns (image, image_info), or (None, None) when no image matches the filters.
+    image_info["id"] names the composite (collection, method, window and image count), so a window is
+    exported again only when new images arrive.
+    """
+    ee = get_client(client)
+    if sensor == "landsat_lst":
+        collection_name, cloud_property, mask = LANDSAT8_COLLECTION, "CLOUD_COVER", mask_landsat_clouds
+    else:
+        collection_name, cloud_property = SENTINEL2_COLLECTION, "CLOUDY_PIXEL_PERCENTAGE"
+        mask = mask_sentinel_clouds
+
+    logger.info(f"Building {method} composite of {collection_name} from {start_date} to {end_date}...")
+    image_info = find_best_image(collection_name, cloud_property, geometry, start_date, end_date, cloud_max,
+                                 client=client, catalog=catalog)
+    if not image_info["count"]:
+        logger.warning("No image found. Try relaxing filters or changing dates.")
+        return None, None
+
+    collection = (
+        ee.ImageCollection(collection_name)
+        .filterBounds(geometry)
+        .filterDate(start_date, end_date)
+        .filter(ee.Filter.lt(cloud_property, cloud_max))
+        .map(mask)
+    )
+    if sensor == "landsat_lst":
+        composite = reduce_composite(collection, ["ST_B10"], method, cloud_property, client)
+    elif method == "median":
+        # Class codes have no median; keep the most frequent clear class per pixel
+        composite = reduce_composite(collection, bands or STACK_BANDS, method, cloud_property, client).addBands(
+            collection.select([CLASSIFICATION_BAND]).mode())
+    else:
+        composite = reduce_composite(collection, (bands or STACK_BANDS) + [CLASSIFICATION_BAND], method,
+                                     cloud_property, client)
+
+    composite_id = f"{collection_name}/{method}/{start_date}_{end_date}/{image_info['count']}"
+    composite_info = dict(image_info, id=composite_id, date=start_date, cloud=None)
+    logger.info(f"Composite of {image_info['count']} images")
+    return composite, composite_info
+
+
+def process_lst_image(image, geometry):
+    """
+    Surface temperature band (ST_B10) in degrees Celsius x10 as uint16 (0 = no data), see geoai.lst.
+    ST_B10 holds Collection 2 digital numbers: kelvin = DN x 0.00341802 + 149.0.
+    """
+    lst_kelvin = image.select("ST_B10").multiply(ST_B10_SCALE).add(ST_B10_OFFSET).clip(geometry)
+    lst_celsius = lst_kelvin.subtract(273.15)
+    return lst_celsius.multiply(10).uint16()
+
+
+def export_image_to_drive(image, date_used, geometry, aoi_name='sector14', scale=10, client=None):
+    """Export one stacked scene to Google Drive as <aoi>_<date>.tif"""
+    ee = get_client(client)
+    logger.info("Setting up export task...")
+
+    task = ee.batch.Export.image.toDrive(
+        image=image,
+        description=f'{aoi_name}_{date_used}_export',
+        folder='earth_engine',
+        fileNamePrefix=f'{aoi_name}_{date_used}',
+        scale=scale,
+        region=geometry,
+        fileFormat='GeoTIFF',
+        maxPixels=1e9
+    )
+
+    logger.info("Starting export task...")
+    with span("export_queue", aoi=aoi_name, date=date_used, scale=scale) as queued:
+        task.start()
+        queued.set(task_id=getattr(task, "id", None))
+    EE_REQUESTS.inc(call="export_start")
+    TASKS_SUBMITTED.inc(method="drive")
+
+    return task
+
+
+def monitor_export_task(task, poll_seconds=5):
+    """Monitor the export task progress"""
+    logger.info("Monitoring task status...")
+    with span("monitor_export", task_id=getattr(task, "id", None)) as monitored:
+        while task.active():
+            status = task.status()['state']
+            logger.info(f"Task status: {status}")
+            time.sleep(poll_seconds)
+            # task.active() and task.status() are one round trip each
+            EE_REQUESTS.inc(2, call="status")
+
+        final_status = task.status()
+        monitored.set(state=final_status['state'])
+    EE_REQUESTS.inc(2, call="status")
+    TASKS_FINISHED.inc(state=final_status['state'])
+    logger.info(f"Final task status: {final_status['state']}")
+
+    if final_status['state'] == 'COMPLETED':
+        logger.info("Export completed successfully!")
+    elif final_status['state'] == 'FAILED':
+        error_msg = final_status.get('error_message', 'No error message')
+        logger.error(f"Export failed! Error: {error_msg}")
+
+    return final_status
+
+
+def extract_stacked_scene(geometry, start_date, end_date, aoi_name='sector14', bands=None, cloud_max=30,
+                          client=None, catalog=None, download_dir=None, profile="visual"):
+    """
+    Search one window and start a single stacked export for the best scene (see EXPORT_PROFILES).
+    Returns (task, date_used), or (None, None) when no image matches.
+    With a catalog, an image already exported for this AOI is skipped and (None, date_used) is returned.
+    With download_dir, small AOIs are downloaded directly (see geoai.download) instead of exported.
+    """
+    with span("extract_scene", aoi=aoi_name, sensor="sentinel2", start_date=start_date, end_date=end_date):
+        from geoai.download import deliver_image
+
+        sentinel_image, image_info = search_sentinel_images(geometry, start_date, end_date, cloud_max,
+                                                            client=client, catalog=catalog)
+        if image_info is None:
+            return None, None
+
+        date_used, _ = get_image_metadata(image_info)
+        if catalog is not None and catalog.is_exported(image_info["id"], aoi_name):
+            logger.info(f"{image_info['id']} was already exported for {aoi_name}, skipping")
+            return None, date_used
+
+        bands = bands or STACK_BANDS
+        stacked = process_stack_image(sentinel_image, geometry, bands, profile)
+        task = deliver_image(stacked, date_used, geometry, aoi_name=aoi_name, download_dir=download_dir,
+                             band_count=len(bands) + 1,
+                             bytes_per_pixel=EXPORT_PROFILES[profile]["bytes_per_pixel"],
+                             profile=profile, client=client)
+        if catalog is not None:
+            catalog.record_export(image_info["id"], aoi_name, getattr(task, "id", None))
+        return task, date_used
+
+
+def extract_lst_scene(geometry, start_date, end_date, aoi_name='sector14', cloud_max=30, client=None,
+                      catalog=None, download_dir=None):
+    """
+    Search one window and start the LST export (30m) for the best Landsat scene.
+    Returns (task, date_used), or (None, None) when no image matches.
+    With a catalog, an image already exported for this AOI is skipped and (None, date_used) is returned.
+    With download_dir, small AOIs are downloaded directly (see geoai.download) instead of exported.
+    """
+    with span("extract_scene", aoi=aoi_name, sensor="landsat_lst", start_date=start_date, end_date=end_date):
+        from geoai.download import deliver_image
+
+        landsat_image, image_info = search_landsat_images(geometry, start_date, end_date, cloud_max,
+                                                          client=client, catalog=catalog)
+        if image_info is None:
+            return None, None
+
+        date_used = image_info["date"]
+        lst_name = f'{aoi_name}_lst'
+        if catalog is not None and catalog.is_exported(image_info["id"], lst_name):
+            logger.info(f"{image_info['id']} was already exported for {lst_name}, skipping")
+            return None, date_used
+
+        lst_image = process_lst_image(landsat_image, geometry)
+        task = deliver_image(lst_image, date_used, geometry, aoi_name=lst_name, scale=30,
+                             download_dir=download_dir, band_count=1, bytes_per_pixel=2, client=client)
+        if catalog is not None:
+            catalog.record_export(image_info["id"], lst_name, getattr(task, "id", None))
+        return task, date_used
+
+
+def extract_composite_scene(geometry, start_date, end_date, aoi_name='sector14', sensor="sentinel2",
+                            method="median", bands=None, cloud_max=30, client=None, catalog=None,
+                            download_dir=None, profile="visual"):
+    """
+    Build a cloud-masked composite of the window and start a single export for it.
+    The file is named after the window start: <aoi>_<method>_<start>.tif
+    (<aoi>_lst_<method>_<start>.tif for LST).
+    Returns (task, date_used) like extract_stacked_scene.
+    """
+    with span("extract_scene", aoi=aoi_name, sensor=sensor, start_date=start_date, end_date=end_date,
+              method=method):
+        from geoai.download import deliver_image
+
+        image, image_info = search_composite(sensor, geometry, start_date, end_date, cloud_max, method, bands,
+                                             client=client, catalog=catalog)
+        if image_info is None:
+            return None, None
+
+        date_used = image_info["date"]
+        name = f'{aoi_name}_lst_{method}' if sensor == "landsat_lst" else f'{aoi_name}_{method}'
+        if catalog is not None and catalog.is_exported(image_info["id"], name):
+            logger.info(f"{image_info['id']} was already exported for {name}, skipping")
+            return None, date_used
+
+        if sensor == "landsat_lst":
+            task = deliver_image(process_lst_image(image, geometry), date_used, geometry, aoi_name=name, scale=30,
+                                 download_dir=download_dir, band_count=1, bytes_per_pixel=2, client=client)
+        else:
+            bands = bands or STACK_BANDS
+            task = deliver_image(process_stack_image(image, geometry, bands, profile), date_used, geometry,
+                                 aoi_name=name, download_dir=download_dir, band_count=len(bands) + 1,
+                                 bytes_per_pixel=EXPORT_PROFILES[profile]["bytes_per_pixel"], profile=profile,
+                                 client=client)
+        if catalog is not None:
+            catalog.record_export(image_info["id"], name, getattr(task, "id", None))
+        return task, date_used
+
+
+def main():
+    """Interactive stacked extraction for Sector 14 (one export task per scene)"""
+    setup_logging()
+    try:
+        logger.info("Starting stacked satellite image extraction process...")
+        initialize_earth_engine()
+        sector14_geom = get_sector14_geometry()
+        start_date, end_date = get_user_dates()
+
+        task, date_used = extract_stacked_scene(sector14_geom, start_date, end_date)
+        if task is None:
+            print("No image found. Try relaxing filters or changing dates.")
+            return
+
+        final_status = monitor_export_task(task)
+        print(f"Export of sector14_{date_used}.tif finished with state {final_status['state']}")
+        logger.info("Process completed successfully!")
+
+    except Exception as e:
+        logger.error(f"An error occurred: {str(e)}")
+        print(f"An error occurred: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+AOI geometries from GeoJSON files.
+
+NOTE:
+1.sector14.geojson comes from overpass-turbo and holds a FeatureCollection
+  (two "Sector 14" polygons and an admin-centre point). The same query with every sector of Gurugram
+  gives one file with hundreds of polygons.
+2.get_sector14_geometry used to hard-code the 22-vertex ring in each extract script. Here any Polygon or
+  MultiPolygon feature can be loaded by position or by its "name" property, or all of them at once.
+3.simplify_coordinates removes vertices that lie within `tolerance_m` meters of the simplified outline
+  (Douglas-Peucker). Fewer vertices make server-side clip() and reduceRegion() noticeably cheaper.
+4.Parsed and simplified coordinates are cached by the file's content hash, and the ee.Geometry objects
+  built from them by the hash of the coordinates, so hundreds of jobs over the same AOIs parse and
+  convert each polygon once.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_DEGREE = 111320.0
+
+# file content hash -> parsed GeoJSON
+_geojson_cache = {}
+# (file content hash, feature, tolerance) -> coordinates
+_coordinate_cache = {}
+# (coordinates hash, client) -> ee.Geometry
+_ee_geometry_cache = {}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_geojson(path):
+    """(content hash, parsed GeoJSON); a file is only parsed again when its content changes"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = content_hash(raw)
+    if digest not in _geojson_cache:
+        _geojson_cache[digest] = json.loads(raw)
+    return digest, _geojson_cache[digest]
+
+
+def _polygon_features(geojson):
+    features = geojson["features"] if geojson.get("type") == "FeatureCollection" else [geojson]
+    return [f for f in features if (f.get("geometry") or {}).get("type") in ("Polygon", "MultiPolygon")]
+
+
+def slugify(name):
+    """'Sector 14' -> 'sector_14'"""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _feature_names(polygons):
+    """(name, key) per feature; key is file-name safe and repeated names get a suffix (sector_14_2)"""
+    names = []
+    seen = {}
+    for i, feature in enumerate(polygons):
+        name = (feature.get("properties") or {}).get("name") or f"feature {i}"
+        key = slugify(name)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}_{seen[key]}"
+        names.append((name, key))
+    return names
+
+
+def load_features(path):
+    """Every polygon feature of a GeoJSON file as {"name", "key", "geometry"}"""
+    _, geojson = _read_geojson(path)
+    polygons = _polygon_features(geojson)
+    return [
+        {"name": name, "key": key, "geometry": feature["geometry"]}
+        for feature, (name, key) in zip(polygons, _feature_names(polygons))
+    ]
+
+
+def _simplify_ring(ring, tolerance):
+    """Douglas-Peucker on one closed ring (numpy, iterative); keeps at least a triangle"""
+    points = np.asarray(ring, dtype="float64")
+    if len(points) <= 4 or tolerance <= 0:
+        return ring
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    # Split the closed ring at its farthest vertex from the start so both halves are open chains
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    keep[far] = True
+    stack = [(0, far), (far, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(*offsets.T)
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        worst = int(np.argmax(distances))
+        if distances[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    if keep.sum() < 4:
+        # Everything is within tolerance of the start-far chord: keep the vertex farthest from it as well,
+        # so the result is the most significant triangle (never more vertices than a smaller tolerance)
+        segment = points[far] - points[0]
+        offsets = points - points[0]
+        distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0])
+        distances[keep] = -1
+        keep[int(np.argmax(distances))] = True
+    return points[keep].tolist()
+
+
+def simplify_coordinates(geometry, tolerance_m):
+    """Simplify a GeoJSON Polygon/MultiPolygon geometry; tolerance in meters (converted to degrees)"""
+    tolerance = tolerance_m / METERS_PER_DEGREE
+    if geometry["type"] == "Polygon":
+        coordinates = [_simplify_ring(ring, tolerance) for ring in geometry["coordinates"]]
+    else:
+        coordinates = [
+            [_simplify_ring(ring, tolerance) for ring in polygon] for polygon in geometry["coordinates"]
+        ]
+    return {"type": geometry["type"], "coordinates": coordinates}
+
+
+def load_geometry(path, feature=0, tolerance_m=None):
+    """
+    One polygon feature as a GeoJSON geometry dict, optionally simplified.
+    feature can be the position among the polygon features, its "name" property or its key (sector_14).
+    """
+    digest, geojson = _read_geojson(path)
+    cache_key = (digest, feature, tolerance_m)
+    if cache_key in _coordinate_cache:
+        return _coordinate_cache[cache_key]
+
+    polygons = _polygon_features(geojson)
+    if isinstance(feature, str):
+        matches = [i for i, names in enumerate(_feature_names(polygons)) if feature in names]
+        if not matches:
+            raise ValueError(f"No polygon named {feature!r} in {path}")
+        index = matches[0]
+    else:
+        if feature >= len(polygons):
+            raise ValueError(f"{path} has {len(polygons)} polygon features, asked for #{feature}")
+        index = feature
+
+    geometry = polygons[index]["geometry"]
+    if tolerance_m:
+        simplified = simplify_coordinates(geometry, tolerance_m)
+        logger.info(f"Simplified {path} #{feature}: {vertex_count(geometry)} -> {vertex_count(simplified)} "
+                    f"vertices ({tolerance_m} m tolerance)")
+        geometry = simplified
+
+    _coordinate_cache[cache_key] = geometry
+    return geometry
+
+
+def load_polygon_coordinates(path, feature=0, tolerance_m=None):
+    """Coordinates of one Polygon feature (see load_geometry)"""
+    geometry = load_geometry(path, feature, tolerance_m)
+    if geometry["type"] != "Polygon":
+        raise ValueError(f"Feature {feature!r} in {path} is a {geometry['type']}, not a Polygon")
+    return geometry["coordinates"]
+
+
+def aoi_name_from_path(path):
+    """sector14.geojson -> sector14"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def to_ee_geometry(geometry, client=None):
+    """GeoJSON geometry dict -> ee.Geometry, cached by the coordinates' hash"""
+    from geoai.extract import get_client
+
+    ee = get_client(client)
+    key = (content_hash(json.dumps(geometry, sort_keys=True).encode("utf-8")), id(ee))
+    if key not in _ee_geometry_cache:
+        if geometry["type"] == "Polygon":
+            _ee_geometry_cache[key] = ee.Geometry.Polygon(geometry["coordinates"])
+        else:
+            _ee_geometry_cache[key] = ee.Geometry.MultiPolygon(geometry["coordinates"])
+    return _ee_geometry_cache[key]
+
+
+def load_ee_geometry(path, feature=0, tolerance_m=None, client=None):
+    """Load a GeoJSON polygon feature as an ee.Geometry (cached)"""
+    return to_ee_geometry(load_geometry(path, feature, tolerance_m), client=client)
+
+
+def geometry_points(geometry):
+    """Every vertex of a GeoJSON Polygon/MultiPolygon (or a Polygon coordinate list)"""
+    if isinstance(geometry, dict):
+        if geometry["type"] == "MultiPolygon":
+            return [point for polygon in geometry["coordinates"] for ring in polygon for point in ring]
+        geometry = geometry["coordinates"]
+    return [point for ring in geometry for point in ring]
+
+
+def vertex_count(geometry):
+    return len(geometry_points(geometry))
@@ -0,0 +1,204 @@
+"""
+Single-pass spectral index engine.
+
+NOTE:
+1.Every index we use is a normalized difference of two Sentinel-2 bands:
+    NDVI  = (NIR - Red)   / (NIR + Red)    -> (B8 - B4)  / (B8 + B4)
+    NDBI  = (SWIR - NIR)  / (SWIR + NIR)   -> (B11 - B8) / (B11 + B8)
+    NDMI  = (NIR - SWIR)  / (NIR + SWIR)   -> (B8 - B11) / (B8 + B11)
+    MNDWI = (Green - SWIR)/ (Green + SWIR) -> (B3 - B11) / (B3 + B11)
+
+2.The analysis scripts open the file once per index and cast whole bands to float32 every time.
+  Here a scene is opened once and every band is read (and cast) exactly once, so B8 and B11 are
+  shared between NDVI/NDBI/NDMI/MNDWI instead of being decoded again for each index.
+
+3.Files written with the "analysis" export profile store raw int16 values plus a scale/offset;
+  read_bands applies them so every index sees reflectance.
+
+4.Pixels flagged as cloud, shadow or no data by the scene's SCL band, or holding the file's nodata value,
+  are set to NaN (geoai.mask); pass mask=False to keep them. read_masked_bands checks nodata on the bands
+  it has just read, so masking only adds a read of the quality band, once per scene (geoai.mask caches it).
+
+5.normalized_difference is the one kernel behind every index. It works through the raster in cache-sized
+  chunks with a per-thread scratch buffer for a + b, and writes the result into a caller-supplied (or one
+  newly allocated) output array: one full-size allocation per index instead of denom, the zero mask,
+  a - b and the quotient.
+
+6.Earth Engine GeoTIFF exports keep the band names in the band descriptions
+  (e.g. polygon_swir_nir/*.tif has ('B11', 'B8')), so bands are looked up by name, not by position.
+"""
+import sys
+import threading
+
+import numpy as np
+import rasterio
+
+from geoai.mask import nodata_mask, read_mask
+
+# index name -> (band a, band b), index = (a - b) / (a + b)
+INDEX_BANDS = {
+    "ndvi": ("B8", "B4"),
+    "ndbi": ("B11", "B8"),
+    "ndmi": ("B8", "B11"),
+    "mndwi": ("B3", "B11"),
+}
+
+# Bump when the index math changes, so cached results (geoai.cache) are recomputed
+INDEX_DEFINITION_VERSION = 2
+
+# Pixels per kernel chunk (256 KB of float32: a + b of one chunk stays in cache while it is used)
+KERNEL_CHUNK_PIXELS = 1 << 16
+
+_scratch = threading.local()
+
+
+def scratch_buffer(size):
+    """float32 scratch array of at least `size` pixels, reused by every call in this thread"""
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None or buffer.size < size:
+        buffer = _scratch.buffer = np.empty(size, dtype="float32")
+    return buffer[:size]
+
+
+def normalized_difference(a, b, out=None, valid_range=None):
+    """
+    (a - b) / (a + b) with the same zero-denominator guard the analysis scripts use (a + b == 0 -> 0.0001).
+    out: C-contiguous float32 array to write into (allocated when None).
+    valid_range: (low, high); results outside it are set to NaN in place.
+    """
+    a = np.asarray(a, dtype="float32")
+    b = np.asarray(b, dtype="float32")
+    if out is None:
+        out = np.empty(a.shape, dtype="float32")
+    elif out.dtype != np.float32 or not out.flags.c_contiguous or out.shape != a.shape:
+        raise ValueError(f"out must be a C-contiguous float32 array of shape {a.shape}")
+
+    flat_a, flat_b, flat_out = a.reshape(-1), b.reshape(-1), out.reshape(-1)
+    scratch = scratch_buffer(min(KERNEL_CHUNK_PIXELS, flat_out.size))
+    for start in range(0, flat_out.size, KERNEL_CHUNK_PIXELS):
+        stop = min(start + KERNEL_CHUNK_PIXELS, flat_out.size)
+        chunk_a, chunk_b, result = flat_a[start:stop], flat_b[start:stop], flat_out[start:stop]
+        denom = scratch[:stop - start]
+
+        np.add(chunk_a, chunk_b, out=denom)
+        denom[denom == 0] = 0.0001  # avoid division by zero
+        np.subtract(chunk_a, chunk_b, out=result)
+        np.divide(result, denom, out=result)
+        if valid_range is not None:
+            result[(result < valid_range[0]) | (result > valid_range[1])] = np.nan
+    return out
+
+
+def required_bands(indices):
+    """Union of the bands needed by the given indices, in first-use order"""
+    bands = []
+    for name in indices:
+        if name not in INDEX_BANDS:
+            raise ValueError(f"Unknown index: {name}. Known indices: {list(INDEX_BANDS)}")
+        for band in INDEX_BANDS[name]:
+            if band not in bands:
+                bands.append(band)
+    return bands
+
+
+def available_indices(descriptions):
+    """Indices that can be computed from a file with these band descriptions"""
+    names = {d for d in descriptions if d}
+    return [name for name, bands in INDEX_BANDS.items() if set(bands) <= names]
+
+
+def band_indexes(src, bands):
+    """Map band names (e.g. 'B8') to 1-based rasterio band indexes"""
+    lookup = {name: i + 1 for i, name in enumerate(src.descriptions) if name}
+    missing = [band for band in bands if band not in lookup]
+    if missing:
+        raise ValueError(f"Bands {missing} not found in {src.name} (bands: {src.descriptions})")
+    return [lookup[band] for band in bands]
+
+
+def apply_scales(src, indexes, data):
+    """Convert bands written with a scale/offset (the "analysis" export profile) to reflectance in place"""
+    for values, index in zip(data, indexes):
+        scale, offset = src.scales[index - 1], src.offsets[index - 1]
+        if scale != 1.0:
+            values *= scale
+        if offset != 0.0:
+            values += offset
+    return data
+
+
+def read_bands(src, bands, window=None):
+    """Read the named bands in one call, decoded straight to float32 reflectance"""
+    indexes = band_indexes(src, bands)
+    data = src.read(indexes, window=window, out_dtype="float32")
+    return dict(zip(bands, apply_scales(src, indexes, data)))
+
+
+def read_masked_bands(src, bands, window=None):
+    """
+    read_bands plus the clear mask of the same window (or None when there is nothing to mask with).
+    The nodata check runs on the arrays just read (before scale/offset); only the quality band is added.
+    """
+    indexes = band_indexes(src, bands)
+    data = src.read(indexes, window=window, out_dtype="float32")
+    clear = read_mask(src, window, nodata_mask(data, src.nodata))
+    return dict(zip(bands, apply_scales(src, indexes, data))), clear
+
+
+def resolve_indices(src, indices=None):
+    """Default to every index the scene has bands for"""
+    if indices is None:
+        indices = available_indices(src.descriptions)
+        if not indices:
+            raise ValueError(f"No known index can be computed from {src.name} (bands: {src.descriptions})")
+    return list(indices)
+
+
+def compute_indices(path, indices=None, mask=True):
+    """
+    Compute several indices from one scene.
+
+    Returns a dict such as {"ndvi": array, "ndbi": array, ...}.
+    If indices is None, every index whose bands are present is computed.
+    With mask=True, cloudy / shadowed / no-data pixels are NaN (one mask decode shared by every index).
+    """
+    with rasterio.open(path) as src:
+        indices = resolve_indices(src, indices)
+        if mask:
+            bands, clear = read_masked_bands(src, required_bands(indices))
+        else:
+            bands, clear = read_bands(src, required_bands(indices)), None
+
+    results = {
+        name: normalized_difference(bands[INDEX_BANDS[name][0]], bands[INDEX_BANDS[name][1]])
+        for name in indices
+    }
+
+    if clear is not None:
+        masked = ~clear
+        for values in results.values():
+            values[masked] = np.nan
+    return results
+
+
+def compute_ndvi(path):
+    return compute_indices(path, ["ndvi"])["ndvi"]
+
+
+def compute_ndbi(path):
+    return compute_indices(path, ["ndbi"])["ndbi"]
+
+
+def compute_ndmi(path):
+    return compute_indices(path, ["ndmi"])["ndmi"]
+
+
+def compute_mndwi(path):
+    return compute_indices(path, ["mndwi"])["mndwi"]
+
+
+if __name__ == "__main__":
+    for tif_path in sys.argv[1:]:
+        results = compute_indices(tif_path)
+        for name, values in results.items():
+            print(f"{tif_path} - Average {name.upper()}: {round(float(np.nanmean(values)), 4)}")
@@ -0,0 +1,149 @@
+"""
+Land surface temperature loader: one read, one output buffer, diagnostics without a sort.
+
+NOTE:
+1.load_and_debug_lst_image in LST/charts.py walks the full array about ten times (min, max, np.unique which
+  sorts everything, two counts, a copy, two np.where copies, a boolean-index copy) and sometimes again
+  through its fallback path.
+2.Our LST exports store degrees Celsius x10 as uint16 with 0 / 65535 as no data. Every possible stored value
+  is one of 65536 codes, so decoding is a lookup table: one np.take per block gives degrees Celsius
+  (NaN for no data), which is then copied into the output array.
+3.The diagnostics are accumulated from each decoded block while it is still in cache: a NaN count, a
+  NaN-skipping min / max (np.fmin / np.fmax reductions) and a masked float64 sum. No sort, no full-size
+  temporaries and no 65536-bin histogram per block (np.bincount cost more than the read on tiled files).
+4.The raster is read block by block into reused raw / decoded block buffers (geoai.stats.iter_windows), so
+  loading a scene costs one read and the float32 output.
+5.process_lst_image in LST/extract.py skipped the Collection 2 scale factor of ST_B10
+  (kelvin = DN x 0.00341802 + 149.0), which is why lst_2022-01-30.tif / lst_2025-01-29.tif only hold
+  0 and 65535. geoai.extract applies it; scenes exported before the fix decode to all no data.
+
+Example (from the Day0 folder):
+    python -m geoai.lst LST/lst_2022-01-30.tif LST/lst_2025-01-29.tif
+"""
+import argparse
+import logging
+
+import numpy as np
+import rasterio
+
+from geoai.stats import iter_windows
+
+logger = logging.getLogger(__name__)
+
+LST_BAND = "ST_B10"
+# Stored value -> degrees Celsius (geoai.extract.process_lst_image)
+LST_SCALE = 0.1
+LST_OFFSET = 0.0
+LST_NODATA = (0, 65535)
+
+
+def lst_lookup_table(scale=LST_SCALE, offset=LST_OFFSET, nodata=LST_NODATA, size=65536):
+    """Stored code -> degrees Celsius for every possible uint16 value, NaN for no data"""
+    table = np.arange(size, dtype="float32") * np.float32(scale) + np.float32(offset)
+    table[list(nodata)] = np.nan
+    return table
+
+
+LST_TABLE = lst_lookup_table()
+
+
+def table_for(scale=1.0, offset=0.0):
+    """Lookup table for a band's scale / offset tags (our default encoding when the band has none)"""
+    if (scale, offset) == (1.0, 0.0):
+        return LST_TABLE
+    return lst_lookup_table(scale, offset)
+
+
+def decode_lst(raw, out=None, table=LST_TABLE):
+    """Stored LST codes -> degrees Celsius with NaN for no data, in one lookup pass"""
+    # mode="clip" writes straight into `out` (mode="raise" buffers); every uint16 code is in the table anyway
+    return np.take(table, raw, out=out, mode="clip")
+
+
+class LstDiagnostics:
+    """Pixel counts, range and mean of decoded temperatures, accumulated block by block"""
+
+    def __init__(self):
+        self.total = 0
+        self.valid = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, celsius):
+        """Add one decoded block (NaN = no data)"""
+        valid = ~np.isnan(celsius)
+        count = int(np.count_nonzero(valid))
+        self.total += celsius.size
+        if not count:
+            return
+        self.valid += count
+        self.sum += float(np.sum(celsius, where=valid, dtype="float64"))
+        self.min = min(self.min, float(np.fmin.reduce(celsius, axis=None)))
+        self.max = max(self.max, float(np.fmax.reduce(celsius, axis=None)))
+
+    def as_dict(self):
+        result = {
+            "total": self.total,
+            "valid": self.valid,
+            "nodata": self.total - self.valid,
+            "min": float("nan"),
+            "max": float("nan"),
+            "mean": float("nan"),
+        }
+        if self.valid:
+            result.update(min=self.min, max=self.max, mean=self.sum / self.valid)
+        return result
+
+
+def load_lst(path):
+    """
+    Decode a LST scene to degrees Celsius.
+    Returns (float32 array with NaN for no data,
+             diagnostics {"total", "valid", "nodata", "min", "max", "mean"}).
+    """
+    with rasterio.open(path) as src:
+        index = src.descriptions.index(LST_BAND) + 1 if LST_BAND in src.descriptions else 1
+        if src.dtypes[index - 1] not in ("uint8", "uint16"):
+            raise ValueError(f"{path}: expected uint16 LST codes, got {src.dtypes[index - 1]}")
+
+        table = table_for(src.scales[index - 1], src.offsets[index - 1])
+
+        out = np.empty((src.height, src.width), dtype="float32")
+        diagnostics = LstDiagnostics()
+        buffer = decoded = None
+        for window in iter_windows(src):
+            shape = (window.height, window.width)
+            pixels = window.height * window.width
+            if buffer is None or buffer.size < pixels:
+                buffer = np.empty(pixels, dtype=src.dtypes[index - 1])
+                decoded = np.empty(pixels, dtype="float32")
+            raw = buffer[:pixels].reshape(shape)
+            src.read(index, window=window, out=raw)
+            # Decode into a contiguous block (faster lookups and reductions than a strided slice of out),
+            # take the diagnostics while it is in cache, then copy it into place
+            celsius = decode_lst(raw, out=decoded[:pixels].reshape(shape), table=table)
+            diagnostics.update(celsius)
+            rows, cols = window.toslices()
+            out[rows, cols] = celsius
+
+    diagnostics = diagnostics.as_dict()
+    if not diagnostics["valid"]:
+        logger.warning(f"{path}: no valid temperature pixels ({diagnostics['nodata']} no-data pixels)")
+    return out, diagnostics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode LST scenes and print their diagnostics")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    for path in args.paths:
+        _, d = load_lst(path)
+        print(f"{path}: {d['min']:.1f}°C to {d['max']:.1f}°C, mean {d['mean']:.1f}°C, "
+              f"valid={d['valid']} nodata={d['nodata']}")
+
+
+if __name__ == "__main__":
+    main()
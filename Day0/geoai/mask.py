@@ -0,0 +1,115 @@
+"""
+Local cloud / shadow / no-data masking from the SCL band.
+
+NOTE:
+1.The compute_* functions average every pixel of the scene, so a cloud over part of the sector
+  silently pulls NDVI down and NDBI up.
+2.Stacked Sentinel-2 exports carry the SCL band (geoai.extract). It is decoded here into a boolean
+  "clear" mask (True = use the pixel) through a 256-entry lookup table, one np.take for the whole band;
+  the classes in geoai.constants.SCL_MASK_CLASSES are masked, the same ones the server-side composites
+  mask, so local and server results agree.
+3.Pixels equal to the file's nodata value in any band read are masked as well. nodata_mask works on the
+  band arrays the caller has already read (geoai.indices.read_masked_bands), so building the mask
+  only adds a read of the quality band, never a second read of the data bands.
+4.quality_mask keeps the decoded SCL mask of whole scenes per (path, size, modification time, max_size),
+  so the layers of one scene share one decode: compute_indices, and geoai.charts, which renders one
+  chart per index and would otherwise decode the same SCL band for each of them. Windowed readers
+  (geoai.stats) decode per window instead, to keep their memory bound.
+5.Scenes without a SCL band (e.g. the 2-band polygon exports) get no quality mask. Landsat LST exports
+  carry ST_B10 only; their clouds are masked server-side (geoai.extract.mask_landsat_clouds).
+"""
+import functools
+import os
+
+import numpy as np
+import rasterio
+
+from geoai.cog import read_at_resolution
+from geoai.constants import CLASSIFICATION_BAND, SCL_MASK_CLASSES
+
+MASK_CACHE_SIZE = 16
+
+SCL_CLEAR = np.ones(256, dtype=bool)
+SCL_CLEAR[SCL_MASK_CLASSES] = False
+
+
+def decode_scl(scl):
+    """
+    SCL class codes -> clear mask; codes outside 0-255 clip to 0 / 255 (no data / unknown).
+    Float bands (float32 scenes, or SCL read with out_dtype) are cast to indexes first, NaN as class 0.
+    """
+    scl = np.asarray(scl)
+    if scl.dtype.kind not in "iu":
+        scl = np.nan_to_num(scl).astype(np.intp)
+    return np.take(SCL_CLEAR, scl, mode="clip")
+
+
+def mask_band(descriptions):
+    """(band index, decoder) of the quality band of a scene, or None"""
+    if CLASSIFICATION_BAND in descriptions:
+        return descriptions.index(CLASSIFICATION_BAND) + 1, decode_scl
+    return None
+
+
+@functools.lru_cache(maxsize=MASK_CACHE_SIZE)
+def _cached_quality_mask(path, size, mtime_ns, max_size):
+    with rasterio.open(path) as src:
+        quality = mask_band(src.descriptions)
+        if quality is None:
+            return None
+        index, decoder = quality
+        if max_size is None:
+            data = src.read(index)
+    if max_size is not None:
+        data = read_at_resolution(path, max_size=max_size, indexes=[index])[0][0]
+    clear = decoder(data)
+    # Shared by every caller
+    clear.flags.writeable = False
+    return clear
+
+
+def quality_mask(path, max_size=None):
+    """
+    Decoded quality-band mask of a whole scene (read like geoai.cog.read_at_resolution when max_size is set),
+    or None when the scene has no quality band. Cached per scene; the array is read-only.
+    """
+    stat = os.stat(path)
+    return _cached_quality_mask(os.path.abspath(path), stat.st_size, stat.st_mtime_ns, max_size)
+
+
+def nodata_mask(data, nodata):
+    """
+    True where no band of `data` (bands, rows, cols), as read from the file before any scale/offset,
+    holds the nodata value; None when the file has no nodata value.
+    """
+    if nodata is None:
+        return None
+    return (data != np.asarray(nodata, dtype=data.dtype)).all(axis=0)
+
+
+def read_mask(src, window=None, valid=None):
+    """
+    Clear mask of an open scene (or one window of it), or None when the scene has nothing to mask with.
+    Only the quality band is read (whole scenes through quality_mask's cache); valid is the nodata_mask
+    of the bands already read for the window.
+    """
+    if window is None:
+        decoded = quality_mask(src.name)
+    else:
+        quality = mask_band(src.descriptions)
+        decoded = None if quality is None else quality[1](src.read(quality[0], window=window))
+    if decoded is None:
+        return valid
+    return decoded if valid is None else valid & decoded
+
+
+def scene_mask(path):
+    """Clear mask of a whole scene (quality band and nodata of every band)"""
+    with rasterio.open(path) as src:
+        return read_mask(src, valid=nodata_mask(src.read(), src.nodata))
+
+
+def clear_fraction(path):
+    """Share of clear pixels in a scene (1.0 when it has no quality band)"""
+    clear = scene_mask(path)
+    return 1.0 if clear is None else float(clear.mean())
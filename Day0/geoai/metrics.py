@@ -0,0 +1,259 @@
+"""
+Live counters and gauges for long-running batches, in the Prometheus text format.
+
+NOTE:
+1.earth_engine_export.log tells what happened, but not how fast: an unattended batch that slowed down
+  (Earth Engine queue backing up, searches no longer served by the catalog, a stalled analysis pool)
+  only shows up when someone greps the log.
+2.Every stage updates the metrics below in this process's registry (plain dicts behind locks, no
+  dependencies):
+    geoai_tasks_submitted_total{method}          exports started (drive) or fetched directly (download)
+    geoai_tasks{state}                           watched export tasks per state (READY, RUNNING, ...)
+    geoai_tasks_finished_total{state}            COMPLETED / FAILED / CANCELLED
+    geoai_task_queue_wait_seconds                time from submission until a task left the queue
+    geoai_searches_total{source}                 searches answered by the catalog or by Earth Engine
+    geoai_ee_requests_total{call}                round trips to Earth Engine (getInfo, export_start, status)
+    geoai_download_bytes_total                   bytes fetched by direct downloads
+    geoai_scenes_analyzed_total{source}          time-series scenes computed or served from the cache
+    geoai_scenes_analyzed_per_second             throughput of the current / last analysis run
+    geoai_cache_lookups_total{cache,result}      ResultCache ("result") and SceneCatalog ("catalog") lookups
+    geoai_cache_hit_ratio{cache}                 hits / lookups so far
+3.The registry is exposed either over HTTP (serve(port), GET /metrics, scraped by Prometheus) or as a
+  textfile for node_exporter's textfile collector (write_textfile(path), written atomically;
+  start_textfile_writer rewrites it every few seconds).
+4.Metrics live per process: time-series workers return rows to the parent, which does the counting.
+
+Example (from the Day0 folder):
+    python -m geoai.batch jobs/sector14_monthly.json --metrics-port 9464
+    python -m geoai.batch jobs/sector14_monthly.json --metrics-file /var/lib/node_exporter/geoai.prom
+"""
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9464
+
+METRIC_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*$")
+LABEL_NAME = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+class Metric:
+    """A counter, gauge or summary with optional labels; create through a Registry"""
+
+    def __init__(self, name, kind, help_text, labels, lock):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = lock
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {list(self.labels)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def inc(self, amount=1, **labels):
+        if self.kind == "counter" and amount < 0:
+            raise ValueError(f"Counter {self.name} can only go up")
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        if self.kind != "gauge":
+            raise ValueError(f"Only gauges can go down, {self.name} is a {self.kind}")
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        if self.kind != "gauge":
+            raise ValueError(f"Only gauges can be set, {self.name} is a {self.kind}")
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def observe(self, value, **labels):
+        """Add one observation to a summary (exposed as _sum and _count)"""
+        if self.kind != "summary":
+            raise ValueError(f"Only summaries take observations, {self.name} is a {self.kind}")
+        key = self._key(labels)
+        with self._lock:
+            total, count = self.values.get(key, (0.0, 0))
+            self.values[key] = (total + value, count + 1)
+
+    def get(self, **labels):
+        """Current value (a (sum, count) pair for summaries)"""
+        with self._lock:
+            return self.values.get(self._key(labels), (0.0, 0) if self.kind == "summary" else 0)
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {_escape(self.help_text)}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = dict(self.values)
+        if not values and not self.labels:
+            values[()] = (0.0, 0) if self.kind == "summary" else 0
+
+        for key, value in sorted(values.items()):
+            label_text = ",".join(f'{name}="{_escape(v)}"' for name, v in zip(self.labels, key))
+            label_text = f"{{{label_text}}}" if label_text else ""
+            if self.kind == "summary":
+                lines.append(f"{self.name}_sum{label_text} {_format_value(value[0])}")
+                lines.append(f"{self.name}_count{label_text} {_format_value(value[1])}")
+            else:
+                lines.append(f"{self.name}{label_text} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Registry:
+    """Named metrics of this process"""
+
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, name, kind, help_text, labels):
+        if not METRIC_NAME.match(name):
+            raise ValueError(f"Invalid metric name: {name!r}")
+        # Label names starting with __ are reserved for Prometheus, "quantile" for summaries
+        reserved = ("quantile",) if kind == "summary" else ()
+        for label in labels:
+            if not LABEL_NAME.match(label) or label.startswith("__") or label in reserved:
+                raise ValueError(f"Invalid label name for {name}: {label!r}")
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"Duplicate label names for {name}: {list(labels)}")
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric(name, kind, help_text, labels, threading.Lock())
+        if metric.kind != kind or metric.labels != tuple(labels):
+            raise ValueError(f"{name} is already registered as a {metric.kind} with labels {list(metric.labels)}")
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._metric(name, "counter", help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._metric(name, "gauge", help_text, labels)
+
+    def summary(self, name, help_text, labels=()):
+        return self._metric(name, "summary", help_text, labels)
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def write_textfile(self, path):
+        """Write the metrics for node_exporter's textfile collector (temp file + rename, never half-written)"""
+        text = self.render()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def start_textfile_writer(self, path, interval=15):
+        """Rewrite the textfile every `interval` seconds in a daemon thread; set() the returned event to stop"""
+        stop = threading.Event()
+
+        def run():
+            while True:
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    logger.warning(f"Could not write metrics to {path}: {str(e)}")
+                if stop.wait(interval):
+                    return
+
+        threading.Thread(target=run, name="geoai-metrics-textfile", daemon=True).start()
+        return stop
+
+    def serve(self, port=DEFAULT_PORT, host="127.0.0.1"):
+        """Serve GET /metrics from a daemon thread; returns the server (shutdown() stops it)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="geoai-metrics-http", daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+REGISTRY = Registry()
+
+TASKS_SUBMITTED = REGISTRY.counter(
+    "geoai_tasks_submitted_total", "Exports started (drive) or fetched directly (download)", ["method"])
+TASKS = REGISTRY.gauge("geoai_tasks", "Watched export tasks per state", ["state"])
+TASKS_FINISHED = REGISTRY.counter(
+    "geoai_tasks_finished_total", "Export tasks that reached a terminal state", ["state"])
+QUEUE_WAIT = REGISTRY.summary(
+    "geoai_task_queue_wait_seconds", "Time from submission until a task left the queue")
+SEARCHES = REGISTRY.counter("geoai_searches_total", "Image searches by where they were answered", ["source"])
+EE_REQUESTS = REGISTRY.counter("geoai_ee_requests_total", "Round trips to Earth Engine", ["call"])
+DOWNLOAD_BYTES = REGISTRY.counter("geoai_download_bytes_total", "Bytes fetched by direct downloads")
+SCENES_ANALYZED = REGISTRY.counter(
+    "geoai_scenes_analyzed_total", "Time-series scenes computed or served from the cache", ["source"])
+SCENES_PER_SECOND = REGISTRY.gauge(
+    "geoai_scenes_analyzed_per_second", "Scenes computed per second in the current or last analysis run")
+CACHE_LOOKUPS = REGISTRY.counter("geoai_cache_lookups_total", "Cache lookups by result", ["cache", "result"])
+CACHE_HIT_RATIO = REGISTRY.gauge("geoai_cache_hit_ratio", "Cache hits / lookups so far", ["cache"])
+
+
+def record_cache_lookup(cache, hit):
+    """Count one lookup of a cache ("result" or "catalog") and update its hit ratio"""
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+    hits = CACHE_LOOKUPS.get(cache=cache, result="hit")
+    misses = CACHE_LOOKUPS.get(cache=cache, result="miss")
+    CACHE_HIT_RATIO.set(hits / (hits + misses), cache=cache)
+
+
+def serve(port=DEFAULT_PORT, host="127.0.0.1"):
+    return REGISTRY.serve(port, host)
+
+
+def write_textfile(path):
+    REGISTRY.write_textfile(path)
+
+
+def start_textfile_writer(path, interval=15):
+    return REGISTRY.start_textfile_writer(path, interval)
@@ -0,0 +1,190 @@
+"""
+Asyncio monitor for many Earth Engine export tasks.
+
+NOTE:
+1.monitor_export_task blocks one process on one task with a fixed time.sleep(5) poll.
+  A batch of N exports then needs N serial polling loops.
+2.Here every task gets a small coroutine on one event loop:
+    - task.status() is a blocking HTTP call, so it runs in a worker thread
+    - a semaphore caps how many status calls are in flight at once
+    - the poll interval starts short, grows by `backoff` while the state does not change,
+      and resets when it does; jitter spreads the polls so hundreds of tasks do not poll in lockstep
+3.A task that cannot be checked `max_errors` times in a row (revoked credentials, deleted task) ends as
+  UNREACHABLE, one that is not done after `timeout` seconds as TIMED_OUT. Both count as failures, so a
+  batch never hangs on one task.
+4.on_complete / on_failure are called with (task, status) when a task finishes, and on_progress
+  with a summary dict every time any task changes state. Callbacks may be plain functions or coroutines.
+5.Task states, finished tasks, status round trips and how long each task waited in the Earth Engine queue
+  are published through geoai.metrics.
+
+Example:
+    statuses = monitor_tasks(tasks, on_failure=lambda task, status: print(status['error_message']))
+"""
+import asyncio
+import inspect
+import logging
+import random
+import time
+from collections import Counter
+
+from geoai.metrics import EE_REQUESTS, QUEUE_WAIT, TASKS, TASKS_FINISHED
+from geoai.tracing import span
+
+logger = logging.getLogger(__name__)
+
+SUCCESS_STATES = {"COMPLETED"}
+# UNREACHABLE and TIMED_OUT are set by the monitor itself, not by Earth Engine
+FAILURE_STATES = {"FAILED", "CANCELLED", "UNREACHABLE", "TIMED_OUT"}
+TERMINAL_STATES = SUCCESS_STATES | FAILURE_STATES
+QUEUED_STATES = {"UNSUBMITTED", "READY"}
+DEFAULT_MAX_ERRORS = 10
+DEFAULT_TIMEOUT_SECONDS = 12 * 3600
+
+
+def task_id(task):
+    return getattr(task, "id", None) or str(id(task))
+
+
+def queue_wait_seconds(status):
+    """Seconds a task waited in the Earth Engine queue, from its status timestamps (None when not reported)"""
+    created = status.get("creation_timestamp_ms")
+    started = status.get("start_timestamp_ms")
+    if created is None or started is None:
+        return None
+    return max(0.0, (started - created) / 1000)
+
+
+async def _call(callback, *args):
+    if callback is None:
+        return
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+class BatchProgress:
+    """Tracks the latest state of every task in the batch"""
+
+    def __init__(self, tasks):
+        self.states = {task_id(task): "UNKNOWN" for task in tasks}
+
+    def update(self, task, state):
+        key = task_id(task)
+        previous = self.states.get(key)
+        changed = previous != state
+        self.states[key] = state
+        if changed:
+            if previous not in (None, "UNKNOWN"):
+                TASKS.dec(state=previous)
+            TASKS.inc(state=state)
+        return changed
+
+    def summary(self):
+        counts = Counter(self.states.values())
+        done = sum(counts[state] for state in TERMINAL_STATES)
+        return {
+            "total": len(self.states),
+            "done": done,
+            "completed": sum(counts[state] for state in SUCCESS_STATES),
+            "failed": sum(counts[state] for state in FAILURE_STATES),
+            "states": dict(counts),
+        }
+
+
+async def watch_task(task, semaphore, progress, min_interval=5, max_interval=120, backoff=1.5,
+                     jitter=0.2, on_complete=None, on_failure=None, on_progress=None,
+                     max_errors=DEFAULT_MAX_ERRORS, timeout=DEFAULT_TIMEOUT_SECONDS):
+    """
+    Poll one task until it reaches a terminal state and return its final status.
+    Gives up with state UNREACHABLE after max_errors failed status checks in a row, and with TIMED_OUT
+    once the task is not done after timeout seconds (None waits forever).
+    """
+    with span("monitor_task", task_id=task_id(task)) as watched:
+        interval = min_interval
+        polls = 0
+        errors = 0
+        watched_since = time.monotonic()
+        deadline = None if timeout is None else watched_since + timeout
+        seen_queued = False
+        left_queue = False
+        while True:
+            try:
+                async with semaphore:
+                    status = await asyncio.to_thread(task.status)
+                polls += 1
+                errors = 0
+                EE_REQUESTS.inc(call="status")
+            except Exception as e:
+                # A transient API error should not kill the whole batch; back off and retry
+                errors += 1
+                logger.warning(f"Status check {errors}/{max_errors} failed for task {task_id(task)}: {str(e)}")
+                status = None
+                if errors >= max_errors:
+                    status = {"state": "UNREACHABLE", "id": task_id(task),
+                              "error_message": f"{errors} status checks failed in a row, last: {str(e)}"}
+
+            if deadline is not None and time.monotonic() >= deadline and (
+                    status is None or status.get("state") not in TERMINAL_STATES):
+                status = {"state": "TIMED_OUT", "id": task_id(task),
+                          "error_message": f"Not finished after {timeout} seconds"}
+
+            if status is not None:
+                state = status.get("state", "UNKNOWN")
+                if state in QUEUED_STATES:
+                    seen_queued = True
+                elif state != "UNKNOWN" and not left_queue:
+                    left_queue = True
+                    wait = queue_wait_seconds(status)
+                    if wait is None and seen_queued:
+                        wait = time.monotonic() - watched_since
+                    if wait is not None:
+                        QUEUE_WAIT.observe(wait)
+
+                if progress.update(task, state):
+                    interval = min_interval
+                    summary = progress.summary()
+                    logger.info(f"Task {task_id(task)}: {state} "
+                                f"({summary['done']}/{summary['total']} done, {summary['failed']} failed)")
+                    await _call(on_progress, summary)
+                else:
+                    interval = min(interval * backoff, max_interval)
+
+                if state in TERMINAL_STATES:
+                    watched.set(state=state, polls=polls)
+                    TASKS_FINISHED.inc(state=state)
+                if state in SUCCESS_STATES:
+                    await _call(on_complete, task, status)
+                    return status
+                if state in FAILURE_STATES:
+                    error_msg = status.get('error_message', 'No error message')
+                    logger.error(f"Task {task_id(task)} {state}: {error_msg}")
+                    await _call(on_failure, task, status)
+                    return status
+            else:
+                interval = min(interval * backoff, max_interval)
+
+            delay = interval * random.uniform(1 - jitter, 1 + jitter)
+            if deadline is not None:
+                delay = max(0.0, min(delay, deadline - time.monotonic()))
+            await asyncio.sleep(delay)
+
+
+async def watch_tasks(tasks, max_concurrent_polls=16, **options):
+    """Watch every task on the current event loop; returns final statuses in task order"""
+    tasks = list(tasks)
+    semaphore = asyncio.Semaphore(max_concurrent_polls)
+    # geoai_tasks shows the batch being watched
+    TASKS.clear()
+    progress = BatchProgress(tasks)
+    logger.info(f"Monitoring {len(tasks)} export tasks...")
+
+    statuses = await asyncio.gather(*(watch_task(task, semaphore, progress, **options) for task in tasks))
+
+    summary = progress.summary()
+    logger.info(f"All tasks finished: {summary['completed']} completed, {summary['failed']} failed")
+    return statuses
+
+
+def monitor_tasks(tasks, **options):
+    """Blocking entry point: run watch_tasks on a fresh event loop"""
+    return asyncio.run(watch_tasks(tasks, **options))
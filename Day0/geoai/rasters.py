@@ -0,0 +1,95 @@
+"""
+Local GeoTIFF finishing for exported scenes.
+
+NOTE:
+1.Earth Engine cannot write scale/offset metadata or choose the compression of an exported GeoTIFF.
+2.finalize_geotiff rewrites a downloaded scene so that:
+    - reflectance bands carry the scale/offset of their export profile
+      (reflectance = value * scale + offset), which rasterio exposes as src.scales / src.offsets
+      and geoai.indices applies when reading
+    - the file is tiled (256x256) and DEFLATE-compressed with a predictor, which keeps int16
+      reflectance small and quick to decode
+    - band names (B2, B3 ... SCL) stay in the band descriptions
+3.The rewrite is done window by window, so it does not need the whole scene in memory.
+
+Example (from the Day0 folder):
+    python -m geoai.rasters --profile analysis downloads/sector14_2025-01-28.tif
+"""
+import argparse
+import logging
+import os
+
+import numpy as np
+import rasterio
+
+from geoai.constants import CLASSIFICATION_BAND
+from geoai.extract import EXPORT_PROFILES
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 256
+
+
+def creation_options(dtype):
+    """Tiled DEFLATE options; horizontal differencing for integers, floating-point predictor for floats"""
+    predictor = 3 if np.issubdtype(np.dtype(dtype), np.floating) else 2
+    return {
+        "driver": "GTiff",
+        "tiled": True,
+        "blockxsize": BLOCK_SIZE,
+        "blockysize": BLOCK_SIZE,
+        "compress": "deflate",
+        "predictor": predictor,
+        "zlevel": 6,
+    }
+
+
+def finalize_geotiff(path, profile_name, out_path=None):
+    """
+    Rewrite a scene tiled + DEFLATE with scale/offset tags for its export profile.
+    Writes to out_path (default: replace the file in place) and returns the written path.
+    """
+    if profile_name not in EXPORT_PROFILES:
+        raise ValueError(f"Unknown export profile: {profile_name}. Known profiles: {list(EXPORT_PROFILES)}")
+    export_profile = EXPORT_PROFILES[profile_name]
+    out_path = out_path or path
+    tmp_path = out_path + ".tmp.tif"
+
+    with rasterio.open(path) as src:
+        profile = src.profile.copy()
+        profile.update(creation_options(src.dtypes[0]))
+
+        scales = [1.0] * src.count
+        offsets = [0.0] * src.count
+        if export_profile["scale"] is not None:
+            for i, name in enumerate(src.descriptions):
+                if name != CLASSIFICATION_BAND:
+                    scales[i] = export_profile["scale"]
+                    offsets[i] = export_profile["offset"]
+
+        with rasterio.open(tmp_path, "w", **profile) as dst:
+            for _, window in dst.block_windows(1):
+                dst.write(src.read(window=window), window=window)
+            dst.descriptions = src.descriptions
+            dst.scales = scales
+            dst.offsets = offsets
+            dst.update_tags(GEOAI_EXPORT_PROFILE=profile_name)
+
+    os.replace(tmp_path, out_path)
+    logger.info(f"Finalized {out_path} ({profile_name} profile, tiled DEFLATE)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite exported scenes tiled + DEFLATE with scale/offset tags")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--profile", default="analysis", choices=list(EXPORT_PROFILES))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    for path in args.paths:
+        finalize_geotiff(path, args.profile)
+
+
+if __name__ == "__main__":
+    main()
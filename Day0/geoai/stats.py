@@ -0,0 +1,141 @@
+"""
+Windowed streaming statistics for index rasters.
+
+NOTE:
+1.compute_avg_ndvi and the analysis.py scripts read full bands, then build denom, the ratio and an
+  np.where copy, which is about five full-size float32 arrays per scene.
+2.Here we walk the raster window by window (its internal blocks when it is tiled, groups of rows
+  when it is striped) and only keep running totals, so peak memory depends on the window size,
+  not on the size of the AOI.
+3.Pixels flagged by the scene's SCL band or holding the nodata value are left out; the mask is
+  built once per window from the bands already read and shared by every index (geoai.mask).
+4.Mean and variance are accumulated with Welford/Chan updates, which stay accurate over
+  hundreds of millions of pixels where a naive sum of squares would not.
+"""
+import sys
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+from geoai.indices import (INDEX_BANDS, normalized_difference, read_bands, read_masked_bands, required_bands,
+                           resolve_indices)
+
+# Upper bound on pixels per window for striped files (about 4 MB per float32 band)
+DEFAULT_MAX_PIXELS = 1 << 20
+
+
+class RunningStats:
+    """Streaming count / mean / variance / min / max"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Add a 1-D array of valid (finite) values"""
+        n = values.size
+        if n == 0:
+            return
+        batch_mean = float(values.mean(dtype="float64"))
+        batch_m2 = float(np.square(values - batch_mean, dtype="float64").sum())
+        self._combine(n, batch_mean, batch_m2, float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        """Fold in another RunningStats (e.g. from a different worker)"""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, n, mean, m2, vmin, vmax):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else float("nan")
+
+    def as_dict(self):
+        if not self.count:
+            return {"count": 0, "mean": float("nan"), "min": float("nan"), "max": float("nan"),
+                    "variance": float("nan"), "std": float("nan")}
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "variance": self.variance,
+            "std": float(np.sqrt(self.variance)),
+        }
+
+
+def iter_windows(src, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    Yield windows covering the raster, none holding more than max_pixels pixels
+    (at least one full row).
+    Tiled files are walked block by block; striped files are grouped into windows of whole strips,
+    and strips taller than that (a single-strip GeoTIFF) are split into windows of fewer rows.
+    """
+    block_height, block_width = src.block_shapes[0]
+    if block_width < src.width and block_height * block_width <= max_pixels:
+        for _, window in src.block_windows(1):
+            yield window
+        return
+
+    rows = max(1, max_pixels // src.width)
+    if rows >= block_height:
+        # Whole strips, so no strip is decoded twice
+        rows = rows // block_height * block_height
+    for row_off in range(0, src.height, rows):
+        yield Window(0, row_off, src.width, min(rows, src.height - row_off))
+
+
+def valid_values(values):
+    """Keep finite values inside the valid [-1, 1] range of a normalized difference"""
+    return values[np.isfinite(values) & (values >= -1) & (values <= 1)]
+
+
+def stream_index_stats(path, indices=None, max_pixels=DEFAULT_MAX_PIXELS, mask=True):
+    """
+    Compute count, mean, min, max, variance and std for each index without loading full bands.
+    With mask=True, cloudy / shadowed / no-data pixels are not counted.
+    Returns {"ndvi": {"count": ..., "mean": ..., ...}, ...}
+    """
+    with rasterio.open(path) as src:
+        indices = resolve_indices(src, indices)
+        bands_needed = required_bands(indices)
+        stats = {name: RunningStats() for name in indices}
+        buffer = None
+
+        for window in iter_windows(src, max_pixels):
+            if mask:
+                bands, clear = read_masked_bands(src, bands_needed, window)
+            else:
+                bands, clear = read_bands(src, bands_needed, window), None
+            # One index buffer for the whole scene, sized by the largest window
+            pixels = window.height * window.width
+            if buffer is None or buffer.size < pixels:
+                buffer = np.empty(pixels, dtype="float32")
+            for name in indices:
+                band_a, band_b = INDEX_BANDS[name]
+                values = normalized_difference(bands[band_a], bands[band_b],
+                                               out=buffer[:pixels].reshape(window.height, window.width))
+                if clear is not None:
+                    values = values[clear]
+                stats[name].update(valid_values(values))
+
+    return {name: running.as_dict() for name, running in stats.items()}
+
+
+if __name__ == "__main__":
+    for tif_path in sys.argv[1:]:
+        for name, result in stream_index_stats(tif_path).items():
+            print(f"{tif_path} - {name.upper()}: mean={result['mean']:.4f} std={result['std']:.4f} "
+                  f"min={result['min']:.4f} max={result['max']:.4f} valid={result['count']}")
@@ -0,0 +1,184 @@
+"""
+Time-series runner over dated scene directories.
+
+NOTE:
+1.Our exports are named <aoi>_<YYYY-MM-DD>.tif (e.g. sector14_2020-01-30.tif).
+2.The analysis scripts hard-code two of these paths and process them one after another.
+3.Here we discover every dated scene in a directory and compute the index stats for all of them
+  across a process pool, then return the rows ordered by AOI and date.
+4.With a geoai.cache.ResultCache only scenes whose content (or the index definition / parameters) changed
+  are computed; the rest come from the cache.
+5.Scenes analyzed (computed / cached) and the scenes-per-second rate are published through geoai.metrics
+  as each scene finishes.
+
+Example (from the Day0 folder):
+    python -m geoai.timeseries ndbi/polygon_swir_nir --workers 4 --out ndbi_timeseries.csv
+    python -m geoai.timeseries ndbi/polygon_swir_nir --cache result_cache
+    python -m geoai.timeseries ndbi/polygon_swir_nir --metrics-file /var/lib/node_exporter/geoai.prom
+"""
+import argparse
+import csv
+import logging
+import os
+import re
+import time
+
+from geoai.metrics import SCENES_ANALYZED, SCENES_PER_SECOND
+from geoai.stats import stream_index_stats
+
+logger = logging.getLogger(__name__)
+
+SCENE_PATTERN = re.compile(r"^(?P<aoi>.+)_(?P<date>\d{4}-\d{2}-\d{2})\.tif$")
+
+STAT_FIELDS = ["mean", "std", "min", "max", "count"]
+
+
+def discover_scenes(directory, aoi=None):
+    """
+    Find every <aoi>_<date>.tif in a directory.
+    Returns a list of {"aoi", "date", "path"} dicts sorted by AOI and date.
+    """
+    scenes = []
+    for file_name in os.listdir(directory):
+        match = SCENE_PATTERN.match(file_name)
+        if not match:
+            continue
+        if aoi is not None and match.group("aoi") != aoi:
+            continue
+        scenes.append({
+            "aoi": match.group("aoi"),
+            "date": match.group("date"),
+            "path": os.path.join(directory, file_name),
+        })
+
+    scenes.sort(key=lambda scene: (scene["aoi"], scene["date"]))
+    logger.info(f"Found {len(scenes)} scenes in {directory}")
+    return scenes
+
+
+def scene_stats(scene, indices=None):
+    """Compute the stats row for one scene (runs inside a worker process)"""
+    row = dict(scene)
+    for name, result in stream_index_stats(scene["path"], indices).items():
+        for field in STAT_FIELDS:
+            row[f"{name}_{field}"] = result[field]
+    return row
+
+
+def _scene_stats_job(args):
+    return scene_stats(*args)
+
+
+def _stats_cache_key(cache, scene, indices):
+    from geoai.cache import index_definition
+    return cache.key(scene["path"], "scene_stats", {"definition": index_definition(indices), "fields": STAT_FIELDS})
+
+
+def _collect(results, start):
+    """Gather worker rows as they finish, updating the throughput metrics"""
+    rows = []
+    for row in results:
+        rows.append(row)
+        SCENES_ANALYZED.inc(source="computed")
+        SCENES_PER_SECOND.set(len(rows) / max(time.perf_counter() - start, 1e-9))
+    return rows
+
+
+def run_timeseries(directory, indices=None, workers=None, aoi=None, cache=None):
+    """
+    Compute index stats for every dated scene in a directory.
+
+    workers: number of processes (defaults to every core). workers=1 runs in this process.
+    cache: optional geoai.cache.ResultCache; only cache misses are computed.
+    Returns the rows in AOI/date order, one dict per scene.
+    """
+    scenes = discover_scenes(directory, aoi)
+    if not scenes:
+        return []
+
+    # The cache is only touched here, in the parent process, so workers never share the SQLite file
+    rows = [None] * len(scenes)
+    keys = {}
+    if cache is not None:
+        for i, scene in enumerate(scenes):
+            keys[i] = _stats_cache_key(cache, scene, indices)
+            cached = cache.get_json(keys[i])
+            if cached is not None:
+                rows[i] = dict(scene, **cached)
+
+    pending = [i for i, row in enumerate(rows) if row is None]
+    jobs = [(scenes[i], indices) for i in pending]
+    if cache is not None:
+        logger.info(f"{len(scenes) - len(pending)} of {len(scenes)} scenes served from the cache")
+        SCENES_ANALYZED.inc(len(scenes) - len(pending), source="cache")
+    if not jobs:
+        return rows
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    logger.info(f"Computing stats for {len(jobs)} scenes with {workers} workers")
+
+    start = time.perf_counter()
+    if workers == 1:
+        computed = _collect(map(_scene_stats_job, jobs), start)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # map() keeps the input order, so the table stays sorted by date
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = _collect(pool.map(_scene_stats_job, jobs), start)
+
+    for i, row in zip(pending, computed):
+        rows[i] = row
+        if cache is not None:
+            cache.put_json(keys[i], "scene_stats", {k: v for k, v in row.items() if k not in scenes[i]})
+    return rows
+
+
+def write_csv(rows, out_path):
+    """Write time-series rows to a CSV file"""
+    fieldnames = []
+    for row in rows:
+        for key in row:
+            if key not in fieldnames:
+                fieldnames.append(key)
+
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    logger.info(f"Wrote {len(rows)} rows to {out_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index stats for every <aoi>_<date>.tif in a directory")
+    parser.add_argument("directory")
+    parser.add_argument("--indices", nargs="+", help="e.g. ndvi ndbi (default: every index the bands allow)")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--aoi", default=None, help="only scenes for this AOI prefix, e.g. sector14")
+    parser.add_argument("--out", default=None, help="CSV output path")
+    parser.add_argument("--cache", default=None, help="result cache directory (reuse stats of unchanged scenes)")
+    parser.add_argument("--cache-max-mb", type=int, default=1024, help="evict least recently used beyond this")
+    parser.add_argument("--metrics-file", default=None, help="write Prometheus metrics here when done")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    cache = None
+    if args.cache:
+        from geoai.cache import ResultCache
+        cache = ResultCache(args.cache, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+    rows = run_timeseries(args.directory, args.indices, args.workers, args.aoi, cache=cache)
+    for row in rows:
+        means = ", ".join(f"{key[:-5].upper()}={value:.4f}" for key, value in row.items() if key.endswith("_mean"))
+        print(f"{row['aoi']} {row['date']}: {means}")
+
+    if args.out:
+        write_csv(rows, args.out)
+    if args.metrics_file:
+        from geoai.metrics import write_textfile
+        write_textfile(args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
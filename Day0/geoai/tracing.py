@@ -0,0 +1,200 @@
+"""
+Structured timing spans for the extraction pipeline.
+
+NOTE:
+1.earth_engine_export.log only has free-text lines ("Searching for Sentinel-2 images...", "Task status: ..."),
+  so how long initialization, search, getInfo, export queueing and monitoring take can only be guessed
+  from timestamps of neighbouring lines.
+2.Each stage runs inside `with span("search", aoi=..., start_date=...) as s:`. When the span ends, one JSON
+  line is appended to the trace file:
+    {"name": "search", "duration_s": 1.42, "status": "ok", "attributes": {"collection": ..., "image_id": ...},
+     "trace_id": ..., "span_id": ..., "parent_id": ..., "start": <epoch seconds>, "pid": ...}
+  Attributes can be added while the span runs (s.set(image_id=..., bytes=...)). Spans nest: a search span
+  started inside an extract_scene span records it as its parent (contextvars, so this also holds for the
+  asyncio monitor).
+3.Tracing is off until configure_tracing(path) is called or GEOAI_TRACE_FILE is set; a span then only costs
+  two clock reads. Trace and span ids are generated when a span is written (a parent's on first use by a
+  child that is written), so untraced runs never call uuid4.
+4.summarize_traces reads any number of trace files and computes per-stage count, error count, mean,
+  p50 / p90 / p99 and a fixed-bucket latency histogram, so runs can be compared across thousands of jobs.
+
+Example (from the Day0 folder):
+    GEOAI_TRACE_FILE=traces.jsonl python -m geoai.batch jobs/sector14_monthly.json
+    python -m geoai.tracing traces.jsonl
+"""
+import argparse
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TRACE_ENV = "GEOAI_TRACE_FILE"
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800]
+
+_current_span = contextvars.ContextVar("geoai_span", default=None)
+_sink = {"path": None, "file": None}
+_sink_lock = threading.Lock()
+
+
+def configure_tracing(path):
+    """Append spans to `path` as JSON lines (None turns tracing off)"""
+    with _sink_lock:
+        if _sink["file"] is not None:
+            _sink["file"].close()
+        _sink["path"] = path
+        _sink["file"] = open(path, "a", encoding="utf-8") if path else None
+
+
+def tracing_enabled():
+    if _sink["path"] is None and os.environ.get(TRACE_ENV):
+        configure_tracing(os.environ[TRACE_ENV])
+    return _sink["file"] is not None
+
+
+def _emit(record):
+    line = json.dumps(record, default=str)
+    with _sink_lock:
+        if _sink["file"] is not None:
+            _sink["file"].write(line + "\n")
+            _sink["file"].flush()
+
+
+class Span:
+    """One timed stage; use through span()"""
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.parent = _current_span.get()
+        self._trace_id = None
+        self._span_id = None
+        self.start = time.time()
+        self.duration = None
+        self._token = None
+        self._clock = None
+
+    @property
+    def trace_id(self):
+        if self._trace_id is None:
+            self._trace_id = self.parent.trace_id if self.parent else uuid.uuid4().hex[:16]
+        return self._trace_id
+
+    @property
+    def span_id(self):
+        if self._span_id is None:
+            self._span_id = uuid.uuid4().hex[:16]
+        return self._span_id
+
+    @property
+    def parent_id(self):
+        return self.parent.span_id if self.parent else None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+        return self
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        self._clock = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._clock
+        _current_span.reset(self._token)
+        if tracing_enabled():
+            _emit({
+                "name": self.name,
+                "duration_s": round(self.duration, 6),
+                "status": "error" if exc_type else "ok",
+                "error": str(exc) if exc else None,
+                "attributes": self.attributes,
+                "trace_id": self.trace_id,
+                "span_id": self.span_id,
+                "parent_id": self.parent_id,
+                "start": self.start,
+                "pid": os.getpid(),
+            })
+        return False
+
+
+def span(name, **attributes):
+    """Time a pipeline stage: `with span("export_queue", aoi=aoi_name) as s: ...`"""
+    return Span(name, attributes)
+
+
+def read_spans(paths):
+    """Every span record of the given trace files (unreadable lines are skipped)"""
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def summarize_traces(paths, group_by=None):
+    """
+    Per-stage latency summary.
+    group_by: optional attribute name (e.g. "aoi") to split every stage by.
+    Returns one dict per stage: {"name", "group", "count", "errors", "mean_s", "p50_s", "p90_s", "p99_s",
+    "max_s", "histogram": {bucket upper bound: count}}
+    """
+    import numpy as np
+
+    durations = {}
+    errors = {}
+    for record in read_spans(paths):
+        group = record.get("attributes", {}).get(group_by) if group_by else None
+        key = (record["name"], group)
+        durations.setdefault(key, []).append(record["duration_s"])
+        if record.get("status") == "error":
+            errors[key] = errors.get(key, 0) + 1
+
+    labels = [str(bound) for bound in HISTOGRAM_BUCKETS] + ["+Inf"]
+    summary = []
+    for (name, group), values in sorted(durations.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        values = np.asarray(values)
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        counts = np.bincount(np.searchsorted(HISTOGRAM_BUCKETS, values), minlength=len(labels))
+        summary.append({
+            "name": name,
+            "group": group,
+            "count": int(values.size),
+            "errors": errors.get((name, group), 0),
+            "mean_s": float(values.mean()),
+            "p50_s": float(p50),
+            "p90_s": float(p90),
+            "p99_s": float(p99),
+            "max_s": float(values.max()),
+            "histogram": dict(zip(labels, counts.tolist())),
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency summary of geoai trace files")
+    parser.add_argument("paths", nargs="+", help="JSON-lines trace files")
+    parser.add_argument("--by", default=None, help="split stages by this attribute, e.g. aoi or sensor")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON (with histograms)")
+    args = parser.parse_args()
+
+    summary = summarize_traces(args.paths, args.by)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{'stage':<24} {'group':<16} {'count':>7} {'errors':>6} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9}")
+    for row in summary:
+        print(f"{row['name']:<24} {str(row['group'] or '-'):<16} {row['count']:>7} {row['errors']:>6} "
+              f"{row['mean_s']:>8.3f}s {row['p50_s']:>8.3f}s {row['p90_s']:>8.3f}s {row['p99_s']:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
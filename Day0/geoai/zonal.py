@@ -0,0 +1,160 @@
+"""
+Vectorized multi-zone statistics from a single raster pass.
+
+NOTE:
+1.Each analysis script averages one raster that was clipped to one sector on the server.
+  Per-sector KPIs for the whole city that way means one clip-and-export cycle per sector.
+2.Here we export one larger raster covering all sectors, rasterize the sector polygons once into a label
+  grid aligned to the scene (0 = outside every sector, 1..N = sector number) and reduce every zone at once:
+    - count and mean come from np.bincount, and the std from a second bincount of the squared deviations
+      from each zone's mean (two-pass, so a zone of large, nearly equal values such as LST in kelvin
+      keeps its precision, which E[x^2] - E[x]^2 would cancel away)
+    - one sort by (zone, value) gives min, max and any percentile for every zone without a Python loop
+3.The same label grid is reused for NDVI / NDBI / NDMI / MNDWI / LST of the scene.
+4.Polygons are GeoJSON lon/lat (EPSG:4326) and are reprojected to the scene CRS (UTM for our exports).
+  Where polygons overlap, the later feature wins the pixel.
+
+Example (from the Day0 folder):
+    python -m geoai.zonal city_2025-01-28.tif gurugram_sectors.geojson --out sector_kpis.csv
+"""
+import argparse
+import logging
+
+import numpy as np
+import rasterio
+from rasterio.features import rasterize
+from rasterio.warp import transform_geom
+
+from geoai.geometry import load_features
+from geoai.indices import available_indices, compute_indices
+from geoai.lst import LST_BAND, load_lst
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERCENTILES = (10, 50, 90)
+
+
+def label_grid(geojson_path, src, all_touched=False):
+    """
+    Rasterize every polygon feature onto the scene grid.
+    Returns (labels as int32 array, zones) where zones[i - 1] describes label i.
+    """
+    features = load_features(geojson_path)
+    shapes = [
+        (transform_geom("EPSG:4326", src.crs, feature["geometry"]), label)
+        for label, feature in enumerate(features, start=1)
+    ]
+    labels = rasterize(
+        shapes,
+        out_shape=(src.height, src.width),
+        transform=src.transform,
+        fill=0,
+        all_touched=all_touched,
+        dtype="int32",
+    )
+    zones = [{"zone": label, "name": f["name"], "key": f["key"]} for label, f in enumerate(features, start=1)]
+    logger.info(f"Rasterized {len(zones)} zones onto a {src.height}x{src.width} grid")
+    return labels, zones
+
+
+def zonal_stats(values, labels, zone_count, percentiles=DEFAULT_PERCENTILES):
+    """
+    count, mean, std, min, max and percentiles of `values` for zones 1..zone_count.
+    NaN / inf pixels and pixels outside every zone (label 0) are ignored.
+    Returns a dict of arrays indexed by zone - 1.
+    """
+    valid = (labels > 0) & np.isfinite(values)
+    zone_ids = labels[valid]
+    zone_values = values[valid].astype("float64")
+
+    counts = np.bincount(zone_ids, minlength=zone_count + 1)[1:]
+    sums = np.bincount(zone_ids, weights=zone_values, minlength=zone_count + 1)[1:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        # Second pass over the same pixels: squared deviations from the zone mean
+        deviations = zone_values - np.concatenate(([0.0], means))[zone_ids]
+        squares = np.bincount(zone_ids, weights=deviations * deviations, minlength=zone_count + 1)[1:]
+        variances = squares / counts
+
+    result = {"count": counts, "mean": means, "std": np.sqrt(variances)}
+
+    # Sort by zone, then value: each zone becomes one contiguous, sorted run
+    order = np.lexsort((zone_values, zone_ids))
+    sorted_values = zone_values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    has_data = counts > 0
+    last = np.maximum(counts - 1, 0)
+
+    def pick(fraction):
+        """Linear-interpolated value at `fraction` of each zone's sorted run"""
+        position = starts + last * fraction
+        lower = np.floor(position).astype("int64")
+        upper = np.minimum(lower + 1, starts + last)
+        weight = position - lower
+        out = np.full(zone_count, np.nan)
+        if sorted_values.size:
+            out[has_data] = (sorted_values[lower[has_data]] * (1 - weight[has_data])
+                             + sorted_values[upper[has_data]] * weight[has_data])
+        return out
+
+    result["min"] = pick(0.0)
+    result["max"] = pick(1.0)
+    for p in percentiles:
+        result[f"p{p}"] = pick(p / 100.0)
+    return result
+
+
+def scene_layers(scene_path, indices=None):
+    """Every layer we can compute from a scene: the spectral indices and/or LST"""
+    with rasterio.open(scene_path) as src:
+        descriptions = src.descriptions
+    if indices is None:
+        indices = available_indices(descriptions)
+
+    layers = compute_indices(scene_path, indices) if indices else {}
+    if LST_BAND in descriptions:
+        layers["lst"], _ = load_lst(scene_path)
+    return layers
+
+
+def zonal_scene_stats(scene_path, geojson_path, indices=None, percentiles=DEFAULT_PERCENTILES,
+                      all_touched=False):
+    """
+    Per-zone statistics for every layer of a scene.
+    Returns one row per (zone, layer): {"zone", "name", "key", "layer", "count", "mean", "std", "min", ...}
+    """
+    with rasterio.open(scene_path) as src:
+        labels, zones = label_grid(geojson_path, src, all_touched)
+
+    rows = []
+    for layer, values in scene_layers(scene_path, indices).items():
+        stats = zonal_stats(values, labels, len(zones), percentiles)
+        for i, zone in enumerate(zones):
+            row = dict(zone, layer=layer)
+            row.update({field: stats[field][i].item() for field in stats})
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-zone index statistics for one scene")
+    parser.add_argument("scene")
+    parser.add_argument("geojson")
+    parser.add_argument("--indices", nargs="+")
+    parser.add_argument("--all-touched", action="store_true", help="count every pixel a polygon touches")
+    parser.add_argument("--out", default=None, help="CSV output path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    rows = zonal_scene_stats(args.scene, args.geojson, args.indices, all_touched=args.all_touched)
+    for row in rows:
+        print(f"{row['name']} ({row['key']}) {row['layer'].upper()}: mean={row['mean']:.4f} "
+              f"p50={row['p50']:.4f} valid={row['count']}")
+
+    if args.out:
+        from geoai.timeseries import write_csv
+        write_csv(rows, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Local stand-in for the Earth Engine client (pass it as `client=` to geoai.extract / batch / download).
+
+NOTE:
+1.Collections are plain lists of scenes {"id", "date", "cloud"} per collection name. filterDate, the cloud
+  filter, sort, first, size and aggregate_array are evaluated locally on those lists.
+2.Server-side values stay lazy until getInfo(); every round trip is counted in `calls`
+  ("getInfo", "export_start", "status", "getDownloadURL"), so tests can assert how many requests a
+  flow makes.
+3.Images record the operations applied to them (`ops`: (name, args) pairs), so tests can check what
+  would be computed server-side without evaluating any pixels.
+4.Export tasks walk through `task_states` (one state per status() call, the last one sticks).
+"""
+import datetime
+import itertools
+from collections import Counter
+from types import SimpleNamespace
+
+TERMINAL_STATES = ("COMPLETED", "FAILED", "CANCELLED")
+CLOUD_PROPERTIES = ("CLOUDY_PIXEL_PERCENTAGE", "CLOUD_COVER")
+
+
+def resolve(value):
+    """Evaluate a (possibly nested) server-side value"""
+    if isinstance(value, Value):
+        return resolve(value.value)
+    if isinstance(value, dict):
+        return {key: resolve(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [resolve(item) for item in value]
+    return value
+
+
+def _time_start(date):
+    day = datetime.datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+    return int(day.timestamp() * 1000)
+
+
+class Value:
+    """ee.Number / ee.String / ee.Dictionary / ee.Date"""
+
+    def __init__(self, ee, value):
+        self.ee = ee
+        self.value = value
+
+    def getInfo(self):
+        self.ee.calls["getInfo"] += 1
+        return resolve(self.value)
+
+    def gt(self, other):
+        return Value(self.ee, resolve(self) > resolve(other))
+
+    def subtract(self, other):
+        return Value(self.ee, resolve(self) - resolve(other))
+
+    def format(self, pattern):
+        # Scene dates are already stored as YYYY-MM-dd
+        return self
+
+
+class Image:
+    """ee.Image that records the operations applied to it"""
+
+    def __init__(self, ee, scene=None, ops=(), sources=()):
+        self.ee = ee
+        self.scene = scene
+        self.ops = tuple(ops)
+        self.sources = list(sources)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def op(*args, **kwargs):
+            return Image(self.ee, self.scene, self.ops + ((name, args),), self.sources)
+        return op
+
+    def op_names(self):
+        return [name for name, _ in self.ops]
+
+    def get(self, prop):
+        scene = self.scene or {}
+        if prop == "system:id":
+            return Value(self.ee, scene.get("id"))
+        if prop in CLOUD_PROPERTIES:
+            return Value(self.ee, scene.get("cloud"))
+        return Value(self.ee, scene.get(prop))
+
+    def date(self):
+        return Value(self.ee, (self.scene or {}).get("date"))
+
+    def getDownloadURL(self, params):
+        self.ee.calls["getDownloadURL"] += 1
+        self.ee.download_requests.append(params)
+        if self.ee.download_url is None:
+            raise RuntimeError("Total request size (41943040 bytes) must be less than or equal to 33554432 bytes.")
+        return self.ee.download_url
+
+
+class ImageFactory:
+    """ee.Image(id) and ee.Image.constant(value)"""
+
+    def __init__(self, ee):
+        self.ee = ee
+
+    def __call__(self, image_id):
+        scene = next((s for scenes in self.ee.collections.values() for s in scenes if s["id"] == image_id), None)
+        return Image(self.ee, scene)
+
+    def constant(self, value):
+        return Image(self.ee, None, (("constant", (value,)),))
+
+
+class ImageCollection:
+    def __init__(self, ee, name, scenes=None, images=None):
+        self.ee = ee
+        self.name = name
+        self.scenes = list(ee.collections.get(name, [])) if scenes is None else scenes
+        self.images = images
+
+    def _with(self, scenes):
+        return ImageCollection(self.ee, self.name, scenes)
+
+    def filterBounds(self, geometry):
+        return self
+
+    def filterDate(self, start_date, end_date):
+        return self._with([s for s in self.scenes if start_date <= s["date"] < end_date])
+
+    def filter(self, condition):
+        op, prop, value = condition
+        if op != "lt" or prop not in CLOUD_PROPERTIES:
+            raise NotImplementedError(condition)
+        return self._with([s for s in self.scenes if s["cloud"] < value])
+
+    def sort(self, prop):
+        return self._with(sorted(self.scenes, key=lambda s: s["cloud"]))
+
+    def first(self):
+        return Image(self.ee, self.scenes[0] if self.scenes else None)
+
+    def size(self):
+        return Value(self.ee, len(self.scenes))
+
+    def aggregate_array(self, prop):
+        if prop == "system:id":
+            values = [s["id"] for s in self.scenes]
+        elif prop == "system:time_start":
+            values = [_time_start(s["date"]) for s in self.scenes]
+        else:
+            values = [s["cloud"] for s in self.scenes]
+        return Value(self.ee, values)
+
+    def map(self, fn):
+        images = [fn(image) for image in (self.images or [Image(self.ee, s) for s in self.scenes])]
+        return ImageCollection(self.ee, self.name, self.scenes, images)
+
+    def _reduce(self, name, *args):
+        images = self.images or [Image(self.ee, s) for s in self.scenes]
+        return Image(self.ee, None, ((name, args),), images)
+
+    def select(self, bands):
+        images = [image.select(bands) for image in (self.images or [Image(self.ee, s) for s in self.scenes])]
+        return ImageCollection(self.ee, self.name, self.scenes, images)
+
+    def median(self):
+        return self._reduce("median")
+
+    def mode(self):
+        return self._reduce("mode")
+
+    def qualityMosaic(self, band):
+        return self._reduce("qualityMosaic", band)
+
+
+class Task:
+    def __init__(self, ee, task_id, states, params):
+        self.ee = ee
+        self.id = task_id
+        self.params = params
+        self._states = list(states)
+        self.state = "UNSUBMITTED"
+
+    def start(self):
+        self.ee.calls["export_start"] += 1
+        self.state = "READY"
+
+    def status(self):
+        self.ee.calls["status"] += 1
+        if self._states:
+            self.state = self._states.pop(0)
+        status = {"state": self.state, "id": self.id}
+        if self.state == "FAILED":
+            status["error_message"] = "boom"
+        return status
+
+    def active(self):
+        return self.status()["state"] not in TERMINAL_STATES
+
+
+class Geometry:
+    def __init__(self, geometry_type, coordinates):
+        self.geometry = {"type": geometry_type, "coordinates": coordinates}
+
+    def toGeoJSON(self):
+        return self.geometry
+
+
+class FakeEE:
+    """Stand-in for the `ee` module"""
+
+    def __init__(self, collections=None, task_states=("COMPLETED",), download_url=None):
+        self.collections = collections or {}
+        self.task_states = task_states
+        self.download_url = download_url
+        self.download_requests = []
+        self.calls = Counter()
+        self.exports = []
+        self._task_ids = itertools.count(1)
+
+        self.Image = ImageFactory(self)
+        self.Filter = SimpleNamespace(lt=lambda prop, value: ("lt", prop, value))
+        self.Number = lambda value: Value(self, value)
+        self.Dictionary = lambda value: Value(self, value)
+        self.Algorithms = SimpleNamespace(If=lambda condition, a, b: Value(self, a if resolve(condition) else b))
+        self.Geometry = SimpleNamespace(Polygon=lambda coordinates: Geometry("Polygon", coordinates),
+                                        MultiPolygon=lambda coordinates: Geometry("MultiPolygon", coordinates))
+        self.batch = SimpleNamespace(Export=SimpleNamespace(image=SimpleNamespace(toDrive=self._to_drive)))
+
+    def ImageCollection(self, name):
+        return ImageCollection(self, name)
+
+    def Initialize(self, project=None):
+        self.project = project
+
+    def _to_drive(self, **params):
+        task = Task(self, f"TASK{next(self._task_ids)}", self.task_states, params)
+        self.exports.append(task)
+        return task
@@ -0,0 +1,53 @@
+import json
+
+from geoai import extract
+from geoai.batch import load_job_spec, plan_jobs, run_batch
+from geoai.catalog import SceneCatalog
+from tests.fake_ee import FakeEE
+
+SCENES = {
+    extract.SENTINEL2_COLLECTION: [
+        {"id": "S2/20240110", "date": "2024-01-10", "cloud": 3.5},
+        {"id": "S2/20240215", "date": "2024-02-15", "cloud": 8.0},
+    ],
+}
+
+
+def _jobs(tmp_path):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(json.dumps({
+        "aois": [{"name": "sector14", "geojson": extract.SECTOR14_GEOJSON}],
+        "windows": [{"start": "2024-01-01", "end": "2024-02-01"}],
+    }))
+    return plan_jobs(load_job_spec(str(job_file)))
+
+
+def _states(results):
+    return [(result["state"], result["error"]) for result in results]
+
+
+def test_failed_export_is_retried(tmp_path):
+    jobs = _jobs(tmp_path)
+    catalog = SceneCatalog(str(tmp_path / "catalog.sqlite"))
+
+    failing = FakeEE(SCENES, task_states=("FAILED",))
+    assert _states(run_batch(jobs, client=failing, catalog=catalog)) == [("FAILED", "boom")]
+    assert not catalog.is_exported("S2/20240110", "sector14")
+
+    working = FakeEE(SCENES)
+    assert _states(run_batch(jobs, client=working, catalog=catalog)) == [("COMPLETED", None)]
+    assert len(working.exports) == 1
+    assert catalog.is_exported("S2/20240110", "sector14")
+
+    done = FakeEE(SCENES)
+    assert _states(run_batch(jobs, client=done, catalog=catalog)) == [("ALREADY_EXPORTED", None)]
+    assert done.exports == []
+
+
+def test_unmonitored_export_is_not_marked_done(tmp_path):
+    jobs = _jobs(tmp_path)
+    catalog = SceneCatalog(str(tmp_path / "catalog.sqlite"))
+
+    assert _states(run_batch(jobs, client=FakeEE(SCENES), catalog=catalog, monitor=False)) == \
+        [("SUBMITTED", None)]
+    assert not catalog.is_exported("S2/20240110", "sector14")
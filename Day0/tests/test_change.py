@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from rasterio.transform import from_origin
+
+from geoai.change import change_regions
+
+TRANSFORM = from_origin(700000, 3160000, 10, 10)
+CRS = "EPSG:32643"
+
+
+def _speckled(size=200, seed=0):
+    """Two clean blobs (+0.5 and -0.4) on a background of isolated one-pixel speckle"""
+    rng = np.random.default_rng(seed)
+    delta = np.zeros((size, size), dtype="float32")
+    # Speckle on an every-other-pixel lattice, so no two specks touch (even 8-connected)
+    speckle = np.zeros(delta.shape, dtype=bool)
+    speckle[::2, ::2] = rng.random((size // 2, size // 2)) < 0.3
+    # ... and none of them next to a blob
+    speckle[18:62, 28:82] = speckle[118:152, 98:142] = False
+    delta[speckle] = rng.choice([-0.3, 0.3], size=int(speckle.sum()))
+    delta[20:60, 30:80] = 0.5
+    delta[45, 50] = 0.9
+    delta[120:150, 100:140] = -0.4
+    delta[130, 110] = -0.8
+    # A one-pixel hole in the first blob
+    delta[40, 40] = 0.0
+    return delta, speckle
+
+
+def test_speckle_is_dropped_before_polygonizing():
+    delta, _ = _speckled()
+    labels, regions = change_regions(delta, TRANSFORM, CRS, threshold=0.1, min_pixels=5)
+
+    assert [(r["direction"], r["pixels"]) for r in regions] == [("increase", 40 * 50 - 1), ("decrease", 30 * 40)]
+    increase, decrease = regions
+    assert (increase["min_delta"], increase["max_delta"]) == (0.5, pytest.approx(0.9))
+    assert (decrease["min_delta"], decrease["max_delta"]) == (pytest.approx(-0.8), pytest.approx(-0.4))
+    assert increase["mean_delta"] == pytest.approx((0.5 * 1998 + 0.9) / 1999)
+    assert increase["area_m2"] == 1999 * 100
+
+    # Labels hold exactly the changed pixels of each kept region
+    assert np.count_nonzero(labels == 1) == 1999 and np.count_nonzero(labels == 2) == 1200
+    assert labels[40, 40] == 0 and labels[45, 50] == 1 and labels[130, 110] == 2
+    assert np.count_nonzero(labels) == 1999 + 1200
+
+    # Outlines in lon/lat, the small hole filled rather than kept as a ring
+    ring = np.array(increase["geometry"]["coordinates"][0])
+    assert len(increase["geometry"]["coordinates"]) == 1
+    assert 76 < ring[:, 0].min() < ring[:, 0].max() < 78 and 28 < ring[:, 1].min() < ring[:, 1].max() < 29.5
+
+
+def test_every_speck_is_a_region_without_min_pixels():
+    delta, speckle = _speckled()
+    labels, regions = change_regions(delta, TRANSFORM, CRS, threshold=0.1)
+
+    assert len(regions) == int(speckle.sum()) + 2
+    assert sorted(r["pixels"] for r in regions)[-2:] == [1200, 1999]
+    assert labels.max() == len(regions)
+    assert sum(r["pixels"] for r in regions) == np.count_nonzero(np.abs(delta) >= 0.1)
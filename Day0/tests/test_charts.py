@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import pytest
+
+from geoai.charts import plan_charts
+
+SCENE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ndbi", "polygon_swir_nir",
+                     "sector14_2020-01-30.tif")
+
+
+def _folder(path):
+    os.makedirs(path)
+    shutil.copy(SCENE, path)
+    return str(path)
+
+
+def test_same_aoi_and_layer_from_two_folders_do_not_collide(tmp_path):
+    first = _folder(tmp_path / "2020" / "polygon")
+    second = _folder(tmp_path / "2021" / "polygon")
+    charts = plan_charts([first, second], layers=["ndbi"], out_dir=str(tmp_path / "charts"))
+
+    assert [chart["out_path"] for chart in charts] == [
+        str(tmp_path / "charts" / "2020_polygon_sector14_ndbi.png"),
+        str(tmp_path / "charts" / "2021_polygon_sector14_ndbi.png"),
+    ]
+
+
+def test_one_folder_is_named_after_its_basename(tmp_path, monkeypatch):
+    folder = _folder(tmp_path / "ndbi" / "polygon_swir_nir")
+    expected = [os.path.join("charts", "polygon_swir_nir_sector14_ndbi.png")]
+    monkeypatch.chdir(tmp_path)
+    for directory in [folder, os.path.join("ndbi", "polygon_swir_nir") + os.sep]:
+        charts = plan_charts([directory], layers=["ndbi"], out_dir="charts")
+        assert [chart["out_path"] for chart in charts] == expected
+
+    monkeypatch.chdir(folder)
+    assert [chart["out_path"] for chart in plan_charts(["."], layers=["ndbi"], out_dir="charts")] == expected
+
+
+def test_several_folders_are_named_below_their_common_parent(tmp_path):
+    ndbi = _folder(tmp_path / "ndbi" / "polygon_swir_nir")
+    mndwi = _folder(tmp_path / "MNDWI" / "polygon")
+    charts = plan_charts([ndbi, mndwi, ndbi], layers=["ndbi"], out_dir="charts")
+    assert [chart["out_path"] for chart in charts] == [
+        os.path.join("charts", "ndbi_polygon_swir_nir_sector14_ndbi.png"),
+        os.path.join("charts", "mndwi_polygon_sector14_ndbi.png"),
+    ]
+
+
+def test_folders_with_the_same_chart_names_are_rejected(tmp_path):
+    folders = [_folder(tmp_path / "sector-14"), _folder(tmp_path / "sector_14")]
+    with pytest.raises(ValueError, match="same chart names"):
+        plan_charts(folders, layers=["ndbi"], out_dir=str(tmp_path / "charts"))
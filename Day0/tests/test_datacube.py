@@ -0,0 +1,52 @@
+import json
+import os
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from geoai.datacube import META_FILE, build_datacube
+from geoai.timeseries import discover_scenes
+
+pytestmark = pytest.mark.filterwarnings("ignore::rasterio.errors.NotGeoreferencedWarning")
+
+
+def _scene(directory, name, size=40, value=1, crs="EPSG:32643"):
+    path = os.path.join(directory, name)
+    profile = {"driver": "GTiff", "width": size, "height": size, "count": 2, "dtype": "int16"}
+    if crs is not None:
+        profile.update(crs=crs, transform=from_origin(700000, 3160000, 10, 10))
+    with rasterio.open(path, "w", **profile) as dst:
+        dst.write(np.full((2, size, size), value, dtype="int16"))
+        dst.descriptions = ("B11", "B8")
+    return path
+
+
+def test_scenes_without_crs(tmp_path):
+    for day, value in ((10, 1), (20, 2)):
+        _scene(str(tmp_path), f"sector14_2024-01-{day}.tif", value=value, crs=None)
+
+    cube = build_datacube(discover_scenes(str(tmp_path)), str(tmp_path / "cube"), space_chunk=16)
+    with open(tmp_path / "cube" / META_FILE, encoding="utf-8") as f:
+        assert json.load(f)["crs"] is None
+    assert cube.shape == (2, 2, 40, 40)
+    assert cube.pixel_series(39, 39, "B8").tolist() == [1, 2]
+
+
+def test_several_aois_are_rejected(tmp_path):
+    _scene(str(tmp_path), "sector14_2024-01-10.tif")
+    _scene(str(tmp_path), "sector15_2024-01-10.tif", size=30)
+
+    with pytest.raises(ValueError, match="several AOIs"):
+        build_datacube(discover_scenes(str(tmp_path)), str(tmp_path / "cube"))
+    cube = build_datacube(discover_scenes(str(tmp_path), "sector15"), str(tmp_path / "cube"))
+    assert cube.shape == (1, 2, 30, 30)
+
+
+def test_misaligned_scenes_are_rejected(tmp_path):
+    _scene(str(tmp_path), "sector14_2024-01-10.tif")
+    _scene(str(tmp_path), "sector14_2024-01-20.tif", size=30)
+
+    with pytest.raises(ValueError, match="is 30x30, expected 40x40"):
+        build_datacube(discover_scenes(str(tmp_path)), str(tmp_path / "cube"))
@@ -0,0 +1,131 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from geoai.cog import is_cog
+from geoai.download import DOWNLOAD_LIMIT_BYTES, DownloadedScene, deliver_image, estimate_request_bytes
+from tests.fake_ee import FakeEE
+
+SMALL_AOI = {"type": "Polygon", "coordinates": [[[77.03, 28.47], [77.05, 28.47], [77.05, 28.49], [77.03, 28.47]]]}
+LARGE_AOI = {"type": "Polygon", "coordinates": [[[76.0, 28.0], [78.0, 28.0], [78.0, 30.0], [76.0, 28.0]]]}
+PIXELS = (np.arange(2 * 512 * 512) % 4000).astype("uint16").reshape(2, 512, 512)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """
+    Local stand-in for the getDownloadURL endpoint: /scene.tif serves a GeoTIFF, /truncated drops the
+    connection half way through it, anything else is an HTTP 500
+    """
+    scene_path = tmp_path / "served.tif"
+    with rasterio.open(scene_path, "w", driver="GTiff", width=512, height=512, count=2, dtype="uint16",
+                       crs="EPSG:4326", transform=from_origin(77.03, 28.49, 0.00005, 0.00005)) as dst:
+        dst.write(PIXELS)
+        dst.descriptions = ("B4", "SCL")
+    payload = scene_path.read_bytes()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ("/scene.tif", "/truncated"):
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload if self.path == "/scene.tif" else payload[:len(payload) // 2])
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", payload
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _image(ee):
+    return ee.Image("S2/20240110")
+
+
+def test_small_aoi_is_downloaded_and_ingested(server, tmp_path):
+    base_url, _ = server
+    ee = FakeEE(download_url=f"{base_url}/scene.tif")
+    scene = deliver_image(_image(ee), "2024-01-10", SMALL_AOI, download_dir=str(tmp_path / "downloads"),
+                          profile="analysis", client=ee)
+
+    assert isinstance(scene, DownloadedScene)
+    assert scene.status()["state"] == "COMPLETED"
+    assert ee.calls["getDownloadURL"] == 1 and ee.exports == []
+
+    # Landed as a finalized COG: same pixels, overviews, scale tags on the reflectance band only
+    assert is_cog(scene.path)
+    with rasterio.open(scene.path) as src:
+        assert np.array_equal(src.read(), PIXELS)
+        assert src.overviews(1) == [2]
+        assert src.scales == (0.0001, 1.0)
+        assert src.tags()["GEOAI_EXPORT_PROFILE"] == "analysis"
+
+
+def test_large_aoi_goes_to_drive(tmp_path):
+    assert estimate_request_bytes(LARGE_AOI, 10, 1, 1) > DOWNLOAD_LIMIT_BYTES
+    ee = FakeEE(download_url="http://127.0.0.1:9/never")
+    task = deliver_image(_image(ee), "2024-01-10", LARGE_AOI, download_dir=str(tmp_path), client=ee)
+
+    assert ee.exports == [task] and ee.calls["export_start"] == 1
+    assert ee.calls["getDownloadURL"] == 0
+
+
+@pytest.mark.parametrize("path", ["/broken", "/truncated"])
+def test_transport_error_falls_back_to_drive(server, tmp_path, path):
+    base_url, _ = server
+    download_dir = tmp_path / "downloads"
+    ee = FakeEE(download_url=base_url + path)
+    task = deliver_image(_image(ee), "2024-01-10", SMALL_AOI, download_dir=str(download_dir), client=ee)
+
+    assert ee.exports == [task]
+    assert ee.calls["getDownloadURL"] == 1
+    # No half-written .part file is left behind
+    assert os.listdir(download_dir) == []
+
+
+def test_rejected_size_falls_back_to_drive(tmp_path):
+    ee = FakeEE(download_url=None)
+    task = deliver_image(_image(ee), "2024-01-10", SMALL_AOI, download_dir=str(tmp_path), client=ee)
+
+    assert ee.exports == [task]
+    assert ee.calls["getDownloadURL"] == 1
+
+
+def test_other_errors_are_raised(server, tmp_path):
+    base_url, _ = server
+    download_dir = tmp_path / "downloads"
+    ee = FakeEE(download_url=f"{base_url}/scene.tif")
+    with pytest.raises(ValueError, match="Unknown export profile"):
+        deliver_image(_image(ee), "2024-01-10", SMALL_AOI, download_dir=str(download_dir), profile="bogus",
+                      client=ee)
+    assert ee.exports == []
+    assert os.listdir(download_dir) == []
+
+
+def test_failed_ingest_leaves_no_scene(server, tmp_path, monkeypatch):
+    base_url, _ = server
+    download_dir = tmp_path / "downloads"
+
+    def broken_convert(path, *args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("geoai.cog.convert_to_cog", broken_convert)
+    ee = FakeEE(download_url=f"{base_url}/scene.tif")
+    with pytest.raises(OSError, match="disk full"):
+        deliver_image(_image(ee), "2024-01-10", SMALL_AOI, download_dir=str(download_dir), client=ee)
+
+    # Neither a half-processed sector14_2024-01-10.tif nor the staging file is left for the next run
+    assert os.listdir(download_dir) == []
+    assert ee.exports == []
@@ -0,0 +1,93 @@
+from geoai import extract
+from tests.fake_ee import FakeEE
+
+GEOMETRY = {"type": "Polygon", "coordinates": [[[77.03, 28.47], [77.05, 28.47], [77.05, 28.49], [77.03, 28.47]]]}
+
+SCENES = {
+    extract.SENTINEL2_COLLECTION: [
+        {"id": "S2/20240105", "date": "2024-01-05", "cloud": 12.0},
+        {"id": "S2/20240110", "date": "2024-01-10", "cloud": 3.5},
+        {"id": "S2/20240120", "date": "2024-01-20", "cloud": 45.0},
+        {"id": "S2/20240210", "date": "2024-02-10", "cloud": 1.0},
+    ],
+}
+
+
+def test_stacked_scene_is_one_export():
+    ee = FakeEE(SCENES)
+    task, date_used = extract.extract_stacked_scene(GEOMETRY, "2024-01-01", "2024-02-01", client=ee)
+
+    assert date_used == "2024-01-10"
+    assert ee.exports == [task]
+    assert ee.calls["export_start"] == 1
+    assert task.params["fileNamePrefix"] == "sector14_2024-01-10"
+
+    image = task.params["image"]
+    assert image.scene["id"] == "S2/20240110"
+    assert ("select", (extract.STACK_BANDS,)) in image.ops
+    added = [args[0] for name, args in image.ops if name == "addBands"]
+    assert len(added) == 1 and ("select", ([extract.CLASSIFICATION_BAND],)) in added[0].ops
+
+
+def test_stacked_scene_selects_requested_bands():
+    ee = FakeEE(SCENES)
+    task, _ = extract.extract_stacked_scene(GEOMETRY, "2024-01-01", "2024-02-01", bands=["B4", "B8"], client=ee,
+                                            profile="analysis")
+    assert ("select", (["B4", "B8"],)) in task.params["image"].ops
+    assert "int16" in task.params["image"].op_names()
+
+
+def test_no_image_no_export():
+    ee = FakeEE(SCENES)
+    assert extract.extract_stacked_scene(GEOMETRY, "2023-01-01", "2023-02-01", client=ee) == (None, None)
+    assert ee.exports == []
+
+
+def test_search_is_one_round_trip():
+    ee = FakeEE(SCENES)
+    image, info = extract.search_sentinel_images(GEOMETRY, "2024-01-01", "2024-02-01", client=ee)
+
+    assert ee.calls == {"getInfo": 1}
+    # The 45% scene is over the default cloud_max of 30
+    assert info["count"] == 2
+    assert (info["id"], info["date"], info["cloud"]) == ("S2/20240110", "2024-01-10", 3.5)
+    assert sorted(c["date"] for c in info["candidates"]) == ["2024-01-05", "2024-01-10"]
+    assert image.scene["id"] == "S2/20240110"
+
+
+def test_empty_search_is_one_round_trip():
+    ee = FakeEE(SCENES)
+    assert extract.search_sentinel_images(GEOMETRY, "2024-01-01", "2024-02-01", cloud_max=1, client=ee) == \
+        (None, None)
+    assert ee.calls == {"getInfo": 1}
+
+
+def test_catalog_answers_repeat_search(tmp_path):
+    from geoai.catalog import SceneCatalog
+
+    ee = FakeEE(SCENES)
+    catalog = SceneCatalog(str(tmp_path / "catalog.sqlite"))
+    first = extract.find_best_image(extract.SENTINEL2_COLLECTION, "CLOUDY_PIXEL_PERCENTAGE", GEOMETRY,
+                                    "2024-01-01", "2024-02-01", client=ee, catalog=catalog)
+    again = extract.find_best_image(extract.SENTINEL2_COLLECTION, "CLOUDY_PIXEL_PERCENTAGE", GEOMETRY,
+                                    "2024-01-08", "2024-01-25", client=ee, catalog=catalog)
+
+    assert ee.calls == {"getInfo": 1}
+    assert first["id"] == again["id"] == "S2/20240110"
+    assert again["count"] == 1
+
+
+def test_quality_band_carries_the_cloud_mask():
+    ee = FakeEE(SCENES)
+    composite, info = extract.search_composite("sentinel2", GEOMETRY, "2024-01-01", "2024-02-01", method="quality",
+                                               bands=["B4", "B8"], client=ee)
+
+    assert info["count"] == 2
+    assert ("qualityMosaic", ("quality",)) in composite.ops
+    for image in composite.sources:
+        # Each scene is cloud-masked, and its constant quality band gets the mask of its first band
+        assert image.op_names()[0] == "updateMask"
+        [(_, (quality,))] = [(name, args) for name, args in image.ops if name == "addBands"]
+        assert quality.op_names()[-1] == "updateMask"
+        [mask] = quality.ops[-1][1]
+        assert mask.ops[-2:] == (("select", ("B4",)), ("mask", ()))
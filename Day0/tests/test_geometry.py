@@ -0,0 +1,18 @@
+from geoai.extract import SECTOR14_GEOJSON
+from geoai.geometry import load_geometry, simplify_coordinates, vertex_count
+
+TOLERANCES_M = [1, 5, 10, 50, 100, 200, 500, 1000, 5000, 50000]
+
+
+def test_larger_tolerance_never_keeps_more_vertices():
+    counts = [vertex_count(load_geometry(SECTOR14_GEOJSON, tolerance_m=t)) for t in [None] + TOLERANCES_M]
+    assert counts == sorted(counts, reverse=True)
+    assert counts[0] == 22
+
+
+def test_simplified_ring_stays_a_closed_triangle():
+    geometry = load_geometry(SECTOR14_GEOJSON)
+    [ring] = simplify_coordinates(geometry, 50000)["coordinates"]
+    assert len(ring) == 4
+    assert ring[0] == ring[-1]
+    assert len({tuple(point) for point in ring}) == 3
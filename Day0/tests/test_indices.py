@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+import pytest
+
+from benchmarks import legacy
+from benchmarks.bench_kernel import kernel_avg_ndvi, script_formula, write_red_nir
+from geoai import indices
+from geoai.indices import KERNEL_CHUNK_PIXELS, normalized_difference, scratch_buffer
+
+
+def _bands(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.integers(0, 255, shape).astype("float32"),
+            rng.integers(0, 255, shape).astype("float32"))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 7), (1, KERNEL_CHUNK_PIXELS), (257, 300),
+                                   (1, 2 * KERNEL_CHUNK_PIXELS + 1)])
+def test_matches_script_formula_on_any_size(shape):
+    # Sizes below, at, and not a multiple of the chunk size
+    a, b = _bands(shape)
+    np.testing.assert_allclose(normalized_difference(a, b), script_formula(a, b), rtol=1e-6)
+
+
+def test_writes_into_caller_out():
+    a, b = _bands((300, 400))
+    out = np.full(a.shape, 7.0, dtype="float32")
+    assert normalized_difference(a, b, out=out) is out
+    np.testing.assert_allclose(out, script_formula(a, b), rtol=1e-6)
+
+
+@pytest.mark.parametrize("out", [np.empty((3, 4), dtype="float64"), np.empty((4, 3), dtype="float32"),
+                                 np.empty((4, 6), dtype="float32")[:, ::2]])
+def test_rejects_unusable_out(out):
+    a, b = _bands((3, 4))
+    with pytest.raises(ValueError, match="C-contiguous float32"):
+        normalized_difference(a, b, out=out)
+
+
+def test_zero_denominator_guard():
+    a = np.array([0, 0, 3, -2], dtype="float32")
+    b = np.array([0, 5, 0, 2], dtype="float32")
+    # 0 / 0.0001 = 0 and -4 / 0.0001, as the analysis scripts compute it
+    np.testing.assert_allclose(normalized_difference(a, b), [0.0, -1.0, 1.0, -40000.0])
+    assert np.isfinite(normalized_difference(a, b)).all()
+
+
+def test_valid_range_sets_nan():
+    a = np.array([0, 0, 3, -2, 1], dtype="float32")
+    b = np.array([0, 5, 0, 2, 3], dtype="float32")
+    result = normalized_difference(a, b, valid_range=(-1, 1))
+    np.testing.assert_allclose(result, [0.0, -1.0, 1.0, np.nan, -0.5])
+
+
+def _in_new_thread(fn):
+    """Run fn in a fresh thread (so it starts without a scratch buffer) and return its result"""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(fn()))
+    thread.start()
+    thread.join()
+    assert len(results) == 1
+    return results[0]
+
+
+def test_scratch_is_reused_across_sizes():
+    def sizes():
+        seen = []
+        for shape in [(10, 10), (300, 400), (5, 5), (70, 70)]:
+            a, b = _bands(shape)
+            np.testing.assert_allclose(normalized_difference(a, b), script_formula(a, b), rtol=1e-6)
+            seen.append(indices._scratch.buffer)
+        return seen
+
+    small, grown, after_small, after_medium = _in_new_thread(sizes)
+    assert small.size == 100
+    # A bigger call grows it (up to one chunk), smaller ones keep using it
+    assert grown.size == KERNEL_CHUNK_PIXELS
+    assert after_small is grown and after_medium is grown
+
+
+def test_scratch_is_per_thread():
+    normalized_difference(*_bands((300, 400)))
+    main_buffer = indices._scratch.buffer
+
+    def worker():
+        normalized_difference(*_bands((300, 400), seed=1))
+        return indices._scratch.buffer
+
+    assert _in_new_thread(worker) is not main_buffer
+    assert indices._scratch.buffer is main_buffer
+    assert scratch_buffer(25).base is main_buffer
+
+
+def test_streamed_avg_ndvi_matches_legacy(tmp_path):
+    red, nir = _bands((150, 200))
+    red[:10] = nir[:10] = 0
+    path = write_red_nir(str(tmp_path / "red_nir.tif"), red, nir)
+    assert kernel_avg_ndvi(path, max_pixels=1000) == pytest.approx(float(legacy.compute_avg_ndvi(path)), rel=1e-5)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+import rasterio
+
+from benchmarks.synthetic import write_scene
+from geoai.lst import load_lst
+
+
+@pytest.mark.parametrize("size", [300, 600])
+def test_diagnostics_match_the_decoded_scene(tmp_path, size):
+    path = write_scene(str(tmp_path / "lst.tif"), size, kind="landsat_lst", compress="none")
+    celsius, diagnostics = load_lst(path)
+
+    valid = celsius[~np.isnan(celsius)]
+    assert diagnostics["total"] == size * size
+    assert diagnostics["valid"] == valid.size > 0
+    assert diagnostics["nodata"] == size * size - valid.size
+    assert diagnostics["min"] == valid.min() and diagnostics["max"] == valid.max()
+    assert diagnostics["mean"] == pytest.approx(valid.astype("float64").mean())
+
+
+def test_scene_without_valid_pixels(tmp_path):
+    path = write_scene(str(tmp_path / "lst.tif"), 300, kind="landsat_lst")
+    with rasterio.open(path, "r+") as dst:
+        dst.write(np.zeros((300, 300), dtype="uint16"), 1)
+    celsius, diagnostics = load_lst(path)
+
+    assert np.isnan(celsius).all()
+    assert diagnostics["valid"] == 0 and diagnostics["nodata"] == 300 * 300
+    assert np.isnan(diagnostics["mean"])
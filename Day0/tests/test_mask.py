@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.io import DatasetReader
+from rasterio.windows import Window
+
+from benchmarks.synthetic import write_scene
+from geoai.charts import load_layer
+from geoai.indices import compute_indices
+from geoai.mask import decode_scl, scene_mask
+from geoai.stats import stream_index_stats
+
+
+def test_decode_scl_accepts_float_codes():
+    codes = np.array([[4, 9, 3], [5, 0, 300]], dtype="uint16")
+    expected = np.array([[True, False, False], [True, False, True]])
+    assert np.array_equal(decode_scl(codes), expected)
+    assert np.array_equal(decode_scl(codes.astype("float32")), expected)
+    assert not decode_scl(np.array([np.nan], dtype="float32"))[0]
+
+
+@pytest.mark.parametrize("dtype", ["int16", "float32"])
+def test_scene_is_masked_whatever_its_dtype(tmp_path, dtype):
+    path = write_scene(str(tmp_path / f"scene_{dtype}.tif"), 512, dtype=dtype)
+    clear = scene_mask(path)
+    assert 0 < clear.mean() < 1
+
+    ndvi = compute_indices(path, ["ndvi"])["ndvi"]
+    assert np.array_equal(np.isnan(ndvi), ~clear)
+    assert stream_index_stats(path, ["ndvi"])["ndvi"]["count"] == clear.sum()
+
+
+def test_mask_reuses_the_bands_already_read(tmp_path, monkeypatch):
+    path = write_scene(str(tmp_path / "scene.tif"), 512, dtype="int16")
+    with rasterio.open(path, "r+") as dst:
+        dst.nodata = -32768
+        dst.write(np.full((16, 16), -32768, dtype="int16"), 3, window=Window(0, 0, 16, 16))
+
+    reads = []
+    original_read = DatasetReader.read
+
+    def counting_read(self, indexes=None, *args, **kwargs):
+        reads.append(indexes)
+        return original_read(self, indexes, *args, **kwargs)
+
+    monkeypatch.setattr(DatasetReader, "read", counting_read)
+    ndvi = compute_indices(path, ["ndvi"])["ndvi"]
+
+    # One read of B8 + B4, one of SCL
+    assert reads == [[4, 3], 6]
+    assert np.isnan(ndvi[:16, :16]).all()
+    assert np.isfinite(ndvi[16:, 16:]).any()
+
+
+def test_scl_is_decoded_once_per_scene(tmp_path, monkeypatch):
+    path = write_scene(str(tmp_path / "scene.tif"), 256, dtype="int16")
+    scl_reads = []
+    original_read = DatasetReader.read
+
+    def counting_read(self, indexes=None, *args, **kwargs):
+        if indexes in (6, [6]):
+            scl_reads.append(indexes)
+        return original_read(self, indexes, *args, **kwargs)
+
+    monkeypatch.setattr(DatasetReader, "read", counting_read)
+    layers = ["ndvi", "ndbi", "ndmi", "mndwi"]
+    for layer in layers:
+        compute_indices(path, [layer])
+    charts = [load_layer(path, layer, max_size=64) for layer in layers]
+    # Once at full resolution, once at the chart size
+    assert len(scl_reads) == 2
+    assert all(np.array_equal(np.isnan(values), np.isnan(charts[0])) for values in charts)
+    assert 0 < np.isnan(charts[0]).mean() < 1
+
+    # A rewritten scene is decoded again
+    with rasterio.open(path, "r+") as dst:
+        dst.write(np.zeros((256, 256), dtype="int16"), 6)
+    # Same size; make sure the modification time moves even on coarse-grained file systems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert np.isnan(compute_indices(path, ["ndvi"])["ndvi"]).all()
+    assert len(scl_reads) == 3
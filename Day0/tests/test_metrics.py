@@ -0,0 +1,159 @@
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from geoai import metrics
+from geoai.metrics import CONTENT_TYPE, Registry
+
+EXPECTED = """\
+# HELP test_tasks_total Export tasks by state
+# TYPE test_tasks_total counter
+test_tasks_total{state="COMPLETED"} 3
+test_tasks_total{state="FAILED"} 1
+# HELP test_queue Tasks waiting in the queue
+# TYPE test_queue gauge
+test_queue 2.5
+# HELP test_wait_seconds Time in the queue
+# TYPE test_wait_seconds summary
+test_wait_seconds_sum{method="download"} 4.5
+test_wait_seconds_count{method="download"} 2
+test_wait_seconds_sum{method="drive"} 10
+test_wait_seconds_count{method="drive"} 1
+"""
+
+
+def _registry():
+    registry = Registry()
+    tasks = registry.counter("test_tasks_total", "Export tasks by state", ["state"])
+    queue = registry.gauge("test_queue", "Tasks waiting in the queue")
+    wait = registry.summary("test_wait_seconds", "Time in the queue", ["method"])
+    tasks.inc(state="FAILED")
+    tasks.inc(2, state="COMPLETED")
+    tasks.inc(state="COMPLETED")
+    queue.set(4)
+    queue.dec(1.5)
+    wait.observe(10, method="drive")
+    wait.observe(1.5, method="download")
+    wait.observe(3, method="download")
+    return registry
+
+
+def test_render():
+    registry = _registry()
+    assert registry.render() == EXPECTED
+    assert registry.metrics["test_wait_seconds"].get(method="download") == (4.5, 2)
+
+
+def test_empty_metrics_render_zero():
+    registry = Registry()
+    registry.counter("test_bytes_total", "Bytes")
+    registry.summary("test_seconds", "Seconds")
+    registry.gauge("test_ratio", "Ratio", ["cache"])
+    assert registry.render() == (
+        "# HELP test_bytes_total Bytes\n# TYPE test_bytes_total counter\ntest_bytes_total 0\n"
+        "# HELP test_seconds Seconds\n# TYPE test_seconds summary\ntest_seconds_sum 0\ntest_seconds_count 0\n"
+        "# HELP test_ratio Ratio\n# TYPE test_ratio gauge\n"
+    )
+
+
+def test_escaping():
+    registry = Registry()
+    counter = registry.counter("test_files_total", 'Files in C:\\data\nwith "quotes"', ["path"])
+    counter.inc(path='C:\\data\\"new"\nfile')
+    assert registry.render() == (
+        '# HELP test_files_total Files in C:\\\\data\\nwith \\"quotes\\"\n'
+        "# TYPE test_files_total counter\n"
+        'test_files_total{path="C:\\\\data\\\\\\"new\\"\\nfile"} 1\n'
+    )
+
+
+@pytest.mark.parametrize("labels", [["1st"], ["state-name"], ["__reserved"], ["state", "state"], [""]])
+def test_rejects_bad_label_names(labels):
+    with pytest.raises(ValueError):
+        Registry().counter("test_total", "Test", labels)
+
+
+def test_rejects_bad_metric_names_and_reserved_summary_labels():
+    with pytest.raises(ValueError, match="Invalid metric name"):
+        Registry().counter("test-total", "Test")
+    with pytest.raises(ValueError, match="quantile"):
+        Registry().summary("test_seconds", "Test", ["quantile"])
+
+
+def test_rejects_unknown_or_missing_labels():
+    counter = Registry().counter("test_total", "Test", ["state"])
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.inc(status="FAILED")
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.inc()
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.inc(state="FAILED", method="drive")
+
+
+def test_kinds_keep_their_operations():
+    registry = Registry()
+    counter = registry.counter("test_total", "Test")
+    with pytest.raises(ValueError, match="only go up"):
+        counter.inc(-1)
+    with pytest.raises(ValueError, match="Only gauges"):
+        counter.set(3)
+    with pytest.raises(ValueError, match="Only summaries"):
+        counter.observe(3)
+    # Same name again: same metric, unless the kind or labels differ
+    assert registry.counter("test_total", "Test") is counter
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("test_total", "Test")
+
+
+def test_write_textfile(tmp_path):
+    path = tmp_path / "textfile" / "geoai.prom"
+    _registry().write_textfile(str(path))
+    assert path.read_text(encoding="utf-8") == EXPECTED
+    assert os.listdir(path.parent) == ["geoai.prom"]
+
+
+def test_write_textfile_is_atomic(tmp_path, monkeypatch):
+    path = tmp_path / "geoai.prom"
+    path.write_text("previous\n", encoding="utf-8")
+    registry = _registry()
+    replaced = []
+
+    def replace(src, dst):
+        # The complete file exists under its temporary name, the old one is still in place
+        assert open(src, encoding="utf-8").read() == EXPECTED
+        assert path.read_text(encoding="utf-8") == "previous\n"
+        replaced.append(src)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(metrics.os, "replace", replace)
+    with pytest.raises(OSError):
+        registry.write_textfile(str(path))
+
+    # A failed write leaves the previous file and no temporary file behind
+    assert len(replaced) == 1 and replaced[0] != str(path)
+    assert path.read_text(encoding="utf-8") == "previous\n"
+    assert os.listdir(tmp_path) == ["geoai.prom"]
+
+
+def test_serve():
+    registry = _registry()
+    server = registry.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert response.read().decode("utf-8") == EXPECTED
+
+        registry.metrics["test_queue"].set(1)
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert "test_queue 1\n" in response.read().decode("utf-8")
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,43 @@
+from geoai.monitor import monitor_tasks
+from tests.fake_ee import FakeEE
+
+FAST = {"min_interval": 0.001, "max_interval": 0.01}
+
+
+class BrokenTask:
+    id = "revoked"
+
+    def __init__(self):
+        self.checks = 0
+
+    def status(self):
+        self.checks += 1
+        raise PermissionError("credentials revoked")
+
+
+def _tasks(ee, count):
+    return [ee.batch.Export.image.toDrive(image=None) for _ in range(count)]
+
+
+def test_callbacks_and_final_states():
+    ee = FakeEE(task_states=("READY", "RUNNING", "COMPLETED"))
+    completed, failed = [], []
+    statuses = monitor_tasks(_tasks(ee, 3), on_complete=lambda task, status: completed.append(task.id),
+                             on_failure=lambda task, status: failed.append(task.id), **FAST)
+    assert [status["state"] for status in statuses] == ["COMPLETED"] * 3
+    assert sorted(completed) == ["TASK1", "TASK2", "TASK3"] and failed == []
+
+
+def test_gives_up_after_max_errors():
+    task = BrokenTask()
+    failed = []
+    [status] = monitor_tasks([task], max_errors=3, on_failure=lambda task, status: failed.append(status), **FAST)
+    assert status["state"] == "UNREACHABLE"
+    assert task.checks == 3
+    assert failed == [status]
+
+
+def test_times_out():
+    ee = FakeEE(task_states=("RUNNING",))
+    [status] = monitor_tasks(_tasks(ee, 1), timeout=0.05, **FAST)
+    assert status["state"] == "TIMED_OUT"
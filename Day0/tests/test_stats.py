@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from benchmarks.synthetic import write_scene
+from geoai.indices import compute_indices
+from geoai.stats import iter_windows, stream_index_stats
+
+
+def _striped(path, width, height, strip_rows):
+    rng = np.random.default_rng(0)
+    # Compressed, so GDAL keeps the strips as written (it splits uncompressed single strips on its own)
+    with rasterio.open(path, "w", driver="GTiff", width=width, height=height, count=2, dtype="uint16",
+                       blockysize=strip_rows, compress="deflate", crs="EPSG:32643",
+                       transform=from_origin(700000, 3160000, 10, 10)) as dst:
+        dst.write(rng.integers(1, 10000, (2, height, width)).astype("uint16"))
+        dst.descriptions = ("B11", "B8")
+    return str(path)
+
+
+def _covered(windows, width, height):
+    covered = np.zeros((height, width), dtype="int8")
+    for window in windows:
+        rows, cols = window.toslices()
+        covered[rows, cols] += 1
+    return covered
+
+
+@pytest.mark.parametrize("strip_rows", [300, 7])
+def test_striped_windows_stay_under_max_pixels(tmp_path, strip_rows):
+    path = _striped(tmp_path / "scene.tif", 120, 300, strip_rows)
+    with rasterio.open(path) as src:
+        assert src.block_shapes[0] == (strip_rows, 120)
+        windows = list(iter_windows(src, max_pixels=1000))
+
+    assert all(window.width * window.height <= 1000 for window in windows)
+    assert (_covered(windows, 120, 300) == 1).all()
+    if strip_rows == 7:
+        # Whole strips only
+        assert all(window.row_off % 7 == 0 for window in windows)
+
+
+def test_tiled_windows_are_blocks(tmp_path):
+    path = write_scene(str(tmp_path / "scene.tif"), 600)
+    with rasterio.open(path) as src:
+        windows = list(iter_windows(src, max_pixels=1 << 16))
+    assert {(window.height, window.width) for window in windows} <= {(256, 256), (256, 88), (88, 256), (88, 88)}
+    assert (_covered(windows, 600, 600) == 1).all()
+
+
+def test_single_strip_stats_match_full_read(tmp_path):
+    path = _striped(tmp_path / "scene.tif", 120, 300, 300)
+    streamed = stream_index_stats(path, ["ndbi"], max_pixels=1000)["ndbi"]
+    full = compute_indices(path, ["ndbi"])["ndbi"]
+
+    assert streamed["count"] == full.size
+    assert streamed["mean"] == pytest.approx(float(full.astype("float64").mean()), abs=1e-6)
+    assert streamed["min"] == full.min() and streamed["max"] == full.max()
@@ -0,0 +1,49 @@
+import json
+import uuid
+
+import pytest
+
+from geoai import tracing
+from geoai.tracing import TRACE_ENV, configure_tracing, span
+
+
+@pytest.fixture
+def uuid_calls(monkeypatch):
+    calls = []
+    original = uuid.uuid4
+
+    def counting_uuid4():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(tracing.uuid, "uuid4", counting_uuid4)
+    monkeypatch.delenv(TRACE_ENV, raising=False)
+    yield calls
+    configure_tracing(None)
+
+
+def test_untraced_spans_make_no_ids(uuid_calls):
+    with span("extract_scene") as outer:
+        with span("search") as inner:
+            inner.set(image_id="S2/20240110")
+    assert uuid_calls == []
+    assert outer.duration >= inner.duration > 0
+
+
+def test_traced_spans_are_linked(uuid_calls, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing(str(path))
+    with span("extract_scene", aoi="sector14"):
+        with span("search"):
+            pass
+        with pytest.raises(RuntimeError):
+            with span("export_queue"):
+                raise RuntimeError("quota")
+
+    search, export, outer = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in (search, export, outer)] == ["search", "export_queue", "extract_scene"]
+    assert search["trace_id"] == export["trace_id"] == outer["trace_id"]
+    assert search["parent_id"] == export["parent_id"] == outer["span_id"]
+    assert outer["parent_id"] is None
+    assert export["status"] == "error" and export["error"] == "quota"
+    assert len(uuid_calls) == 4
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from geoai.zonal import zonal_stats
+
+
+def test_std_survives_a_large_offset():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 4, (500, 500)).astype("int32")
+    noise = rng.normal(0, 0.001, labels.shape)
+    values = (1e6 + noise).astype("float64")
+
+    result = zonal_stats(values, labels, 3, percentiles=())
+    for zone in range(1, 4):
+        expected = noise[labels == zone]
+        assert result["count"][zone - 1] == expected.size
+        assert result["std"][zone - 1] == pytest.approx(expected.std(), rel=1e-6)
+        assert result["mean"][zone - 1] == pytest.approx(1e6 + expected.mean(), rel=1e-12)
+
+
+def test_min_max_percentiles_and_empty_zones():
+    labels = np.array([[1, 1, 1, 2], [0, 1, 2, 2]], dtype="int32")
+    values = np.array([[1.0, 2.0, np.nan, 10.0], [99.0, 3.0, 20.0, 30.0]])
+
+    result = zonal_stats(values, labels, 3, percentiles=(50,))
+    assert result["count"].tolist() == [3, 3, 0]
+    assert result["mean"][:2].tolist() == [2.0, 20.0]
+    assert result["std"][0] == pytest.approx(np.std([1.0, 2.0, 3.0]))
+    assert result["min"][:2].tolist() == [1.0, 10.0] and result["max"][:2].tolist() == [3.0, 30.0]
+    assert result["p50"][:2].tolist() == [2.0, 20.0]
+    assert np.isnan(result["mean"][2]) and np.isnan(result["std"][2]) and np.isnan(result["p50"][2])